@@ -0,0 +1,70 @@
+from benchmark_base import benchmark_cli
+
+from time import perf_counter
+
+from veros import logger
+
+CALLS_PER_STEP = 1000
+
+
+@benchmark_cli
+def main(pyom2_lib, timesteps, size):
+    from veros import veros_routine, veros_kernel, KernelOutput
+    from veros.state import get_default_state
+    from veros.distributed import barrier
+    from veros.core.operators import flush
+
+    state = get_default_state()
+
+    with state.settings.unlock():
+        state.settings.update(
+            nx=size[0],
+            ny=size[1],
+            nz=size[2],
+        )
+
+    state.initialize_variables()
+
+    @veros_kernel
+    def increment_kernel(state):
+        vs = state.variables
+        vs.itt = vs.itt + 1
+        return KernelOutput(itt=vs.itt)
+
+    @veros_routine
+    def increment(state):
+        vs = state.variables
+        vs.update(increment_kernel(state))
+
+    if not pyom2_lib:
+
+        def run():
+            for _ in range(CALLS_PER_STEP):
+                increment(state)
+
+    else:
+        # there is no dispatch in pyOM2, so measure the cost of plain Python function calls as a baseline
+        counter = {"itt": 0}
+
+        def increment_plain(counter):
+            counter["itt"] += 1
+
+        def run():
+            for _ in range(CALLS_PER_STEP):
+                increment_plain(counter)
+
+    for _ in range(timesteps):
+        start = perf_counter()
+
+        run()
+        flush()
+        barrier()
+
+        end = perf_counter()
+
+        logger.debug(f"Time step took {end-start}s")
+        logger.debug(f"Overhead per routine + kernel call: {(end-start) / CALLS_PER_STEP * 1e6:.2f}us")
+
+
+if __name__ == "__main__":
+    main()
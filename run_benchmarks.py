@@ -20,13 +20,27 @@ Runs selected Veros benchmarks back to back and writes timing results to a JSON
 
 TESTDIR = os.path.join(os.path.dirname(__file__), os.path.relpath("benchmarks"))
 
-COMPONENTS = ["numpy", "numpy-mpi", "jax", "jax-gpu", "jax-mpi", "jax-gpu-mpi", "fortran", "fortran-mpi"]
+COMPONENTS = [
+    "numpy",
+    "numpy-mpi",
+    "numba",
+    "numba-mpi",
+    "jax",
+    "jax-gpu",
+    "jax-mpi",
+    "jax-gpu-mpi",
+    "fortran",
+    "fortran-mpi",
+]
 
 STATIC_SETTINGS = " --size {nx} {ny} {nz} --timesteps {timesteps} --float-type {float_type}"
 
 BENCHMARK_COMMANDS = {
     "numpy": "{python} {filename}" + STATIC_SETTINGS,
     "numpy-mpi": "OMP_NUM_THREADS=1 {mpiexec} -n {nproc} {python} {filename} --nproc {decomp}" + STATIC_SETTINGS,
+    "numba": "{python} {filename} -b numba" + STATIC_SETTINGS,
+    "numba-mpi": "OMP_NUM_THREADS=1 NUMBA_NUM_THREADS=1 {mpiexec} -n {nproc} {python} {filename} -b numba --nproc {decomp}"
+    + STATIC_SETTINGS,
     "jax": "{python} {filename} -b jax" + STATIC_SETTINGS,
     "jax-gpu": "{python} {filename} -b jax --device gpu" + STATIC_SETTINGS,
     "jax-mpi": "OMP_NUM_THREADS=1 {mpiexec} -n {nproc} {python} {filename} -b jax --nproc {decomp}" + STATIC_SETTINGS,
@@ -40,6 +54,9 @@ SLURM_COMMANDS = {
     "numpy": "{mpiexec} --ntasks 1 --cpus-per-task {nproc} -- {python} {filename} -b numpy" + STATIC_SETTINGS,
     "numpy-mpi": "{mpiexec} --ntasks {nproc} --cpus-per-task 1 -- {python} {filename} -b numpy --nproc {decomp}"
     + STATIC_SETTINGS,
+    "numba": "{mpiexec} --ntasks 1 --cpus-per-task {nproc} -- {python} {filename} -b numba" + STATIC_SETTINGS,
+    "numba-mpi": "{mpiexec} --ntasks {nproc} --cpus-per-task 1 -- {python} {filename} -b numba --nproc {decomp}"
+    + STATIC_SETTINGS,
     "jax": "{mpiexec} --ntasks 1 --cpus-per-task {nproc} -- {python} {filename} -b jax" + STATIC_SETTINGS,
     "jax-gpu": "{mpiexec} --ntasks 1 --cpus-per-task {nproc} -- {python} {filename} -b jax --device gpu"
     + STATIC_SETTINGS,
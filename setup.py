@@ -38,15 +38,18 @@ MINIMUM_VERSIONS = {
     "numpy": "1.13",
     "requests": "2.18",
     "jax": "0.2.10",
+    "numba": "0.50",
 }
 
 
 CONSOLE_SCRIPTS = [
     "veros = veros.cli.veros:cli",
     "veros-run = veros.cli.veros_run:cli",
+    "veros-precompile = veros.cli.veros_precompile:cli",
     "veros-copy-setup = veros.cli.veros_copy_setup:cli",
     "veros-resubmit = veros.cli.veros_resubmit:cli",
     "veros-create-mask = veros.cli.veros_create_mask:cli",
+    "veros-decompose = veros.cli.veros_decompose:cli",
 ]
 
 PACKAGE_DATA = ["setups/*/assets.json", "setups/*/*.npy", "setups/*/*.png"]
@@ -82,6 +85,7 @@ for line in jax_req:  # inject jaxlib requirement
 EXTRAS_REQUIRE = {
     "test": ["pytest", "pytest-cov", "pytest-forked", "xarray"],
     "jax": jax_req,
+    "numba": parse_requirements("requirements_numba.txt"),
 }
 
 
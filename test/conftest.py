@@ -4,7 +4,7 @@ import pytest
 
 def pytest_addoption(parser):
     parser.addoption("--pyom2-lib", default=None, help="Path to PyOM2 library (must be given for consistency tests)")
-    parser.addoption("--backend", choices=["numpy", "jax"], default="numpy", help="Numerical backend to test")
+    parser.addoption("--backend", choices=["numpy", "jax", "numba"], default="numpy", help="Numerical backend to test")
 
 
 def pytest_configure(config):
@@ -0,0 +1,77 @@
+import pytest
+import numpy as np
+
+
+@pytest.fixture
+def kbot():
+    # ocean with a continent in the north-west and an island in the south-east
+    kbot = np.full((60, 40), 10, dtype="int")
+    kbot[:30, 20:] = 0
+    kbot[40:45, 5:15] = 0
+    return kbot
+
+
+def test_balanced_decomposition(kbot):
+    from veros.decomposition import Decomposition, MIN_TILE_SIZE
+
+    decomposition = Decomposition.balanced(kbot, (4, 3))
+
+    assert decomposition.num_proc == (4, 3)
+    assert decomposition.shape == kbot.shape
+    assert min(*decomposition.sizes[0], *decomposition.sizes[1]) >= MIN_TILE_SIZE
+
+    # wet cells are distributed (roughly) evenly between columns of tiles
+    wet_cells = decomposition.count_wet_cells(kbot)
+    assert wet_cells.sum() == np.count_nonzero(kbot)
+    assert np.ptp(wet_cells.sum(axis=1)) < 0.1 * wet_cells.sum() / 4
+
+    # land tiles are dropped, but every row and column keeps an active tile
+    assert np.array_equal(decomposition.active, wet_cells > 0)
+    assert decomposition.has_inactive_tiles
+    assert decomposition.active.any(axis=0).all()
+    assert decomposition.active.any(axis=1).all()
+    assert decomposition.num_active == np.count_nonzero(decomposition.active)
+
+    # ranks are assigned to active tiles only
+    for rank in range(decomposition.num_active):
+        assert decomposition.tile_to_rank(*decomposition.rank_to_tile(rank)) == rank
+
+    for ix, iy in zip(*np.nonzero(~decomposition.active)):
+        assert decomposition.tile_to_rank(ix, iy) is None
+
+    keep_land = Decomposition.balanced(kbot, (4, 3), drop_land=False)
+    assert keep_land.sizes == decomposition.sizes
+    assert not keep_land.has_inactive_tiles
+
+
+def test_balanced_decomposition_all_land():
+    from veros.decomposition import Decomposition
+
+    decomposition = Decomposition.balanced(np.zeros((10, 9), dtype="int"), (2, 3))
+    assert decomposition.sizes == ((5, 5), (3, 3, 3))
+    assert decomposition.active.any(axis=0).all()
+    assert decomposition.active.any(axis=1).all()
+    assert decomposition.num_active == 4
+
+
+def test_invalid_decomposition(kbot):
+    from veros.decomposition import Decomposition
+
+    with pytest.raises(ValueError):
+        Decomposition((10, 1), (5, 5))
+
+    with pytest.raises(ValueError):
+        Decomposition((5, 5), (5, 5), active=[[True, True], [False, False]])
+
+    with pytest.raises(ValueError):
+        Decomposition.balanced(kbot, (31, 1))
+
+
+def test_decomposition_roundtrip(kbot, tmpdir):
+    from veros.decomposition import Decomposition
+
+    decomposition = Decomposition.balanced(kbot, (3, 2))
+    outfile = str(tmpdir / "decomposition.json")
+    decomposition.to_file(outfile)
+
+    assert Decomposition.from_file(outfile) == decomposition
@@ -22,11 +22,27 @@ def test_scatter():
     run_dist_kernel("scatter_kernel.py")
 
 
+def test_exchange_overlap():
+    run_dist_kernel("exchange_kernel.py")
+
+
+def test_global_reduction():
+    run_dist_kernel("reduction_kernel.py")
+
+
 def test_acc():
     run_dist_kernel("acc_kernel.py")
 
 
-@pytest.mark.parametrize("solver", ["scipy", "scipy_jax", "petsc"])
+def test_uneven_decomposition():
+    run_dist_kernel("uneven_kernel.py")
+
+
+def test_land_decomposition():
+    run_dist_kernel("land_kernel.py")
+
+
+@pytest.mark.parametrize("solver", ["scipy", "scipy_jax", "petsc", "krylov"])
 @pytest.mark.parametrize("streamfunction", [True, False])
 def test_linear_solver(solver, streamfunction):
     from veros import runtime_settings
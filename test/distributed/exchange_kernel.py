@@ -0,0 +1,99 @@
+import numpy as np
+from mpi4py import MPI
+
+from veros import runtime_settings as rs, runtime_state as rst
+from veros.distributed import (
+    exchange_overlap,
+    exchange_overlap_many,
+    start_exchange_overlap,
+    finish_exchange_overlap,
+    _get_exchange_plan,
+    _exchange_overlap_blocking,
+)
+
+if rst.proc_num == 1:
+    import sys
+
+    comm = MPI.COMM_SELF.Spawn(sys.executable, args=["-m", "mpi4py", sys.argv[-1]], maxprocs=4)
+
+    success = np.empty(1, dtype="int")
+    comm.Recv(success, 0)
+    assert success[0] == 1
+
+else:
+    rs.num_proc = (2, 2)
+    assert rst.proc_num == 4
+
+    nx, ny, nz = 8, 6, 3
+    nxl, nyl = nx // 2, ny // 2
+    px, py = rst.proc_rank % 2, rst.proc_rank // 2
+
+    checks = []
+
+    for var_grid in (("xt", "yt", "zt"), ("xu", "yu"), ("xt",), ("yt", "zt")):
+        for cyclic in (False, True):
+            # global array including overlap
+            shape = {"x": nx + 4, "y": ny + 4, "z": nz}
+            global_arr = np.arange(np.prod([shape[dim[0]] for dim in var_grid]), dtype="float").reshape(
+                [shape[dim[0]] for dim in var_grid]
+            )
+
+            if cyclic and var_grid[0][0] == "x":
+                global_arr[:2] = global_arr[-4:-2]
+                global_arr[-2:] = global_arr[2:4]
+
+            local_idx, halo_idx = [], []
+            for dim in var_grid:
+                if dim[0] == "x":
+                    local_idx.append(slice(px * nxl, px * nxl + nxl + 4))
+                    has_lower, has_upper = px > 0 or cyclic, px < 1 or cyclic
+                elif dim[0] == "y":
+                    local_idx.append(slice(py * nyl, py * nyl + nyl + 4))
+                    has_lower, has_upper = py > 0, py < 1
+                else:
+                    continue
+
+                halo_idx.append((len(local_idx) - 1, has_lower, has_upper))
+
+            expected = global_arr[tuple(local_idx)]
+
+            # invalidate all overlap cells that are owned by a neighbor
+            local_arr = expected.copy()
+            for axis, has_lower, has_upper in halo_idx:
+                idx = [slice(None)] * local_arr.ndim
+                if has_lower:
+                    idx[axis] = slice(0, 2)
+                    local_arr[tuple(idx)] = -1
+                if has_upper:
+                    idx[axis] = slice(-2, None)
+                    local_arr[tuple(idx)] = -1
+
+            result = exchange_overlap(local_arr.copy(), var_grid, cyclic)
+            checks.append(np.array_equal(result, expected))
+
+            plan = _get_exchange_plan(var_grid, cyclic)
+            result_blocking = _exchange_overlap_blocking([local_arr.copy()], plan)[0]
+            checks.append(np.array_equal(result_blocking, expected))
+
+            # several arrays with different data types
+            results_many = exchange_overlap_many(
+                [local_arr.copy(), 2 * local_arr, local_arr.astype("int32")], var_grid, cyclic
+            )
+            checks.append(np.array_equal(results_many[0], expected))
+            checks.append(np.array_equal(results_many[1], 2 * expected))
+            checks.append(np.array_equal(results_many[2], expected.astype("int32")))
+            checks.append(results_many[2].dtype == np.int32)
+
+            # split-phase exchange, with two exchanges in flight at the same time
+            first = start_exchange_overlap([local_arr.copy(), local_arr.astype("int32")], var_grid, cyclic)
+            second = start_exchange_overlap([3 * local_arr], var_grid, cyclic)
+            results_second = finish_exchange_overlap(second)
+            results_first = finish_exchange_overlap(first)
+            checks.append(np.array_equal(results_first[0], expected))
+            checks.append(np.array_equal(results_first[1], expected.astype("int32")))
+            checks.append(np.array_equal(results_second[0], 3 * expected))
+
+    success = rs.mpi_comm.allreduce(int(all(checks)), op=MPI.MIN)
+
+    if rst.proc_rank == 0:
+        rs.mpi_comm.Get_parent().Send(np.array([success]), 0)
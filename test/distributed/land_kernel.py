@@ -0,0 +1,75 @@
+import os
+import sys
+import tempfile
+
+import numpy as np
+from mpi4py import MPI
+
+from veros import runtime_settings as rs, runtime_state as rst
+from veros.decomposition import Decomposition
+from veros.distributed import gather
+
+rs.linear_solver = "scipy"
+rs.diskless_mode = True
+
+# 3x2 tiles, with the north-western tile only covering land
+decomposition = Decomposition((10, 10, 10), (20, 22), active=[[True, False], [True, True], [True, True]])
+
+if rst.proc_num > 1:
+    rs.num_proc = (3, 2)
+    rs.decomposition_file = sys.argv[-1]
+    assert rst.proc_num == 5
+
+
+from veros import veros_routine  # noqa: E402
+from veros.core.operators import numpy as npx  # noqa: E402
+from veros.setups.acc import ACCSetup  # noqa: E402
+
+
+class ContinentSetup(ACCSetup):
+    @veros_routine
+    def set_topography(self, state):
+        vs = state.variables
+        x, y = npx.meshgrid(vs.xt, vs.yt, indexing="ij")
+        vs.kbot = npx.logical_and(npx.logical_or(x > 1.0, y < -20), npx.logical_or(x > 20, y < -2)).astype("int")
+
+
+sim = ContinentSetup(
+    override=dict(
+        runlen=86400 * 10,
+    )
+)
+
+if rst.proc_num == 1:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        decomposition_file = os.path.join(tmpdir, "decomposition.json")
+        decomposition.to_file(decomposition_file)
+
+        comm = MPI.COMM_SELF.Spawn(
+            sys.executable, args=["-m", "mpi4py", sys.argv[-1], decomposition_file], maxprocs=decomposition.num_active
+        )
+
+        try:
+            sim.setup()
+            sim.run()
+        except Exception as exc:
+            print(str(exc))
+            comm.Abort(1)
+            raise
+
+        # make sure the dropped tile is really all land
+        assert not decomposition.count_wet_cells(sim.state.variables.kbot[2:-2, 2:-2])[0, 1]
+
+        other_psi = np.empty_like(sim.state.variables.psi)
+        comm.Recv(other_psi, 0)
+
+    # the overlap of dropped tiles is not gathered, and some values are close to 0 (so use atol)
+    np.testing.assert_allclose(sim.state.variables.psi[2:-2, 2:-2], other_psi[2:-2, 2:-2], atol=1e-6)
+else:
+    sim.setup()
+    sim.run()
+
+    psi_global = gather(sim.state.variables.psi, sim.state.dimensions, ("xt", "yt"))
+
+    if rst.proc_rank == 0:
+        rs.mpi_comm.Get_parent().Send(np.array(psi_global), 0)
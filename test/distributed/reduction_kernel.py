@@ -0,0 +1,45 @@
+import numpy as np
+from mpi4py import MPI
+
+from veros import runtime_settings as rs, runtime_state as rst
+from veros.distributed import GlobalReduction
+
+if rst.proc_num == 1:
+    import sys
+
+    comm = MPI.COMM_SELF.Spawn(sys.executable, args=["-m", "mpi4py", sys.argv[-1]], maxprocs=4)
+
+    res = np.empty(8)
+    comm.Recv(res, 0)
+
+    np.testing.assert_array_equal(res, [6.0, 16.0, 20.0, 3.0, 0.0, 0.0, 1.0, 2.0])
+
+else:
+    rs.num_proc = (2, 2)
+    assert rst.proc_num == 4
+
+    from veros.core.operators import numpy as npx
+
+    reduction = GlobalReduction()
+    reduction.sum("scalar_sum", float(rst.proc_rank))
+    reduction.sum("vector_sum", npx.array([1.0, 2.0]) + 2 * rst.proc_rank)
+    reduction.max("max", npx.float64(rst.proc_rank))
+    reduction.min("min", rst.proc_rank)
+    reduction.all("all", npx.array(rst.proc_rank > 0))
+    reduction.any("any", npx.array(rst.proc_rank == 3))
+
+    out = reduction.resolve()
+
+    # nothing left to reduce
+    assert reduction.resolve() == {}
+
+    if rst.proc_rank == 0:
+        assert out["all"].dtype == np.bool_
+        res = np.concatenate(
+            [
+                [out["scalar_sum"]],
+                out["vector_sum"],
+                [out["max"], out["min"], out["all"], out["any"], out["vector_sum"].ndim + 1],
+            ]
+        ).astype("float64")
+        rs.mpi_comm.Get_parent().Send(res, 0)
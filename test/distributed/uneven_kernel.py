@@ -0,0 +1,79 @@
+import sys
+
+import numpy as np
+from mpi4py import MPI
+
+from veros import runtime_settings as rs, runtime_state as rst
+from veros.distributed import gather, scatter, get_chunk_size
+from veros.variables import get_shape
+
+rs.linear_solver = "scipy"
+rs.diskless_mode = True
+
+if rst.proc_num > 1:
+    rs.num_proc = (2, 2)
+    assert rst.proc_num == 4
+
+
+from veros.setups.acc import ACCSetup  # noqa: E402
+
+# grid sizes that cannot be divided evenly between processes
+sim = ACCSetup(
+    override=dict(
+        nx=29,
+        ny=39,
+        runlen=86400 * 10,
+    )
+)
+
+if rst.proc_num == 1:
+    comm = MPI.COMM_SELF.Spawn(sys.executable, args=["-m", "mpi4py", sys.argv[-1]], maxprocs=4)
+
+    try:
+        sim.setup()
+        sim.run()
+    except Exception as exc:
+        print(str(exc))
+        comm.Abort(1)
+        raise
+
+    other_psi = np.empty_like(sim.state.variables.psi)
+    comm.Recv(other_psi, 0)
+
+    np.testing.assert_allclose(sim.state.variables.psi, other_psi)
+else:
+    from veros.core.operators import numpy as npx
+
+    # scatter and gather arrays whose chunks differ in size
+    dimensions = dict(xt=5, yt=7, zt=2)
+    assert get_chunk_size(5, 7) == ((3, 2)[rst.proc_idx[0]], (4, 3)[rst.proc_idx[1]])
+    assert get_shape(dimensions, ("xt", "yt")) == ((7, 6)[rst.proc_idx[0]], (8, 7)[rst.proc_idx[1]])
+
+    checks = []
+    for var_grid, shape in ((("xt", "yt", "zt"), (9, 11, 2)), (("xt",), (9,)), (("yt", "zt"), (11, 2))):
+        global_arr = npx.arange(np.prod(shape), dtype="float").reshape(shape)
+
+        if rst.proc_rank == 0:
+            local_arr = scatter(global_arr, dimensions, var_grid)
+        else:
+            local_arr = scatter(npx.zeros(get_shape(dimensions, var_grid)), dimensions, var_grid)
+
+        checks.append(local_arr.shape == get_shape(dimensions, var_grid))
+
+        gathered = gather(local_arr, dimensions, var_grid)
+        if rst.proc_rank == 0:
+            checks.append(np.array_equal(gathered, global_arr))
+
+    success = rs.mpi_comm.allreduce(int(all(checks)), op=MPI.MIN)
+
+    sim.setup()
+    sim.run()
+
+    psi_global = gather(sim.state.variables.psi, sim.state.dimensions, ("xt", "yt"))
+
+    if rst.proc_rank == 0:
+        if not success:
+            # make comparison fail in parent process
+            psi_global = np.full_like(psi_global, np.nan)
+
+        rs.mpi_comm.Get_parent().Send(np.array(psi_global), 0)
@@ -75,7 +75,7 @@ def assert_solution(state, rhs, sol, boundary_val=None, tol=1e-8):
 
 
 @pytest.mark.parametrize("cyclic", [True, False])
-@pytest.mark.parametrize("solver", ["scipy", "scipy_jax", "petsc"])
+@pytest.mark.parametrize("solver", ["scipy", "scipy_jax", "petsc", "krylov"])
 @pytest.mark.parametrize("problem", ["streamfunction", "pressure"])
 def test_solver(solver, solver_state, cyclic, problem):
     from veros import runtime_settings
@@ -92,6 +92,10 @@ def test_solver(solver, solver_state, cyclic, problem):
         from veros.core.external.solvers.scipy_jax import JAXSciPySolver
 
         solver_class = JAXSciPySolver
+    elif solver == "krylov":
+        from veros.core.external.solvers.krylov import KrylovSolver
+
+        solver_class = KrylovSolver
     elif solver == "petsc":
         petsc_mod = pytest.importorskip("veros.core.external.solvers.petsc_")
         solver_class = petsc_mod.PETScSolver
@@ -108,3 +112,117 @@ def test_solver(solver, solver_state, cyclic, problem):
 
     sol = solver_class(solver_state).solve(solver_state, rhs, x0, boundary_val=10)
     assert_solution(solver_state, rhs, sol, tol=1e-8, boundary_val=10)
+
+
+@pytest.mark.parametrize("cyclic", [False])
+@pytest.mark.parametrize("problem", ["pressure"])
+def test_krylov_breakdown(solver_state, cyclic, problem):
+    from veros.core.operators import numpy as npx
+    from veros.core.external.solvers.krylov import KrylovSolver
+
+    solver = KrylovSolver(solver_state)
+
+    # with an exact preconditioner, s and t vanish in the first iteration
+    solver._matvec = solver._precondition = lambda x: x
+
+    b = npx.asarray(np.random.rand(*solver._diags[0][2:-2, 2:-2].shape))
+    sol, iterations, residual_norm, converged = solver._bicgstab(b, npx.zeros_like(b))
+
+    assert converged
+    assert iterations == 1
+    np.testing.assert_allclose(sol, b)
+
+
+@pytest.mark.parametrize("cyclic", [True, False])
+@pytest.mark.parametrize("solver", ["scipy", "scipy_jax"])
+@pytest.mark.parametrize("problem", ["streamfunction", "pressure"])
+def test_multigrid_preconditioner(solver, solver_state, cyclic, problem):
+    from veros import runtime_settings
+    from veros.core.operators import numpy as npx
+
+    if solver == "scipy":
+        from veros.core.external.solvers.scipy import SciPySolver
+
+        solver_class = SciPySolver
+    else:
+        if runtime_settings.backend != "jax":
+            pytest.skip("scipy_jax solver requires JAX")
+
+        from veros.core.external.solvers.scipy_jax import JAXSciPySolver
+
+        solver_class = JAXSciPySolver
+
+    settings = solver_state.settings
+
+    rhs = npx.ones((settings.nx + 4, settings.ny + 4))
+    x0 = npx.asarray(np.random.rand(settings.nx + 4, settings.ny + 4))
+
+    object.__setattr__(runtime_settings, "linear_solver_preconditioner", "multigrid")
+    try:
+        solver = solver_class(solver_state)
+    finally:
+        object.__setattr__(runtime_settings, "linear_solver_preconditioner", "default")
+
+    sol = solver.solve(solver_state, rhs, x0, boundary_val=10)
+    assert_solution(solver_state, rhs, sol, tol=1e-8, boundary_val=10)
+
+
+@pytest.mark.parametrize("cyclic", [True, False])
+@pytest.mark.parametrize("problem", ["streamfunction", "pressure"])
+def test_multigrid_iterations(solver_state, cyclic, problem):
+    import scipy.sparse.linalg as spalg
+
+    from veros.core.external.poisson_matrix import assemble_poisson_matrix
+    from veros.core.external.solvers.multigrid import MultigridPreconditioner
+    from veros.core.external.solvers.scipy import SciPySolver
+
+    settings = solver_state.settings
+    grid_shape = (settings.nx + 4, settings.ny + 4)
+
+    matrix, boundary_mask = SciPySolver._assemble_poisson_matrix(solver_state)
+    multigrid = MultigridPreconditioner(*assemble_poisson_matrix(solver_state), cyclic=cyclic)
+    preconditioner = spalg.LinearOperator(
+        matrix.shape, lambda r: np.asarray(multigrid(r.reshape(grid_shape))).reshape(-1)
+    )
+
+    rhs = np.where(boundary_mask, 1.0, 0.0).reshape(-1)
+
+    iterations = []
+    _, info = spalg.bicgstab(matrix, rhs, M=preconditioner, tol=1e-10, atol=0, callback=iterations.append)
+
+    # with a Jacobi preconditioner, this takes hundreds of iterations
+    assert info == 0
+    assert len(iterations) < 20
+
+
+@pytest.mark.parametrize("cyclic", [True, False])
+@pytest.mark.parametrize("problem", ["streamfunction", "pressure"])
+def test_projection_solver(solver_state, cyclic, problem):
+    from veros.core.operators import numpy as npx
+    from veros.core.external.solvers.projection import ProjectionSolver
+    from veros.core.external.solvers.scipy import SciPySolver
+
+    settings = solver_state.settings
+    shape = (settings.nx + 4, settings.ny + 4)
+
+    initial_guesses = []
+
+    class RecordingSolver(SciPySolver):
+        def solve(self, state, rhs, x0, boundary_val=None):
+            initial_guesses.append(x0)
+            return super().solve(state, rhs, x0, boundary_val=boundary_val)
+
+    solver = ProjectionSolver(solver_state, RecordingSolver(solver_state), num_vectors=2)
+
+    rhs = [npx.asarray(1 + np.random.rand(*shape)) for _ in range(2)]
+    rhs.append(0.3 * rhs[0] + 2 * rhs[1])
+    x0 = npx.zeros(shape)
+
+    solutions = []
+    for b in rhs:
+        sol = solver.solve(solver_state, b, x0)
+        assert_solution(solver_state, b, sol, tol=1e-8, boundary_val=x0)
+        solutions.append(sol)
+
+    # the last right hand side lies in the span of the previous ones, so the initial guess is (almost) exact
+    np.testing.assert_allclose(initial_guesses[-1], solutions[-1], rtol=1e-6, atol=1e-6 * np.abs(solutions[-1]).max())
@@ -0,0 +1,224 @@
+from contextlib import contextmanager
+from copy import deepcopy
+
+import pytest
+
+import numpy as np
+
+from veros import runtime_settings
+from veros.state import VerosState
+
+
+@contextmanager
+def _set_inplace_updates(value):
+    if runtime_settings.backend not in ("numpy", "numba"):
+        pytest.skip("in-place updates are only supported by the NumPy backend")
+
+    orig_value = runtime_settings.numpy_inplace_updates
+    object.__setattr__(runtime_settings, "numpy_inplace_updates", value)
+    try:
+        yield
+    finally:
+        object.__setattr__(runtime_settings, "numpy_inplace_updates", orig_value)
+
+
+@pytest.fixture
+def inplace_updates():
+    with _set_inplace_updates(True):
+        yield
+
+
+@pytest.fixture
+def dummy_state(inplace_updates):
+    from veros.variables import VARIABLES, DIM_TO_SHAPE_VAR
+    from veros.settings import SETTINGS
+
+    state = VerosState(deepcopy(VARIABLES), deepcopy(SETTINGS), deepcopy(DIM_TO_SHAPE_VAR))
+
+    with state.settings.unlock():
+        state.settings.nx, state.settings.ny, state.settings.nz = 8, 6, 4
+
+    state.initialize_variables()
+    return state
+
+
+def test_update_inplace(inplace_updates):
+    from veros.core.operators import update, update_add, update_multiply, at
+    from veros.variables import allocate
+
+    arr = allocate({"x": 10}, ("x",), include_ghosts=False)
+    orig_ptr = arr.ctypes.data
+
+    arr = update(arr, at[:2], 1.0)
+    arr = update_add(arr, at[1:3], 1.0)
+    arr = update_multiply(arr, at[2:4], 3.0)
+    arr = update(arr, at[-2:], arr[1:3])
+
+    assert arr.ctypes.data == orig_ptr
+    np.testing.assert_array_equal(arr, [1, 2, 3, 0, 0, 0, 0, 0, 2, 3])
+
+    # read-only flag is preserved
+    assert not arr.flags.writeable
+
+
+def test_update_copies_unowned(inplace_updates):
+    from veros.core.operators import update, update_add, at
+
+    arr = np.zeros(10)
+    new_arr = update(arr, at[:2], 1.0)
+    assert new_arr is not arr
+    np.testing.assert_array_equal(arr, 0)
+
+    # results of updates outside of kernels are not owned either
+    newer_arr = update_add(new_arr, at[:2], 1.0)
+    assert newer_arr is not new_arr
+    np.testing.assert_array_equal(new_arr[:2], 1)
+
+
+def test_update_copies_state_outside_kernel(dummy_state):
+    from veros.core.operators import update, at
+
+    vs = dummy_state.variables
+    new_u = update(vs.u, at[:2], 1.0)
+
+    assert new_u is not vs.u
+    np.testing.assert_array_equal(vs.u, 0)
+
+    # allocated arrays lose ownership when they are stored in the state
+    with vs.unlock():
+        vs.u = new_u
+
+    newer_u = update(vs.u, at[:2], 2.0)
+    assert newer_u is not vs.u
+    np.testing.assert_array_equal(vs.u[:2], 1)
+
+
+def test_update_inplace_in_kernel(dummy_state):
+    from veros import veros_kernel, KernelOutput
+    from veros.core.operators import update, update_add, at, numpy as npx
+
+    @veros_kernel
+    def set_velocities(state, other):
+        vs = state.variables
+        u = update(vs.u, at[:2], 1.0)
+        v = update(vs.v, at[:2], 1.0)
+        other = update(other, at[:2], 1.0)
+
+        # arrays created by updates are owned by the kernel
+        w = update(npx.zeros_like(vs.w), at[:2], 1.0)
+        w_new = update_add(w, at[:2], 1.0)
+        assert w_new is w
+
+        return KernelOutput(u=u, v=v, w=w_new), other
+
+    vs = dummy_state.variables
+    old_u, old_v = vs.u, vs.v
+
+    with vs.unlock():
+        # v is also passed as separate argument, so it must not be modified in-place
+        out, other = set_velocities(dummy_state, vs.v)
+        vs.update(out)
+
+    assert vs.u is old_u
+    np.testing.assert_array_equal(vs.u[:2], 1)
+
+    assert vs.v is not old_v
+    np.testing.assert_array_equal(old_v, 0)
+    np.testing.assert_array_equal(other[:2], 1)
+    np.testing.assert_array_equal(vs.w[:2], 2)
+
+    # ownership ends with the kernel
+    new_u = update(vs.u, at[:2], 3.0)
+    assert new_u is not vs.u
+
+
+def test_update_no_aliasing(inplace_updates):
+    from veros.core.operators import update, at
+    from veros.variables import allocate
+
+    # views are never modified in-place
+    base = allocate({"x": 10}, ("x",), include_ghosts=False)
+    arr = base[2:]
+    arr = update(arr, at[...], 1.0)
+    np.testing.assert_array_equal(base, 0)
+
+
+def test_update_inplace_disabled():
+    from veros.core.operators import update, at
+    from veros.variables import allocate
+
+    with _set_inplace_updates(False):
+        arr = allocate({"x": 10}, ("x",), include_ghosts=False)
+        orig_ptr = arr.ctypes.data
+
+        arr = update(arr, at[:2], 1.0)
+
+    assert arr.ctypes.data != orig_ptr
+
+
+@pytest.mark.skipif(runtime_settings.backend not in ("numpy", "numba"), reason="Must use NumPy or numba backend")
+def test_solve_tridiagonal_numba():
+    from veros.core.operators import solve_tridiagonal_numpy, solve_tridiagonal_numba
+    from veros.core.utilities import create_water_masks
+
+    nx, ny, nz = 10, 12, 20
+    a, c, d = (np.random.randn(nx, ny, nz) for _ in range(3))
+    b = 4 + np.random.rand(nx, ny, nz)
+    kbot = np.random.randint(0, nz, size=(nx, ny))
+
+    _, water_mask, edge_mask = create_water_masks(kbot, nz)
+    out_numpy = solve_tridiagonal_numpy(a, b, c, d, water_mask, edge_mask)
+    out_numba = solve_tridiagonal_numba(a, b, c, d, water_mask, edge_mask)
+
+    np.testing.assert_allclose(out_numpy, out_numba)
+
+
+@pytest.mark.skipif(runtime_settings.backend not in ("numpy", "numba"), reason="Must use NumPy or numba backend")
+def test_solve_tridiagonal_numpy_ext():
+    pytest.importorskip("veros.core.special.tdma_cython_")
+
+    from veros.core.operators import solve_tridiagonal_numpy
+    from veros.core.utilities import create_water_masks
+
+    nx, ny, nz = 10, 12, 20
+    a, c, d = (np.random.randn(nx, ny, nz) for _ in range(3))
+    b = 4 + np.random.rand(nx, ny, nz)
+    kbot = np.random.randint(0, nz, size=(nx, ny))
+
+    _, water_mask, edge_mask = create_water_masks(kbot, nz)
+    out_lapack = solve_tridiagonal_numpy(a, b, c, d, water_mask, edge_mask, use_ext=False)
+    out_ext = solve_tridiagonal_numpy(a, b, c, d, water_mask, edge_mask, use_ext=True)
+
+    np.testing.assert_allclose(out_lapack, out_ext)
+
+
+@pytest.mark.skipif(runtime_settings.backend not in ("numpy", "numba"), reason="Must use NumPy or numba backend")
+def test_water_masks_cached():
+    from veros.core.utilities import create_water_masks
+
+    nz = 20
+    kbot = np.random.randint(0, nz, size=(10, 12))
+
+    masks = create_water_masks(kbot, nz)
+    assert create_water_masks(kbot.copy(), nz) is masks
+    assert all(not mask.flags.writeable for mask in masks)
+    assert create_water_masks(kbot + 1, nz) is not masks
+
+
+def test_solve_tridiagonal_stacked_rhs():
+    from veros.core.operators import solve_tridiagonal
+    from veros.core.utilities import create_water_masks
+
+    nx, ny, nz = 10, 12, 20
+    a, c = (np.random.randn(nx, ny, nz) for _ in range(2))
+    b = 4 + np.random.rand(nx, ny, nz)
+    d = np.random.randn(3, nx, ny, nz)
+    kbot = np.random.randint(0, nz, size=(nx, ny))
+
+    _, water_mask, edge_mask = create_water_masks(kbot, nz)
+    out_stacked = solve_tridiagonal(a, b, c, d, water_mask, edge_mask)
+    assert out_stacked.shape == d.shape
+
+    for d_n, out_n in zip(d, out_stacked):
+        out_single = solve_tridiagonal(a, b, c, d_n, water_mask, edge_mask)
+        np.testing.assert_allclose(out_n, out_single)
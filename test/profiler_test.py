@@ -0,0 +1,42 @@
+import pytest
+import numpy as np
+
+from veros import runtime_settings
+
+
+@pytest.mark.skipif(runtime_settings.backend == "jax", reason="JAX backend does not use tracemalloc")
+def test_memory_profiler_nested():
+    import tracemalloc
+    from veros.profiler import MemoryProfiler
+
+    was_tracing = tracemalloc.is_tracing()
+    profiler = MemoryProfiler()
+    assert profiler.method == "tracemalloc"
+
+    try:
+        profiler.enter()
+
+        profiler.enter()
+        tmp = np.ones(1_000_000)
+        del tmp
+        profiler.exit("child")
+
+        keep = np.ones(200_000)
+        profiler.exit("parent")
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+    mb = 1024**2
+    num_calls, highest, net_change = profiler.records["child"]
+    assert num_calls == 1
+    assert highest == pytest.approx(8e6, abs=0.1 * mb)
+    assert net_change == pytest.approx(0, abs=0.1 * mb)
+
+    num_calls, highest, net_change = profiler.records["parent"]
+    assert num_calls == 1
+    assert highest == pytest.approx(8e6, abs=0.1 * mb)
+    assert net_change == pytest.approx(keep.nbytes, abs=0.1 * mb)
+
+    summary = profiler.summary().splitlines()
+    assert {line.split()[0] for line in summary[-2:]} == {"parent", "child"}
@@ -0,0 +1,75 @@
+from copy import deepcopy
+
+import pytest
+
+import numpy as np
+
+from veros import runtime_settings
+from veros.state import VerosState
+
+
+@pytest.fixture
+def dummy_state():
+    from veros.variables import VARIABLES, DIM_TO_SHAPE_VAR
+    from veros.settings import SETTINGS
+
+    state = VerosState(deepcopy(VARIABLES), deepcopy(SETTINGS), deepcopy(DIM_TO_SHAPE_VAR))
+
+    with state.settings.unlock():
+        state.settings.nx, state.settings.ny, state.settings.nz = 8, 6, 4
+
+    state.initialize_variables()
+    return state
+
+
+def _is_deleted(arr):
+    return getattr(arr, "is_deleted", lambda: False)()
+
+
+def test_kernel_donate_variables(dummy_state):
+    from veros import veros_kernel, KernelOutput
+
+    @veros_kernel(donate_variables=("temp", "salt"))
+    def increment_tracers(state):
+        vs = state.variables
+        vs.temp = vs.temp + 1
+        vs.salt = vs.salt + vs.u
+        return KernelOutput(temp=vs.temp, salt=vs.salt)
+
+    vs = dummy_state.variables
+    old_temp, old_salt, old_u = vs.temp, vs.salt, vs.u
+
+    with vs.unlock():
+        vs.update(increment_tracers(dummy_state))
+
+    np.testing.assert_array_equal(vs.temp, 1)
+    np.testing.assert_array_equal(vs.salt, 0)
+
+    if runtime_settings.backend == "jax":
+        assert _is_deleted(old_temp) and _is_deleted(old_salt)
+
+    assert not _is_deleted(old_u)
+
+    # buffers that are referenced elsewhere are not donated
+    with vs.unlock():
+        vs.salt = vs.u
+
+    with vs.unlock():
+        vs.update(increment_tracers(dummy_state))
+
+    assert not _is_deleted(old_u)
+    np.testing.assert_array_equal(vs.temp, 2)
+    np.testing.assert_array_equal(vs.u, 0)
+
+
+@pytest.mark.skipif(runtime_settings.backend != "jax", reason="Donation is only supported by the JAX backend")
+def test_kernel_donate_variables_missing_output(dummy_state):
+    from veros import veros_kernel, KernelOutput
+
+    @veros_kernel(donate_variables=("temp",))
+    def bad_kernel(state):
+        vs = state.variables
+        return KernelOutput(salt=vs.salt + vs.temp)
+
+    with pytest.raises(RuntimeError, match="does not return"):
+        bad_kernel(dummy_state)
@@ -89,3 +89,229 @@ def test_setup_north_atlantic():
         sim.state.settings.runlen = sim.state.settings.dt_tracer
 
     sim.run()
+
+
+@pytest.mark.parametrize("jit_setting", ("jit_timestep", "fuse_timesteps"))
+def test_setup_acc_jit(jit_setting):
+    from veros import runtime_settings
+
+    if runtime_settings.backend != "jax":
+        pytest.skip(f"{jit_setting} requires the JAX backend")
+
+    import numpy as np
+    from veros.setups.acc import ACCSetup
+
+    object.__setattr__(runtime_settings, "linear_solver", "scipy_jax")
+
+    results = []
+    try:
+        for enable_jit in (False, True):
+            object.__setattr__(runtime_settings, jit_setting, enable_jit)
+
+            sim = ACCSetup()
+            sim.setup()
+
+            with sim.state.settings.unlock():
+                sim.state.settings.runlen = sim.state.settings.dt_tracer * 25
+
+            sim.run()
+            results.append(sim.state.variables)
+    finally:
+        object.__setattr__(runtime_settings, jit_setting, False)
+        object.__setattr__(runtime_settings, "linear_solver", "best")
+
+    for var in ("itt", "time", "tau", "u", "v", "temp", "salt", "psi", "B1_gm"):
+        # compiling larger computations may change the order of floating point operations
+        reference = getattr(results[0], var)
+        np.testing.assert_allclose(reference, getattr(results[1], var), atol=1e-10 * np.abs(reference).max())
+
+
+@pytest.mark.parametrize("jit_setting", (None, "jit_timestep", "fuse_timesteps"))
+def test_setup_acc_precompile(jit_setting):
+    from veros import runtime_settings
+
+    if jit_setting is not None and runtime_settings.backend != "jax":
+        pytest.skip(f"{jit_setting} requires the JAX backend")
+
+    import numpy as np
+    from veros.setups.acc import ACCSetup
+    from veros.diagnostics import energy, overturning
+
+    if jit_setting is not None:
+        object.__setattr__(runtime_settings, "linear_solver", "scipy_jax")
+        object.__setattr__(runtime_settings, jit_setting, True)
+
+    try:
+        sim = ACCSetup()
+        sim.precompile()
+
+        vs = sim.state.variables
+        assert vs.itt == 0
+
+        if runtime_settings.backend == "jax":
+            # kernels of diagnostics are compiled, too
+            assert energy.diagnose_kernel._compiled_function is not None
+            assert overturning.diagnose_kernel._compiled_function is not None
+
+        initial_values = {key: np.array(val) for key, val in vs.items()}
+        initial_diagnostic_values = {
+            name: {key: np.array(val) for key, val in diagnostic.variables.items()}
+            for name, diagnostic in sim.state.diagnostics.items()
+            if getattr(diagnostic, "variables", None) is not None
+        }
+        sim.precompile()
+
+        for key, val in vs.items():
+            np.testing.assert_array_equal(initial_values[key], val)
+
+        for name, values in initial_diagnostic_values.items():
+            for key, val in sim.state.diagnostics[name].variables.items():
+                np.testing.assert_array_equal(values[key], val)
+
+        with sim.state.settings.unlock():
+            sim.state.settings.runlen = sim.state.settings.dt_tracer * 2
+
+        sim.run()
+        assert vs.itt == 2
+    finally:
+        if jit_setting is not None:
+            object.__setattr__(runtime_settings, jit_setting, False)
+            object.__setattr__(runtime_settings, "linear_solver", "best")
+
+
+def test_setup_acc_profile_trace(tmpdir):
+    import json
+    from veros import runtime_settings, profiler
+    from veros.setups.acc import ACCSetup
+
+    trace_file = str(tmpdir / "trace.json")
+
+    object.__setattr__(runtime_settings, "profile_mode", True)
+    object.__setattr__(runtime_settings, "profile_trace_file", trace_file)
+
+    try:
+        sim = ACCSetup()
+        sim.setup()
+
+        with sim.state.settings.unlock():
+            sim.state.settings.runlen = sim.state.settings.dt_tracer * 2
+
+        sim.run()
+    finally:
+        object.__setattr__(runtime_settings, "profile_mode", False)
+        object.__setattr__(runtime_settings, "profile_trace_file", "")
+        profiler._TRACE_PROFILER = profiler._PROFILE_SAMPLER = None
+
+    with open(trace_file) as f:
+        events = json.load(f)["traceEvents"]
+
+    steps = [e for e in events if e["name"].endswith("VerosSetup.step") and e["cat"] == "routine"]
+    assert [e["args"]["iteration"] for e in steps] == [0, 1]
+
+    kernels = [e for e in events if e.get("cat") == "kernel"]
+    assert kernels
+
+    # kernels are nested within time steps
+    def is_nested(event, parent):
+        return parent["ts"] <= event["ts"] and event["ts"] + event["dur"] <= parent["ts"] + parent["dur"]
+
+    last_step = steps[-1]
+    assert any(is_nested(e, last_step) and e["args"]["iteration"] == 1 for e in kernels)
+
+
+def test_setup_acc_profile_sampled():
+    from veros import runtime_settings, profiler
+    from veros.setups.acc import ACCSetup
+
+    object.__setattr__(runtime_settings, "profile_mode", True)
+    object.__setattr__(runtime_settings, "profile_sample_interval", 3)
+
+    try:
+        sim = ACCSetup()
+        sim.setup()
+
+        with sim.state.settings.unlock():
+            sim.state.settings.runlen = sim.state.settings.dt_tracer * 10
+
+        sim.run()
+        sampler = profiler.get_profile_sampler()
+    finally:
+        object.__setattr__(runtime_settings, "profile_mode", False)
+        object.__setattr__(runtime_settings, "profile_sample_interval", 1)
+        profiler._PROFILE_SAMPLER = None
+
+    # steps 3, 6, 9 are sampled (first step is excluded from timings)
+    assert len(sampler.samples) == len(sampler.step_times) == 3
+
+    statistics = sampler.get_statistics()
+    step_timer = next(name for name in statistics if name.endswith("VerosSetup.step"))
+    mean, ci = statistics[step_timer]
+    assert 0 < mean <= max(sampler.step_times)
+    assert ci >= 0
+
+    # kernels are not timed outside of sampled steps
+    kernel_time = sum(sample[step_timer] for sample in sampler.samples)
+    assert sim.state.profile_timers[step_timer].total_time == pytest.approx(kernel_time)
+
+
+@pytest.mark.parametrize("log_format", ("jsonl", "csv"))
+def test_setup_acc_performance_log(tmpdir, log_format):
+    import csv
+    import json
+    from veros import runtime_settings
+    from veros.setups.acc import ACCSetup
+
+    log_file = str(tmpdir / f"perf.{log_format}")
+    object.__setattr__(runtime_settings, "performance_log_file", log_file)
+
+    try:
+        sim = ACCSetup()
+        sim.setup()
+
+        with sim.state.settings.unlock():
+            sim.state.settings.runlen = sim.state.settings.dt_tracer * 4
+
+        sim.run()
+    finally:
+        object.__setattr__(runtime_settings, "performance_log_file", "")
+
+    with open(log_file) as f:
+        if log_format == "csv":
+            records = list(csv.DictReader(f))
+        else:
+            records = [json.loads(line) for line in f]
+
+    # first iteration is not logged
+    assert [int(r["iteration"]) for r in records] == [2, 3, 4]
+
+    for record in records:
+        assert float(record["wall_time"]) >= float(record["main_time"]) > 0
+        assert float(record["sypd"]) > 0
+        assert int(record["peak_rss_bytes"]) > 0
+
+
+def test_setup_acc_profile_memory():
+    from veros import runtime_settings, profiler
+    from veros.setups.acc import ACCSetup
+
+    object.__setattr__(runtime_settings, "profile_mode", True)
+    object.__setattr__(runtime_settings, "profile_memory", True)
+
+    try:
+        sim = ACCSetup()
+        sim.setup()
+
+        with sim.state.settings.unlock():
+            sim.state.settings.runlen = sim.state.settings.dt_tracer * 2
+
+        sim.run()
+        memory_profiler = profiler.get_memory_profiler()
+    finally:
+        object.__setattr__(runtime_settings, "profile_mode", False)
+        object.__setattr__(runtime_settings, "profile_memory", False)
+        profiler._MEMORY_PROFILER = profiler._PROFILE_SAMPLER = None
+
+    step_record = next(rec for name, rec in memory_profiler.records.items() if name.endswith("VerosSetup.step"))
+    num_calls, highest, _ = step_record
+    assert num_calls == 2
+    assert highest > 0
@@ -1,5 +1,9 @@
+from copy import deepcopy
+
 import pytest
 
+import numpy as np
+
 from veros.state import VerosSettings, VerosVariables, VerosState
 
 
@@ -8,7 +12,7 @@ def dummy_state():
     from veros.variables import VARIABLES, DIM_TO_SHAPE_VAR
     from veros.settings import SETTINGS
 
-    return VerosState(VARIABLES, SETTINGS, DIM_TO_SHAPE_VAR)
+    return VerosState(deepcopy(VARIABLES), deepcopy(SETTINGS), deepcopy(DIM_TO_SHAPE_VAR))
 
 
 @pytest.fixture
@@ -23,7 +27,7 @@ def dummy_variables():
     from veros.variables import VARIABLES, DIM_TO_SHAPE_VAR
     from veros.settings import SETTINGS
 
-    dummy_state = VerosState(VARIABLES, SETTINGS, DIM_TO_SHAPE_VAR)
+    dummy_state = VerosState(deepcopy(VARIABLES), deepcopy(SETTINGS), deepcopy(DIM_TO_SHAPE_VAR))
     dummy_state.initialize_variables()
     return dummy_state.variables
 
@@ -128,6 +132,41 @@ def test_resize_dimension(dummy_state):
     assert dummy_state.dimensions["xt"] == 100
     assert dummy_state.variables.dxt.shape == (104,)
 
+    # cached shapes are invalidated
+    with dummy_state.variables.unlock():
+        dummy_state.variables.dxt = np.ones(104)
+
+        with pytest.raises(ValueError):
+            dummy_state.variables.dxt = np.ones(14)
+
+
+def test_variable_validation(dummy_state):
+    with dummy_state.settings.unlock():
+        dummy_state.settings.nx, dummy_state.settings.ny, dummy_state.settings.nz = 10, 12, 4
+
+    dummy_state.initialize_variables()
+    vs = dummy_state.variables
+    shape = vs.kbot.shape
+
+    with pytest.raises(RuntimeError):
+        vs.kbot = np.ones(shape, dtype="int32")
+
+    with vs.unlock():
+        # wrong dtypes are converted
+        vs.kbot = np.ones(shape, dtype="float32")
+        assert vs.kbot.dtype == np.dtype("int32")
+        np.testing.assert_array_equal(vs.kbot, 1)
+
+        with pytest.raises(ValueError):
+            vs.kbot = np.ones(shape[:-1], dtype="int32")
+
+        # inactive variables
+        with pytest.raises(RuntimeError):
+            vs.tke = 0.0
+
+        with pytest.raises(AttributeError):
+            vs.update(foobar=0.0)
+
 
 def test_timers(dummy_state):
     from veros.timer import Timer
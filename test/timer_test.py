@@ -0,0 +1,59 @@
+import pytest
+import numpy as np
+
+
+def test_timer_statistics(monkeypatch):
+    from veros import timer
+
+    elapsed = np.linspace(0.01, 1.0, 100)
+    clock = iter(np.cumsum(np.stack([np.zeros_like(elapsed), elapsed], axis=1).ravel()))
+    monkeypatch.setattr(timer.timeit, "default_timer", lambda: next(clock))
+
+    t = timer.Timer()
+    assert t.statistics() == dict(count=0)
+
+    for _ in elapsed:
+        with t:
+            pass
+
+    stats = t.statistics()
+    assert stats["count"] == 100
+    assert stats["total"] == pytest.approx(elapsed.sum())
+    assert stats["mean"] == pytest.approx(elapsed.mean())
+    assert stats["min"] == pytest.approx(0.01)
+    assert stats["max"] == pytest.approx(1.0)
+
+    for q in (50, 95, 99):
+        assert stats[f"p{q}"] == pytest.approx(np.percentile(elapsed, q))
+
+
+def test_timer_inactive():
+    from veros.timer import Timer, timer_context
+
+    t = Timer()
+    timer_context.active = False
+
+    try:
+        with t:
+            pass
+    finally:
+        timer_context.active = True
+
+    assert t.last_time > 0
+    assert t.total_time == 0
+    assert t.statistics() == dict(count=0)
+
+
+def test_timer_bounded_samples(monkeypatch):
+    from veros.timer import Timer
+
+    monkeypatch.setattr(Timer, "max_samples", 10)
+
+    t = Timer()
+    for _ in range(100):
+        with t:
+            pass
+
+    assert t.num_calls == 100
+    assert len(t._samples) == 10
+    assert t.min_time <= t.percentile(50) <= t.max_time
@@ -1,8 +1,12 @@
+import os
 import warnings
 
-BACKENDS = ("numpy", "jax")
+BACKENDS = ("numpy", "jax", "numba")
 
-BACKEND_MESSAGES = {"jax": "Kernels are compiled during first iteration, be patient"}
+BACKEND_MESSAGES = {
+    "jax": "Kernels are compiled during first iteration, be patient",
+    "numba": "Kernels are compiled during first iteration, be patient",
+}
 
 _init_done = set()
 
@@ -39,6 +43,9 @@ def init_jax_config():
 
     jax.config.update("jax_platform_name", runtime_settings.device)
 
+    if runtime_settings.compilation_cache_dir:
+        init_jax_compilation_cache(runtime_settings.compilation_cache_dir)
+
     jax.tree_util.register_pytree_node(VerosState, veros_state_pytree_flatten, veros_state_pytree_unflatten)
     jax.tree_util.register_pytree_node(VerosVariables, veros_variables_pytree_flatten, veros_variables_pytree_unflatten)
     jax.tree_util.register_pytree_node(
@@ -48,6 +55,51 @@ def init_jax_config():
     _init_done.add("jax")
 
 
+def init_jax_compilation_cache(cache_dir):
+    """Store compiled kernels on disk, so they can be re-used by later runs.
+
+    Cache entries are keyed by the lowered computation of each kernel (which includes the kernel
+    name, static arguments, and the shapes and dtypes of all inputs), along with compiler options,
+    device, and JAX version, so changes to any of these lead to recompilation.
+    """
+    import jax
+
+    cache_dir = os.path.abspath(os.path.expanduser(cache_dir))
+    os.makedirs(cache_dir, exist_ok=True)
+
+    try:
+        jax.config.update("jax_compilation_cache_dir", cache_dir)
+    except AttributeError:
+        # older JAX versions
+        from jax.experimental.compilation_cache import compilation_cache
+
+        compilation_cache.initialize_cache(cache_dir)
+
+    # cache all kernels, even if they compile quickly
+    jax.config.update("jax_persistent_cache_min_compile_time_secs", 0)
+
+
+def init_numba_config():
+    if "numba" in _init_done:
+        return
+
+    from veros import runtime_settings
+
+    if runtime_settings.compilation_cache_dir:
+        # kernels are always cached, but put them next to JAX kernels if requested
+        # (must happen before numba is imported)
+        os.environ.setdefault(
+            "NUMBA_CACHE_DIR", os.path.abspath(os.path.expanduser(runtime_settings.compilation_cache_dir))
+        )
+
+    try:
+        import numba  # noqa: F401
+    except ImportError as exc:
+        raise RuntimeError("Using the numba backend requires numba to be installed") from exc
+
+    _init_done.add("numba")
+
+
 def get_backend_module(backend_name):
     if backend_name not in BACKENDS:
         raise ValueError(f"unrecognized backend {backend_name} (must be either of: {list(BACKENDS.keys())!r})")
@@ -56,6 +108,11 @@ def get_backend_module(backend_name):
         init_jax_config()
         import jax.numpy as backend_module
 
+    elif backend_name == "numba":
+        # numba operates on plain NumPy arrays
+        init_numba_config()
+        import numpy as backend_module
+
     elif backend_name == "numpy":
         import numpy as backend_module
 
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+
+import functools
+
+import click
+
+from veros.cli.veros_run import load_setup, setup_options
+
+
+def decompose(setup_file, outfile, keep_land, *args, **kwargs):
+    """Creates a land-aware domain decomposition for a Veros setup
+
+    Runs the model setup on a single process and splits the domain into NUM_PROC tiles of different sizes,
+    so that all columns and rows of tiles contain about the same number of wet grid cells. Tiles that only
+    contain land are dropped (unless --keep-land is given), so no process is wasted on them. To use the
+    decomposition, pass the written file and the same NUM_PROC to veros run, and start as many processes as
+    there are active tiles:
+
+        mpirun -np <active tiles> veros run SETUP_FILE -n PX PY --decomposition-file OUTFILE
+    """
+    import numpy as np
+
+    from veros import logger
+    from veros.decomposition import Decomposition
+
+    num_proc = tuple(kwargs["num_proc"])
+    kwargs.update(num_proc=(1, 1), decomposition_file="", diskless_mode=True)
+
+    sim = load_setup(setup_file, *args, **kwargs)
+    sim.setup()
+
+    kbot = np.asarray(sim.state.variables.kbot[2:-2, 2:-2])
+    decomposition = Decomposition.balanced(kbot, num_proc, drop_land=not keep_land)
+    decomposition.to_file(outfile)
+
+    wet_cells = decomposition.count_wet_cells(kbot)[decomposition.active]
+    logger.info(
+        f"Wrote decomposition to {outfile}\n"
+        f" Tiles: {num_proc[0]}x{num_proc[1]} ({decomposition.num_active} active)\n"
+        f" Tile widths (x): {', '.join(map(str, decomposition.sizes[0]))}\n"
+        f" Tile heights (y): {', '.join(map(str, decomposition.sizes[1]))}\n"
+        f" Wet cells per process: {wet_cells.min()} (min) / {wet_cells.mean():.1f} (mean) / {wet_cells.max()} (max)\n"
+        f" Run with: mpirun -np {decomposition.num_active} veros run {setup_file} "
+        f"-n {num_proc[0]} {num_proc[1]} --decomposition-file {outfile}"
+    )
+
+    return decomposition
+
+
+@click.command("veros-decompose")
+@click.argument("SETUP_FILE", type=click.Path(readable=True, dir_okay=False, resolve_path=True, exists=True))
+@click.option(
+    "-o",
+    "--outfile",
+    default="decomposition.json",
+    type=click.Path(dir_okay=False, writable=True),
+    help="File to write the decomposition to",
+    show_default=True,
+)
+@click.option("--keep-land", is_flag=True, help="Do not drop tiles that only contain land")
+@setup_options
+@functools.wraps(decompose)
+def cli(setup_file, *args, **kwargs):
+    if not setup_file.endswith(".py"):
+        raise click.UsageError(f"The given setup file {setup_file} does not appear to be a Python file.")
+
+    if kwargs["num_proc"][0] * kwargs["num_proc"][1] < 2:
+        raise click.UsageError("Number of tiles has to be given via -n / --num-proc")
+
+    decompose(setup_file, *args, **kwargs)
@@ -0,0 +1,33 @@
+#!/usr/bin/env python
+
+import functools
+
+import click
+
+from veros.cli.veros_run import load_setup, setup_options
+
+
+def precompile(setup_file, *args, **kwargs):
+    """Compiles all kernels used by a Veros setup without running it
+
+    Runs the model setup and compiles every kernel that is used during time stepping
+    (including plugins and the sampling of diagnostics), without advancing model time
+    or writing any output. Use this together with
+    --compilation-cache-dir to populate the compilation cache ahead of time, e.g. on a
+    login node before submitting a job. All options affecting compiled code (backend,
+    device, float type, number of processes, setting overrides) have to match the later
+    call to veros run.
+    """
+    sim = load_setup(setup_file, *args, **kwargs)
+    sim.precompile()
+
+
+@click.command("veros-precompile")
+@click.argument("SETUP_FILE", type=click.Path(readable=True, dir_okay=False, resolve_path=True, exists=True))
+@setup_options
+@functools.wraps(precompile)
+def cli(setup_file, *args, **kwargs):
+    if not setup_file.endswith(".py"):
+        raise click.UsageError(f"The given setup file {setup_file} does not appear to be a Python file.")
+
+    return precompile(setup_file, *args, **kwargs)
@@ -41,16 +41,27 @@ def _import_from_file(path):
     return mod
 
 
-def run(setup_file, *args, **kwargs):
-    """Runs a Veros setup from given file"""
+def load_setup(setup_file, *args, **kwargs):
+    """Applies runtime settings and instantiates the Veros setup from given file"""
     from veros import runtime_settings, VerosSetup, __version__ as veros_version
 
     kwargs["override"] = dict(kwargs["override"])
 
+    if kwargs["profile_trace_file"] or kwargs["profile_sample_interval"] > 1 or kwargs["profile_memory"]:
+        kwargs["profile_mode"] = True
+
     runtime_setting_kwargs = (
         "backend",
         "profile_mode",
+        "profile_trace_file",
+        "profile_sample_interval",
+        "profile_memory",
+        "performance_log_file",
+        "jit_timestep",
+        "fuse_timesteps",
+        "compilation_cache_dir",
         "num_proc",
+        "decomposition_file",
         "loglevel",
         "device",
         "float_type",
@@ -82,68 +93,146 @@ def run(setup_file, *args, **kwargs):
             "Consider switching to this version of Veros or updating your setup file.\n"
         )
 
-    sim = SetupClass(*args, **kwargs)
+    return SetupClass(*args, **kwargs)
+
+
+def run(setup_file, *args, **kwargs):
+    """Runs a Veros setup from given file"""
+    sim = load_setup(setup_file, *args, **kwargs)
     sim.setup()
     sim.run()
 
 
+SETUP_OPTIONS = (
+    click.option(
+        "-b",
+        "--backend",
+        default="numpy",
+        type=click.Choice(["numpy", "jax", "numba"]),
+        help="Backend to use for computations",
+        show_default=True,
+    ),
+    click.option(
+        "--device",
+        default="cpu",
+        type=click.Choice(["cpu", "gpu"]),
+        help="Hardware device to use (JAX backend only)",
+        show_default=True,
+    ),
+    click.option(
+        "-v",
+        "--loglevel",
+        default="info",
+        type=click.Choice(["trace", "debug", "info", "warning", "error"]),
+        help="Log level used for output",
+        show_default=True,
+    ),
+    click.option(
+        "-s",
+        "--override",
+        nargs=2,
+        multiple=True,
+        metavar="SETTING VALUE",
+        type=VerosSetting(),
+        default=tuple(),
+        help="Override model setting, may be specified multiple times",
+    ),
+    click.option(
+        "-p",
+        "--profile-mode",
+        is_flag=True,
+        default=False,
+        type=click.BOOL,
+        envvar="VEROS_PROFILE",
+        help="Write a performance profile for debugging",
+        show_default=True,
+    ),
+    click.option(
+        "--profile-trace",
+        "profile_trace_file",
+        default="",
+        type=click.Path(dir_okay=False, writable=True),
+        envvar="VEROS_PROFILE_TRACE_FILE",
+        help="Write a trace of all routines, kernels, and MPI calls to this file (Chrome trace format, implies --profile-mode)",
+    ),
+    click.option(
+        "--profile-sample-interval",
+        default=1,
+        type=click.IntRange(min=1),
+        envvar="VEROS_PROFILE_SAMPLE_INTERVAL",
+        help="Only profile every Nth time step, so all others run at full speed (implies --profile-mode if > 1)",
+        show_default=True,
+    ),
+    click.option(
+        "--profile-memory",
+        is_flag=True,
+        default=False,
+        envvar="VEROS_PROFILE_MEMORY",
+        help="Record the memory high-water mark of every routine and kernel (implies --profile-mode)",
+    ),
+    click.option(
+        "--performance-log",
+        "performance_log_file",
+        default="",
+        type=click.Path(dir_okay=False, writable=True),
+        envvar="VEROS_PERFORMANCE_LOG_FILE",
+        help="Write timings, throughput, and memory use of every time step to this file (CSV if it ends in .csv, "
+        "JSON lines otherwise)",
+    ),
+    click.option(
+        "--jit-timestep",
+        is_flag=True,
+        default=False,
+        envvar="VEROS_JIT_TIMESTEP",
+        help="Compile each time step into a single computation (JAX backend only)",
+    ),
+    click.option(
+        "--fuse-timesteps",
+        is_flag=True,
+        default=False,
+        envvar="VEROS_FUSE_TIMESTEPS",
+        help="Integrate all time steps between diagnostics and output events in a single computation (JAX backend only)",
+    ),
+    click.option(
+        "--compilation-cache-dir",
+        default="",
+        type=click.Path(file_okay=False),
+        envvar="VEROS_COMPILATION_CACHE_DIR",
+        help="Directory to store compiled kernels in, so they can be re-used by later runs",
+    ),
+    click.option("--force-overwrite", is_flag=True, help="Silently overwrite existing outputs"),
+    click.option("--diskless-mode", is_flag=True, help="Supress all output to disk"),
+    click.option(
+        "--float-type",
+        default="float64",
+        type=click.Choice(["float64", "float32"]),
+        help="Floating point precision to use",
+        show_default=True,
+    ),
+    click.option(
+        "-n", "--num-proc", nargs=2, default=[1, 1], type=click.INT, help="Number of processes in x and y dimension"
+    ),
+    click.option(
+        "--decomposition-file",
+        default="",
+        type=click.Path(dir_okay=False),
+        envvar="VEROS_DECOMPOSITION_FILE",
+        help="Use the domain decomposition from this file (as created by veros decompose)",
+    ),
+)
+
+
+def setup_options(func):
+    """Adds all command line options that are needed to load a setup via load_setup"""
+    for option in reversed(SETUP_OPTIONS):
+        func = option(func)
+
+    return func
+
+
 @click.command("veros-run")
 @click.argument("SETUP_FILE", type=click.Path(readable=True, dir_okay=False, resolve_path=True, exists=True))
-@click.option(
-    "-b",
-    "--backend",
-    default="numpy",
-    type=click.Choice(["numpy", "jax"]),
-    help="Backend to use for computations",
-    show_default=True,
-)
-@click.option(
-    "--device",
-    default="cpu",
-    type=click.Choice(["cpu", "gpu"]),
-    help="Hardware device to use (JAX backend only)",
-    show_default=True,
-)
-@click.option(
-    "-v",
-    "--loglevel",
-    default="info",
-    type=click.Choice(["trace", "debug", "info", "warning", "error"]),
-    help="Log level used for output",
-    show_default=True,
-)
-@click.option(
-    "-s",
-    "--override",
-    nargs=2,
-    multiple=True,
-    metavar="SETTING VALUE",
-    type=VerosSetting(),
-    default=tuple(),
-    help="Override model setting, may be specified multiple times",
-)
-@click.option(
-    "-p",
-    "--profile-mode",
-    is_flag=True,
-    default=False,
-    type=click.BOOL,
-    envvar="VEROS_PROFILE",
-    help="Write a performance profile for debugging",
-    show_default=True,
-)
-@click.option("--force-overwrite", is_flag=True, help="Silently overwrite existing outputs")
-@click.option("--diskless-mode", is_flag=True, help="Supress all output to disk")
-@click.option(
-    "--float-type",
-    default="float64",
-    type=click.Choice(["float64", "float32"]),
-    help="Floating point precision to use",
-    show_default=True,
-)
-@click.option(
-    "-n", "--num-proc", nargs=2, default=[1, 1], type=click.INT, help="Number of processes in x and y dimension"
-)
+@setup_options
 @functools.wraps(run)
 def cli(setup_file, *args, **kwargs):
     if not setup_file.endswith(".py"):
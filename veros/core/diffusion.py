@@ -62,7 +62,7 @@ def dissipation_on_wgrid(state, diss, ks):
     return diss_w
 
 
-@veros_kernel
+@veros_kernel(donate_variables=("temp", "salt"))
 def tempsalt_biharmonic(state):
     """
     biharmonic mixing of temp and salinity,
@@ -96,7 +96,7 @@ def tempsalt_biharmonic(state):
     )
 
 
-@veros_kernel
+@veros_kernel(donate_variables=("temp", "salt"))
 def tempsalt_diffusion(state):
     """
     Diffusion of temp and salinity,
@@ -128,7 +128,7 @@ def tempsalt_diffusion(state):
     )
 
 
-@veros_kernel
+@veros_kernel(donate_variables=("temp", "salt"))
 def tempsalt_sources(state):
     """
     Sources of temp and salinity,
@@ -202,25 +202,38 @@ def biharmonic_diffusion(state, tr, diffusivity):
         / (vs.cost[npx.newaxis, 1:, npx.newaxis] * vs.dyt[npx.newaxis, 1:, npx.newaxis]),
     )
 
-    del2 = utilities.enforce_boundaries(del2, settings.enable_cyclic_x)
+    def get_flux_east(del2, x, y):
+        return (
+            diffusivity
+            * (del2[utilities.shift_slice(x, 1), y, :] - del2[x, y, :])
+            / (vs.cost[npx.newaxis, y, npx.newaxis] * vs.dxu[x, npx.newaxis, npx.newaxis])
+            * vs.maskU[x, y, :]
+        )
 
-    flux_east = update(
-        flux_east,
-        at[:-1, :, :],
-        diffusivity
-        * (del2[1:, :, :] - del2[:-1, :, :])
-        / (vs.cost[npx.newaxis, :, npx.newaxis] * vs.dxu[:-1, npx.newaxis, npx.newaxis])
-        * vs.maskU[:-1, :, :],
-    )
-    flux_north = update(
-        flux_north,
-        at[:, :-1, :],
-        diffusivity
-        * (del2[:, 1:, :] - del2[:, :-1, :])
-        / vs.dyu[npx.newaxis, :-1, npx.newaxis]
-        * vs.maskV[:, :-1, :]
-        * vs.cosu[npx.newaxis, :-1, npx.newaxis],
-    )
+    def get_flux_north(del2, x, y):
+        return (
+            diffusivity
+            * (del2[x, utilities.shift_slice(y, 1), :] - del2[x, y, :])
+            / vs.dyu[npx.newaxis, y, npx.newaxis]
+            * vs.maskV[x, y, :]
+            * vs.cosu[npx.newaxis, y, npx.newaxis]
+        )
+
+    # fluxes that do not depend on the overlap of del2 are computed while it is exchanged
+    nx, ny = del2.shape[:2]
+    east_region, east_interior = (slice(0, nx - 1), slice(0, ny)), (slice(2, nx - 3), slice(2, ny - 2))
+    north_region, north_interior = (slice(0, nx), slice(0, ny - 1)), (slice(2, nx - 2), slice(2, ny - 3))
+
+    exchange = utilities.start_boundary_exchange((del2,), settings.enable_cyclic_x)
+    flux_east = update(flux_east, at[east_interior], get_flux_east(del2, *east_interior))
+    flux_north = update(flux_north, at[north_interior], get_flux_north(del2, *north_interior))
+    (del2,) = utilities.finish_boundary_exchange(exchange)
+
+    for strip in utilities.split_region(east_region, east_interior):
+        flux_east = update(flux_east, at[strip], get_flux_east(del2, *strip))
+
+    for strip in utilities.split_region(north_region, north_interior):
+        flux_north = update(flux_north, at[strip], get_flux_north(del2, *strip))
 
     flux_east = update(flux_east, at[-1, :, :], 0.0)
     flux_north = update(flux_north, at[:, -1, :], 0.0)
@@ -90,7 +90,7 @@ def integrate_eke(state):
     vs.update(integrate_eke_kernel(state))
 
 
-@veros_kernel
+@veros_kernel(donate_variables=("eke",))
 def integrate_eke_kernel(state):
     """
     integrate EKE equation on W grid
@@ -9,6 +9,14 @@ def assemble_poisson_matrix(state):
         return assemble_pressure_matrix(state)
 
 
+def get_boundary_mask(state):
+    """Returns a mask that is False where the solution of the linear system is fixed (to ``boundary_val``)"""
+    if state.settings.enable_streamfunction:
+        return state.variables.isle_boundary_mask
+    else:
+        return state.variables.maskT[:, :, -1]
+
+
 def assemble_pressure_matrix(state):
     main_diag = allocate(state.dimensions, ("xu", "yu"), fill=1)
     east_diag, west_diag, north_diag, south_diag = (allocate(state.dimensions, ("xu", "yu")) for _ in range(4))
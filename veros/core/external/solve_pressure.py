@@ -124,8 +124,7 @@ def prepare_forcing(state):
         npx.sum((vs.v[2:-2, 2:-2, :, vs.taup1]) * vs.maskV[2:-2, 2:-2, :] * vs.dzt, axis=(2,)) / settings.dt_mom,
     )
 
-    uloc = mainutils.enforce_boundaries(uloc, settings.enable_cyclic_x)
-    vloc = mainutils.enforce_boundaries(vloc, settings.enable_cyclic_x)
+    uloc, vloc = mainutils.enforce_boundaries_many((uloc, vloc), settings.enable_cyclic_x)
 
     forc = allocate(state.dimensions, ("xt", "yt"))
 
@@ -146,7 +145,7 @@ def prepare_forcing(state):
     return KernelOutput(du=vs.du, dv=vs.dv, u=vs.u, v=vs.v, psi=vs.psi, p_hydro=vs.p_hydro), forc
 
 
-@veros_kernel
+@veros_kernel(donate_variables=("u", "v"))
 def barotropic_velocity_update(state):
     """
     solve for surface pressure
@@ -80,8 +80,7 @@ def prepare_forcing(state):
     uloc = npx.sum((vs.du[:, :, :, vs.tau] + vs.du_mix) * vs.maskU * vs.dzt, axis=(2,)) * vs.hur
     vloc = npx.sum((vs.dv[:, :, :, vs.tau] + vs.dv_mix) * vs.maskV * vs.dzt, axis=(2,)) * vs.hvr
 
-    uloc = mainutils.enforce_boundaries(uloc, settings.enable_cyclic_x)
-    vloc = mainutils.enforce_boundaries(vloc, settings.enable_cyclic_x)
+    uloc, vloc = mainutils.enforce_boundaries_many((uloc, vloc), settings.enable_cyclic_x)
 
     forc = allocate(state.dimensions, ("xt", "yt"))
     forc = update(
@@ -97,7 +96,7 @@ def prepare_forcing(state):
     return KernelOutput(du=vs.du, dv=vs.dv, dpsi=vs.dpsi, p_hydro=vs.p_hydro), (forc, uloc, vloc)
 
 
-@veros_kernel
+@veros_kernel(donate_variables=("u", "v"))
 def barotropic_velocity_update(state, uloc, vloc):
     """
     solve for barotropic streamfunction
@@ -16,17 +16,44 @@ def memoize(func):
     return inner
 
 
+def _has_inactive_tiles():
+    from veros.distributed import get_decomposition
+
+    decomposition = get_decomposition()
+    return decomposition is not None and decomposition.has_inactive_tiles
+
+
 def _get_solver_class():
     ls = rs.linear_solver
 
+    # the solver is traced as part of the time step, so it has to be written in JAX
+    traced = rs.jit_timestep or rs.fuse_timesteps
+
+    if traced and ls not in ("scipy_jax", "best"):
+        raise ValueError(f'linear solver {ls} is not supported with jit_timestep / fuse_timesteps, use "scipy_jax"')
+
+    if traced and rs.linear_solver_history > 0:
+        raise ValueError("linear_solver_history is not supported with jit_timestep / fuse_timesteps")
+
     def _get_best_solver():
+        if traced:
+            from veros.core.external.solvers.scipy_jax import JAXSciPySolver
+
+            return JAXSciPySolver
+
         if rst.proc_num > 1:
-            try:
-                from veros.core.external.solvers.petsc_ import PETScSolver
-            except ImportError:
-                logger.warning("PETSc linear solver not available, falling back to SciPy")
-            else:
-                return PETScSolver
+            # PETSc needs a process for every part of the domain
+            if not _has_inactive_tiles():
+                try:
+                    from veros.core.external.solvers.petsc_ import PETScSolver
+                except ImportError:
+                    logger.warning("PETSc linear solver not available, falling back to native Krylov solver")
+                else:
+                    return PETScSolver
+
+            from veros.core.external.solvers.krylov import KrylovSolver
+
+            return KrylovSolver
 
         if rs.backend == "jax" and rs.device == "gpu" and rs.float_type == "float64":
             from veros.core.external.solvers.scipy_jax import JAXSciPySolver
@@ -47,6 +74,10 @@ def _get_solver_class():
         from veros.core.external.solvers.scipy import SciPySolver
 
         return SciPySolver
+    elif ls == "krylov":
+        from veros.core.external.solvers.krylov import KrylovSolver
+
+        return KrylovSolver
     elif ls == "scipy_jax":
         from veros.core.external.solvers.scipy_jax import JAXSciPySolver
 
@@ -59,4 +90,11 @@ def _get_solver_class():
 def get_linear_solver(state):
     logger.debug("Initializing linear solver")
     SolverClass = _get_solver_class()
-    return SolverClass(state)
+    solver = SolverClass(state)
+
+    if rs.linear_solver_history > 0:
+        from veros.core.external.solvers.projection import ProjectionSolver
+
+        solver = ProjectionSolver(state, solver, rs.linear_solver_history)
+
+    return solver
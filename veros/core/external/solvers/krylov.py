@@ -0,0 +1,261 @@
+import numpy as onp
+
+from veros import logger, distributed, veros_kernel, runtime_settings as rs
+from veros.variables import allocate
+from veros.core import utilities
+from veros.core.operators import update, at, numpy as npx
+from veros.core.external.solvers.base import LinearSolver
+from veros.core.external.poisson_matrix import assemble_poisson_matrix
+
+KRYLOV_OPTIONS = {
+    # convergence is reached if the norm of the (Jacobi scaled) residual is below atol or rtol * norm of rhs
+    "atol": 1e-14,
+    "rtol": 1e-12,
+    "max_it": 1000,
+    # ILU preconditioner of the local blocks (NumPy backend)
+    "ilu_drop_tol": 1e-6,
+    "ilu_fill_factor": 100,
+    # red-black Gauss-Seidel sweeps per application of the preconditioner (JAX backend)
+    "num_sweeps": 4,
+}
+
+
+class KrylovSolver(LinearSolver):
+    """Distributed BiCGStab solver with a block-Jacobi preconditioner.
+
+    In contrast to the SciPy solvers, every process only works on its own part of the domain:
+    the 5-point stencil is applied locally after updating the overlap, and dot products are
+    computed via global reductions. Every process preconditions with an approximate inverse of
+    its own diagonal block of the matrix (ILU with NumPy, red-black Gauss-Seidel sweeps with JAX),
+    so the solver only requires mpi4py.
+    """
+
+    def __init__(self, state):
+        settings = state.settings
+
+        diags, offsets, boundary_mask = assemble_poisson_matrix(state)
+
+        # Jacobi scaling of all rows
+        eps = 1e-20
+        main_diag = diags[0]
+        self._rhs_scale = npx.where(npx.abs(main_diag) > eps, 1.0 / (main_diag + eps), 1.0)
+        self._diags = tuple(self._rhs_scale * diag for diag in diags)
+        self._offsets = tuple(offsets)
+        self._boundary_mask = boundary_mask
+        self._cyclic = settings.enable_cyclic_x
+
+        # values in the overlap that are not computed by any process are fixed (Dirichlet boundary)
+        interior = update(allocate(state.dimensions, ("xu", "yu")), at[2:-2, 2:-2], 1.0)
+        self._fixed = utilities.enforce_boundaries(interior, self._cyclic) == 0
+
+        if rs.backend == "jax":
+            self._precondition = self._gauss_seidel_preconditioner()
+        else:
+            self._precondition = self._ilu_preconditioner()
+
+        # every iteration is compiled into a single kernel (with JAX)
+        self._step_kernel = veros_kernel(self._bicgstab_step)
+
+    def _apply_stencil(self, x, region=None):
+        """Computes A x in given region (default: the interior), for x with valid values around it"""
+        if region is None:
+            region = (slice(2, x.shape[0] - 2), slice(2, x.shape[1] - 2))
+
+        x_slice, y_slice = region
+
+        res = 0.0
+        for diag, (di, dj) in zip(self._diags, self._offsets):
+            res = res + diag[region] * x[utilities.shift_slice(x_slice, di), utilities.shift_slice(y_slice, dj)]
+        return res
+
+    def _matvec(self, x):
+        """Computes A x for x defined on the interior of this process"""
+        nx, ny = x.shape
+        x = npx.pad(x, 2)
+
+        # cells that do not depend on the overlap are computed while it is exchanged
+        width = max(max(abs(di), abs(dj)) for di, dj in self._offsets)
+        region = (slice(2, nx + 2), slice(2, ny + 2))
+        interior = (slice(2 + width, nx + 2 - width), slice(2 + width, ny + 2 - width))
+
+        def without_overlap(cells):
+            return tuple(utilities.shift_slice(cell_slice, -2) for cell_slice in cells)
+
+        exchange = utilities.start_boundary_exchange((x,), self._cyclic)
+        res = npx.zeros((nx, ny), dtype=x.dtype)
+        res = update(res, at[without_overlap(interior)], self._apply_stencil(x, interior))
+        (x,) = utilities.finish_boundary_exchange(exchange)
+
+        x = npx.where(self._fixed, 0.0, x)
+        for strip in utilities.split_region(region, interior):
+            res = update(res, at[without_overlap(strip)], self._apply_stencil(x, strip))
+
+        return res
+
+    def _ilu_preconditioner(self):
+        import scipy.sparse
+        import scipy.sparse.linalg as spalg
+
+        diags = [onp.asarray(diag[2:-2, 2:-2], dtype="float64") for diag in self._diags]
+        nx, ny = diags[0].shape
+        index = onp.arange(nx * ny).reshape(nx, ny)
+
+        # couplings across the boundary of this block are dropped, except for cyclic boundaries within it
+        wrap_x = self._cyclic and rs.num_proc[0] == 1
+
+        rows, cols, vals = [], [], []
+        for diag, (di, dj) in zip(diags, self._offsets):
+            i, j = onp.meshgrid(onp.arange(nx), onp.arange(ny), indexing="ij")
+            io, jo = i + di, j + dj
+
+            if wrap_x:
+                io = io % nx
+
+            valid = (io >= 0) & (io < nx) & (jo >= 0) & (jo < ny) & (diag != 0)
+            rows.append(index[i[valid], j[valid]])
+            cols.append(index[io[valid], jo[valid]])
+            vals.append(diag[valid])
+
+        block = scipy.sparse.coo_matrix(
+            (onp.concatenate(vals), (onp.concatenate(rows), onp.concatenate(cols))), shape=(nx * ny, nx * ny)
+        )
+
+        logger.debug("Computing ILU preconditioner of local block...")
+        ilu = spalg.spilu(
+            block.tocsc(), drop_tol=KRYLOV_OPTIONS["ilu_drop_tol"], fill_factor=KRYLOV_OPTIONS["ilu_fill_factor"]
+        )
+
+        def precondition(r):
+            z = ilu.solve(onp.asarray(r, dtype="float64").reshape(-1))
+            return npx.asarray(z, dtype=r.dtype).reshape(r.shape)
+
+        return precondition
+
+    def _gauss_seidel_preconditioner(self):
+        nx, ny = self._diags[0][2:-2, 2:-2].shape
+        i, j = npx.meshgrid(npx.arange(nx), npx.arange(ny), indexing="ij")
+        red = (i + j) % 2 == 0
+
+        # only couplings within this block are used (rows are scaled, so the main diagonal is 1)
+        offdiags = tuple(zip(self._diags[1:], self._offsets[1:]))
+
+        def apply_offdiags(z):
+            z = npx.pad(z, 2)
+            res = 0.0
+            for diag, (di, dj) in offdiags:
+                res = res + diag[2:-2, 2:-2] * z[2 + di : z.shape[0] - 2 + di, 2 + dj : z.shape[1] - 2 + dj]
+            return res
+
+        def precondition(r):
+            z = npx.zeros_like(r)
+            for _ in range(KRYLOV_OPTIONS["num_sweeps"]):
+                z = npx.where(red, r - apply_offdiags(z), z)
+                z = npx.where(red, z, r - apply_offdiags(z))
+            return z
+
+        return precondition
+
+    def _bicgstab_step(self, x, r, p, r_hat, rho):
+        """One iteration of right-preconditioned BiCGStab (e.g. Saad, Iterative Methods for Sparse Linear Systems)
+
+        Requires two global reductions: the norm of the given residual is computed along with the first
+        dot product, and the new rho is derived from dot products with the intermediate residual s.
+        """
+        p_hat = self._precondition(p)
+        v = self._matvec(p_hat)
+
+        reduction = distributed.GlobalReduction()
+        reduction.sum("rv", npx.sum(r_hat * v))
+        reduction.sum("rr", npx.sum(r * r))
+        res = reduction.resolve()
+        rr = res["rr"]
+
+        alpha = rho / res["rv"]
+
+        s = r - alpha * v
+        s_hat = self._precondition(s)
+        t = self._matvec(s_hat)
+
+        reduction.sum("ts", npx.sum(t * s))
+        reduction.sum("tt", npx.sum(t * t))
+        reduction.sum("rs", npx.sum(r_hat * s))
+        reduction.sum("rt", npx.sum(r_hat * t))
+        res = reduction.resolve()
+
+        # t vanishes if s does, then omega is set to 0 and the iteration stops after this step
+        tt_nonzero = res["tt"] != 0
+        omega = npx.where(tt_nonzero, res["ts"] / npx.where(tt_nonzero, res["tt"], 1.0), 0.0)
+
+        x = x + alpha * p_hat + omega * s_hat
+        r = s - omega * t
+        rho_new = res["rs"] - omega * res["rt"]
+
+        beta = (rho_new / rho) * (alpha / npx.where(omega == 0, 1.0, omega))
+        p = r + beta * (p - omega * v)
+        return x, r, p, rho_new, omega, rr
+
+    def _bicgstab(self, b, x):
+        r = b - self._matvec(x)
+
+        reduction = distributed.GlobalReduction()
+        reduction.sum("bb", npx.sum(b * b))
+        reduction.sum("rr", npx.sum(r * r))
+        res = reduction.resolve()
+
+        tol = max(KRYLOV_OPTIONS["atol"], KRYLOV_OPTIONS["rtol"] * float(npx.sqrt(res["bb"])))
+        residual_norm = float(npx.sqrt(res["rr"]))
+
+        if residual_norm <= tol:
+            return x, 0, residual_norm, True
+
+        r_hat, p, rho = r, r, res["rr"]
+
+        # same breakdown tolerance as scipy.sparse.linalg.bicgstab
+        breakdown_tol = onp.finfo(b.dtype).eps ** 2
+
+        for iteration in range(KRYLOV_OPTIONS["max_it"]):
+            # the residual norm returned by each step belongs to its input,
+            # so the step after convergence is discarded
+            x_new, r_new, p, rho, omega, rr = self._step_kernel(x, r, p, r_hat, rho)
+            residual_norm = float(npx.sqrt(rr))
+
+            if residual_norm <= tol:
+                return x, iteration, residual_norm, True
+
+            x, r = x_new, r_new
+
+            if abs(float(rho)) < breakdown_tol or abs(float(omega)) < breakdown_tol:
+                # cannot continue without dividing by zero
+                break
+
+        residual_norm = float(npx.sqrt(distributed.global_sum(npx.sum(r * r))))
+        return x, iteration + 1, residual_norm, residual_norm <= tol
+
+    def solve(self, state, rhs, x0, boundary_val=None):
+        """
+        Arguments:
+            rhs: Right-hand side vector
+            x0: Initial guess
+            boundary_val: Array containing values to set on boundary elements. Defaults to `x0`.
+        """
+        if boundary_val is None:
+            boundary_val = x0
+
+        rhs = npx.where(self._boundary_mask, rhs, boundary_val)  # set right hand side on boundaries
+
+        # move contributions of fixed values to right hand side
+        b = self._rhs_scale[2:-2, 2:-2] * rhs[2:-2, 2:-2] - self._apply_stencil(npx.where(self._fixed, rhs, 0.0))
+
+        linear_solution, iterations, residual_norm, converged = self._bicgstab(b, x0[2:-2, 2:-2])
+
+        if not converged:
+            if iterations < KRYLOV_OPTIONS["max_it"]:
+                reason = "broke down"
+            else:
+                reason = "did not converge"
+
+            logger.warning(
+                f"Streamfunction solver {reason} after {iterations} iterations (residual: {residual_norm:.2e})"
+            )
+
+        return update(rhs, at[2:-2, 2:-2], linear_solution)
@@ -0,0 +1,178 @@
+import numpy as onp
+
+from veros.core.operators import update, at, for_loop, numpy as npx
+
+MULTIGRID_OPTIONS = {
+    # smoothing steps (red-black Gauss-Seidel sweeps) before and after the coarse grid correction
+    "pre_sweeps": 2,
+    "post_sweeps": 2,
+    # piecewise constant interpolation underestimates the coarse grid correction, so it is scaled up
+    "correction_factor": 1.6,
+    # grids with at most this many cells are solved directly
+    "coarsest_size": 256,
+}
+
+
+class MultigridPreconditioner:
+    """Geometric multigrid V-cycle for the 2D elliptic operator from ``assemble_poisson_matrix``.
+
+    Coarse grids are created by merging 2x2 blocks of cells, and the coarse operators are the
+    Galerkin products of the fine operators with piecewise constant interpolation. Then, every
+    level is again a 5-point stencil, so all levels are applied matrix-free. Cells outside of
+    the boundary mask (land, island boundaries) are fixed on the finest grid and excluded from
+    all coarse grids.
+
+    The hierarchy is set up once with NumPy; the V-cycle itself works with all backends.
+    Operates on global arrays (including overlap), where the overlap is left untouched.
+
+    Arguments:
+        diags, offsets, boundary_mask: Output of ``assemble_poisson_matrix`` (without Jacobi scaling).
+        cyclic: Whether the domain is cyclic in x-direction.
+    """
+
+    def __init__(self, diags, offsets, boundary_mask, cyclic):
+        if tuple(offsets) != ((0, 0), (1, 0), (-1, 0), (0, 1), (0, -1)):
+            raise ValueError("multigrid requires a 5-point stencil")
+
+        active = onp.asarray(boundary_mask[2:-2, 2:-2], dtype="bool")
+        stencil = [onp.array(diag[2:-2, 2:-2], dtype="float64") for diag in diags]
+
+        if not cyclic:
+            # values outside of the domain are fixed
+            stencil[1][-1, :] = 0.0
+            stencil[2][0, :] = 0.0
+
+        stencil[3][:, -1] = 0.0
+        stencil[4][:, 0] = 0.0
+
+        levels = [(stencil, active)]
+        while active.size > MULTIGRID_OPTIONS["coarsest_size"] and min(active.shape) >= 4:
+            stencil, active = _coarsen(stencil, active)
+            levels.append((stencil, active))
+
+        self._levels = [
+            (tuple(npx.asarray(diag) for diag in stencil), npx.asarray(active), npx.asarray(_red_cells(active.shape)))
+            for stencil, active in levels[:-1]
+        ]
+        self._coarse_inverse = npx.asarray(_dense_inverse(*levels[-1]))
+        self._coarse_active = npx.asarray(levels[-1][1])
+
+    def __call__(self, rhs):
+        """Applies one V-cycle (with zero initial guess) to given right hand side"""
+        rhs = npx.asarray(rhs)
+        sol = self._vcycle(0, rhs[2:-2, 2:-2])
+        return update(rhs, at[2:-2, 2:-2], sol.astype(rhs.dtype))
+
+    def _vcycle(self, level, rhs):
+        if level == len(self._levels):
+            rhs_shape = rhs.shape
+            sol = self._coarse_inverse @ npx.where(self._coarse_active, rhs, 0.0).reshape(-1)
+            return sol.reshape(rhs_shape)
+
+        stencil, active, red = self._levels[level]
+
+        def pre_smooth(_, sol):
+            sol = _smooth(stencil, sol, rhs, red)
+            return _smooth(stencil, sol, rhs, ~red)
+
+        def post_smooth(_, sol):
+            sol = _smooth(stencil, sol, rhs, ~red)
+            return _smooth(stencil, sol, rhs, red)
+
+        sol = for_loop(0, MULTIGRID_OPTIONS["pre_sweeps"], pre_smooth, npx.zeros_like(rhs))
+
+        residual = npx.where(active, rhs - _apply(stencil, sol), 0.0)
+        correction = self._vcycle(level + 1, _restrict(residual))
+        sol = sol + MULTIGRID_OPTIONS["correction_factor"] * npx.where(active, _prolong(correction, rhs.shape), 0.0)
+
+        return for_loop(0, MULTIGRID_OPTIONS["post_sweeps"], post_smooth, sol)
+
+
+def _neighbors(x):
+    """Returns the values east, west, north, and south of every cell
+
+    Cells at the edges wrap around, their coefficient is 0 unless the domain is cyclic
+    """
+    return (
+        npx.roll(x, -1, axis=0),
+        npx.roll(x, 1, axis=0),
+        npx.roll(x, -1, axis=1),
+        npx.roll(x, 1, axis=1),
+    )
+
+
+def _apply_offdiags(stencil, x):
+    res = 0.0
+    for diag, neighbor in zip(stencil[1:], _neighbors(x)):
+        res = res + diag * neighbor
+    return res
+
+
+def _apply(stencil, x):
+    return stencil[0] * x + _apply_offdiags(stencil, x)
+
+
+def _smooth(stencil, sol, rhs, cells):
+    """Gauss-Seidel update of given cells (which must not be neighbors of each other)"""
+    return npx.where(cells, (rhs - _apply_offdiags(stencil, sol)) / stencil[0], sol)
+
+
+def _restrict(arr):
+    nx, ny = arr.shape
+    arr = npx.pad(arr, ((0, nx % 2), (0, ny % 2)))
+    return arr.reshape(arr.shape[0] // 2, 2, arr.shape[1] // 2, 2).sum(axis=(1, 3))
+
+
+def _prolong(arr, shape):
+    arr = npx.repeat(npx.repeat(arr, 2, axis=0), 2, axis=1)
+    return arr[: shape[0], : shape[1]]
+
+
+def _red_cells(shape):
+    i, j = onp.meshgrid(onp.arange(shape[0]), onp.arange(shape[1]), indexing="ij")
+    return (i + j) % 2 == 0
+
+
+def _coarsen(stencil, active):
+    """Computes the Galerkin coarse grid operator for aggregates of 2x2 cells"""
+    nx, ny = active.shape
+    cnx, cny = (nx + 1) // 2, (ny + 1) // 2
+
+    i, j = onp.meshgrid(onp.arange(nx), onp.arange(ny), indexing="ij")
+    ci, cj = i // 2, j // 2
+    neighbors = ((i + 1) % nx, j), ((i - 1) % nx, j), (i, (j + 1) % ny), (i, (j - 1) % ny)
+
+    coarse_active = onp.zeros((cnx, cny), dtype="bool")
+    onp.logical_or.at(coarse_active, (ci, cj), active)
+
+    coarse_stencil = [onp.zeros((cnx, cny)) for _ in range(5)]
+    onp.add.at(coarse_stencil[0], (ci[active], cj[active]), stencil[0][active])
+
+    for diag, coarse_diag, (ni, nj) in zip(stencil[1:], coarse_stencil[1:], neighbors):
+        # only couplings between active cells are kept
+        coupled = active & active[ni, nj] & (diag != 0)
+        internal = coupled & (ni // 2 == ci) & (nj // 2 == cj)
+        external = coupled & ~internal
+        onp.add.at(coarse_stencil[0], (ci[internal], cj[internal]), diag[internal])
+        onp.add.at(coarse_diag, (ci[external], cj[external]), diag[external])
+
+    coarse_stencil[0][~coarse_active | (coarse_stencil[0] == 0)] = 1.0
+    return coarse_stencil, coarse_active
+
+
+def _dense_inverse(stencil, active):
+    nx, ny = active.shape
+    index = onp.arange(nx * ny).reshape(nx, ny)
+    matrix = onp.diag(stencil[0].reshape(-1))
+
+    neighbors = (
+        onp.roll(index, -1, axis=0),
+        onp.roll(index, 1, axis=0),
+        onp.roll(index, -1, axis=1),
+        onp.roll(index, 1, axis=1),
+    )
+
+    for diag, neighbor in zip(stencil[1:], neighbors):
+        onp.add.at(matrix, (index.reshape(-1), neighbor.reshape(-1)), diag.reshape(-1))
+
+    return onp.linalg.pinv(matrix)
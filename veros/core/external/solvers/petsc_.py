@@ -3,7 +3,7 @@ import os
 from petsc4py import PETSc
 import numpy as onp
 
-from veros import logger, veros_kernel, runtime_settings as rs, runtime_state as rst
+from veros import logger, veros_kernel, distributed, runtime_settings as rs, runtime_state as rst
 from veros.core import utilities
 from veros.core.external.solvers.base import LinearSolver
 from veros.core.operators import numpy as npx, update, update_add, at, flush
@@ -44,6 +44,10 @@ PRESSURE_OPTIONS = {
 
 class PETScSolver(LinearSolver):
     def __init__(self, state):
+        decomposition = distributed.get_decomposition()
+        if decomposition is not None and decomposition.has_inactive_tiles:
+            raise RuntimeError("PETSc linear solver does not support decompositions with inactive (land) tiles")
+
         if rst.proc_num > 1 and rs.device == "cpu" and "OMP_NUM_THREADS" not in os.environ:
             logger.warning(
                 "Environment variable OMP_NUM_THREADS is not set, which can lead to severely "
@@ -69,8 +73,8 @@ class PETScSolver(LinearSolver):
             proc_sizes=rs.num_proc,
             boundary_type=boundary_type,
             ownership_ranges=[
-                (settings.nx // rs.num_proc[0],) * rs.num_proc[0],
-                (settings.ny // rs.num_proc[1],) * rs.num_proc[1],
+                tuple(distributed.get_chunk_bounds(settings.nx, 0, i)[1] for i in range(rs.num_proc[0])),
+                tuple(distributed.get_chunk_bounds(settings.ny, 1, j)[1] for j in range(rs.num_proc[1])),
             ],
         )
 
@@ -158,7 +162,7 @@ class PETScSolver(LinearSolver):
 
         for j in range(j0, j1):
             for i in range(i0, i1):
-                iloc, jloc = i % (state.settings.nx // rs.num_proc[0]), j % (state.settings.ny // rs.num_proc[1])
+                iloc, jloc = i - i0, j - j0
                 row.index = (i, j)
                 for diag, offset in zip(diags, offsets):
                     io, jo = (i + offset[0], j + offset[1])
@@ -2,10 +2,11 @@ import numpy as onp
 import scipy.sparse
 import scipy.sparse.linalg as spalg
 
-from veros import logger, veros_kernel, veros_routine, distributed, runtime_state as rst
+from veros import logger, veros_kernel, veros_routine, distributed, runtime_settings as rs, runtime_state as rst
 from veros.variables import allocate
 from veros.core.operators import update, at, numpy as npx
 from veros.core.external.solvers.base import LinearSolver
+from veros.core.external.solvers.multigrid import MultigridPreconditioner
 from veros.core.external.poisson_matrix import assemble_poisson_matrix
 
 
@@ -35,9 +36,20 @@ class SciPySolver(LinearSolver):
         self._rhs_scale = jacobi_precon.diagonal()
         self._extra_args = {}
 
-        logger.info("Computing ILU preconditioner...")
-        ilu_preconditioner = spalg.spilu(self._matrix.tocsc(), drop_tol=1e-6, fill_factor=100)
-        self._extra_args["M"] = spalg.LinearOperator(self._matrix.shape, ilu_preconditioner.solve)
+        if rs.linear_solver_preconditioner == "multigrid":
+            logger.info("Setting up multigrid preconditioner...")
+            multigrid = MultigridPreconditioner(*assemble_poisson_matrix(state), cyclic=state.settings.enable_cyclic_x)
+            grid_shape = (state.settings.nx + 4, state.settings.ny + 4)
+
+            # the matrix is Jacobi scaled, so the residual has to be unscaled before the V-cycle
+            def preconditioner(residual):
+                return onp.asarray(multigrid((residual / self._rhs_scale).reshape(grid_shape))).reshape(-1)
+
+            self._extra_args["M"] = spalg.LinearOperator(self._matrix.shape, preconditioner)
+        else:
+            logger.info("Computing ILU preconditioner...")
+            ilu_preconditioner = spalg.spilu(self._matrix.tocsc(), drop_tol=1e-6, fill_factor=100)
+            self._extra_args["M"] = spalg.LinearOperator(self._matrix.shape, ilu_preconditioner.solve)
 
     def _scipy_solver(self, state, rhs, x0, boundary_val):
         orig_shape = x0.shape
@@ -1,8 +1,9 @@
-from veros import distributed, veros_routine, veros_kernel, runtime_state as rst
+from veros import distributed, veros_routine, veros_kernel, runtime_settings as rs, runtime_state as rst
 from veros.variables import allocate
 
 from veros.core.operators import update, update_add, at, numpy as npx
 from veros.core.external.solvers.base import LinearSolver
+from veros.core.external.solvers.multigrid import MultigridPreconditioner
 from veros.core.external.poisson_matrix import assemble_poisson_matrix
 
 
@@ -49,6 +50,16 @@ class JAXSciPySolver(LinearSolver):
         jacobi_precon = self._jacobi_preconditioner(state, matrix_diags)
         matrix_diags = tuple(jacobi_precon * diag for diag in matrix_diags)
 
+        if rs.linear_solver_preconditioner == "multigrid":
+            multigrid = MultigridPreconditioner(*assemble_poisson_matrix(state), cyclic=state.settings.enable_cyclic_x)
+
+            # the matrix is Jacobi scaled, so the residual has to be unscaled before the V-cycle
+            def preconditioner(residual):
+                return multigrid(residual / jacobi_precon)
+
+        else:
+            preconditioner = None
+
         @veros_kernel
         def linear_solve(rhs, x0, boundary_val):
             rhs = npx.where(boundary_mask, rhs, boundary_val)  # set right hand side on boundaries
@@ -84,6 +95,7 @@ class JAXSciPySolver(LinearSolver):
                 tol=0,
                 atol=1e-8,
                 maxiter=10_000,
+                M=preconditioner,
             )
 
             return linear_solution
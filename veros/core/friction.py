@@ -88,7 +88,7 @@ def explicit_vert_friction(state):
     return KernelOutput(du_mix=vs.du_mix, dv_mix=vs.dv_mix, K_diss_v=vs.K_diss_v)
 
 
-@veros_kernel
+@veros_kernel(donate_variables=("u", "v"))
 def implicit_vert_friction(state):
     """
     vertical friction
@@ -785,25 +785,40 @@ def biharmonic_friction(state):
         """
         diagnose dissipation by lateral friction
         """
-        flux_east = utilities.enforce_boundaries(flux_east, settings.enable_cyclic_x)
-        flux_north = utilities.enforce_boundaries(flux_north, settings.enable_cyclic_x)
-        diss = allocate(state.dimensions, ("xt", "yu", "zt"))
-        diss = update(
-            diss,
-            at[1:-2, 2:-2, :],
-            -0.5
-            * (
-                (vs.u[2:-1, 2:-2, :, vs.tau] - vs.u[1:-2, 2:-2, :, vs.tau]) * flux_east[1:-2, 2:-2, :]
-                + (vs.u[1:-2, 2:-2, :, vs.tau] - vs.u[:-3, 2:-2, :, vs.tau]) * flux_east[:-3, 2:-2, :]
+
+        def get_diss(flux_east, flux_north, x, y):
+            xm1, xp1 = utilities.shift_slice(x, -1), utilities.shift_slice(x, 1)
+            ym1, yp1 = utilities.shift_slice(y, -1), utilities.shift_slice(y, 1)
+            diss_x = (
+                -0.5
+                * (
+                    (vs.u[xp1, y, :, vs.tau] - vs.u[x, y, :, vs.tau]) * flux_east[x, y, :]
+                    + (vs.u[x, y, :, vs.tau] - vs.u[xm1, y, :, vs.tau]) * flux_east[xm1, y, :]
+                )
+                / (vs.cost[npx.newaxis, y, npx.newaxis] * vs.dxu[x, npx.newaxis, npx.newaxis])
             )
-            / (vs.cost[npx.newaxis, 2:-2, npx.newaxis] * vs.dxu[1:-2, npx.newaxis, npx.newaxis])
-            - 0.5
-            * (
-                (vs.u[1:-2, 3:-1, :, vs.tau] - vs.u[1:-2, 2:-2, :, vs.tau]) * flux_north[1:-2, 2:-2, :]
-                + (vs.u[1:-2, 2:-2, :, vs.tau] - vs.u[1:-2, 1:-3, :, vs.tau]) * flux_north[1:-2, 1:-3, :]
+            diss_y = (
+                0.5
+                * (
+                    (vs.u[x, yp1, :, vs.tau] - vs.u[x, y, :, vs.tau]) * flux_north[x, y, :]
+                    + (vs.u[x, y, :, vs.tau] - vs.u[x, ym1, :, vs.tau]) * flux_north[x, ym1, :]
+                )
+                / (vs.cost[npx.newaxis, y, npx.newaxis] * vs.dyt[npx.newaxis, y, npx.newaxis])
             )
-            / (vs.cost[npx.newaxis, 2:-2, npx.newaxis] * vs.dyt[npx.newaxis, 2:-2, npx.newaxis]),
-        )
+            return diss_x - diss_y
+
+        # dissipation away from the overlap of the fluxes is computed while it is exchanged
+        nx, ny = flux_east.shape[:2]
+        region, interior = (slice(1, nx - 2), slice(2, ny - 2)), (slice(3, nx - 2), slice(3, ny - 2))
+
+        exchange = utilities.start_boundary_exchange((flux_east, flux_north), settings.enable_cyclic_x)
+        diss = allocate(state.dimensions, ("xt", "yu", "zt"))
+        diss = update(diss, at[interior], get_diss(flux_east, flux_north, *interior))
+        flux_east, flux_north = utilities.finish_boundary_exchange(exchange)
+
+        for strip in utilities.split_region(region, interior):
+            diss = update(diss, at[strip], get_diss(flux_east, flux_north, *strip))
+
         vs.K_diss_h = numerics.calc_diss_u(state, diss)
 
     """
@@ -928,24 +943,39 @@ def biharmonic_friction(state):
         """
         diagnose dissipation by lateral friction
         """
-        flux_east = utilities.enforce_boundaries(flux_east, settings.enable_cyclic_x)
-        flux_north = utilities.enforce_boundaries(flux_north, settings.enable_cyclic_x)
-        diss = update(
-            diss,
-            at[2:-2, 1:-2, :],
-            -0.5
-            * (
-                (vs.v[3:-1, 1:-2, :, vs.tau] - vs.v[2:-2, 1:-2, :, vs.tau]) * flux_east[2:-2, 1:-2, :]
-                + (vs.v[2:-2, 1:-2, :, vs.tau] - vs.v[1:-3, 1:-2, :, vs.tau]) * flux_east[1:-3, 1:-2, :]
+
+        def get_diss(flux_east, flux_north, x, y):
+            xm1, xp1 = utilities.shift_slice(x, -1), utilities.shift_slice(x, 1)
+            ym1, yp1 = utilities.shift_slice(y, -1), utilities.shift_slice(y, 1)
+            diss_x = (
+                -0.5
+                * (
+                    (vs.v[xp1, y, :, vs.tau] - vs.v[x, y, :, vs.tau]) * flux_east[x, y, :]
+                    + (vs.v[x, y, :, vs.tau] - vs.v[xm1, y, :, vs.tau]) * flux_east[xm1, y, :]
+                )
+                / (vs.cosu[npx.newaxis, y, npx.newaxis] * vs.dxt[x, npx.newaxis, npx.newaxis])
             )
-            / (vs.cosu[npx.newaxis, 1:-2, npx.newaxis] * vs.dxt[2:-2, npx.newaxis, npx.newaxis])
-            - 0.5
-            * (
-                (vs.v[2:-2, 2:-1, :, vs.tau] - vs.v[2:-2, 1:-2, :, vs.tau]) * flux_north[2:-2, 1:-2, :]
-                + (vs.v[2:-2, 1:-2, :, vs.tau] - vs.v[2:-2, :-3, :, vs.tau]) * flux_north[2:-2, :-3, :]
+            diss_y = (
+                0.5
+                * (
+                    (vs.v[x, yp1, :, vs.tau] - vs.v[x, y, :, vs.tau]) * flux_north[x, y, :]
+                    + (vs.v[x, y, :, vs.tau] - vs.v[x, ym1, :, vs.tau]) * flux_north[x, ym1, :]
+                )
+                / (vs.cosu[npx.newaxis, y, npx.newaxis] * vs.dyu[npx.newaxis, y, npx.newaxis])
             )
-            / (vs.cosu[npx.newaxis, 1:-2, npx.newaxis] * vs.dyu[npx.newaxis, 1:-2, npx.newaxis]),
-        )
+            return diss_x - diss_y
+
+        # dissipation away from the overlap of the fluxes is computed while it is exchanged
+        nx, ny = flux_east.shape[:2]
+        region, interior = (slice(2, nx - 2), slice(1, ny - 2)), (slice(3, nx - 2), slice(3, ny - 2))
+
+        exchange = utilities.start_boundary_exchange((flux_east, flux_north), settings.enable_cyclic_x)
+        diss = update(diss, at[interior], get_diss(flux_east, flux_north, *interior))
+        flux_east, flux_north = utilities.finish_boundary_exchange(exchange)
+
+        for strip in utilities.split_region(region, interior):
+            diss = update(diss, at[strip], get_diss(flux_east, flux_north, *strip))
+
         vs.K_diss_h = update_add(vs.K_diss_h, at[...], numerics.calc_diss_v(state, diss))
 
     return KernelOutput(du_mix=vs.du_mix, dv_mix=vs.dv_mix, K_diss_h=vs.K_diss_h)
@@ -44,7 +44,7 @@ def set_idemix_parameter(state):
     return KernelOutput(c0=vs.c0, v0=vs.v0, alpha_c=vs.alpha_c)
 
 
-@veros_kernel
+@veros_kernel(donate_variables=("E_iw", "dE_iw"))
 def integrate_idemix_kernel(state):
     """
     integrate idemix on W grid
@@ -6,6 +6,7 @@ from veros.core.isoneutral.isoneutral import (  # noqa: F401
 
 from veros.core.isoneutral.diffusion import (  # noqa: F401
     isoneutral_diffusion,
+    isoneutral_diffusion_tempsalt,
     isoneutral_skew_diffusion,
 )
 
@@ -140,7 +140,9 @@ def _calc_explicit_part(state, flux_east, flux_north, flux_top):
 
 
 @veros_kernel
-def _calc_implicit_part(state, tr):
+def _calc_implicit_part(state, tr_new):
+    """Implicit vertical part of isoneutral diffusion, applied to the interior of one or more
+    (stacked) tracers at time level taup1."""
     vs = state.variables
     settings = state.settings
 
@@ -162,18 +164,13 @@ def _calc_implicit_part(state, tr):
     b_tri = update(b_tri, at[:, :, -1], 1 + delta[:, :, -2] / vs.dzt[npx.newaxis, npx.newaxis, -1])
     b_tri_edge = 1 + (delta[:, :, :] / vs.dzt[npx.newaxis, npx.newaxis, :])
     c_tri = update(c_tri, at[:, :, :-1], -delta[:, :, :-1] / vs.dzt[npx.newaxis, npx.newaxis, :-1])
-    sol = utilities.solve_implicit(
-        a_tri, b_tri, c_tri, tr[2:-2, 2:-2, :, vs.taup1], water_mask, b_edge=b_tri_edge, edge_mask=edge_mask
-    )
-    implicit_part = npx.where(water_mask, sol, tr[2:-2, 2:-2, :, vs.taup1])
+    sol = utilities.solve_implicit(a_tri, b_tri, c_tri, tr_new, water_mask, b_edge=b_tri_edge, edge_mask=edge_mask)
+    implicit_part = npx.where(water_mask, sol, tr_new)
     return implicit_part
 
 
 @veros_kernel(static_args=("iso", "skew"))
-def isoneutral_diffusion_tracer(state, tr, dtracer_iso, iso=True, skew=False):
-    """
-    Isoneutral diffusion for general tracers
-    """
+def _add_explicit_part(state, tr, dtracer_iso, iso=True, skew=False):
     vs = state.variables
     settings = state.settings
 
@@ -189,24 +186,93 @@ def isoneutral_diffusion_tracer(state, tr, dtracer_iso, iso=True, skew=False):
 
     flux_east, flux_north, flux_top = _calc_tracer_fluxes(state, tr, K_iso, K_skew)
 
-    """
-    add explicit part
-    """
     dtr = _calc_explicit_part(state, flux_east, flux_north, flux_top)
     dtracer_iso = dtracer_iso + dtr
     tr = update_add(tr, at[2:-2, 2:-2, :, vs.taup1], settings.dt_tracer * dtr[2:-2, 2:-2, :])
 
+    return tr, dtracer_iso, flux_east, flux_north, flux_top
+
+
+@veros_kernel
+def _add_implicit_part(state, tr, dtracer_iso, implicit_part):
+    vs = state.variables
+    settings = state.settings
+
+    dtracer_iso = update_add(
+        dtracer_iso, at[2:-2, 2:-2, :], (implicit_part - tr[2:-2, 2:-2, :, vs.taup1]) / settings.dt_tracer
+    )
+    tr = update(tr, at[2:-2, 2:-2, :, vs.taup1], implicit_part)
+    return tr, dtracer_iso
+
+
+@veros_kernel(static_args=("iso", "skew"))
+def isoneutral_diffusion_tracer(state, tr, dtracer_iso, iso=True, skew=False):
+    """
+    Isoneutral diffusion for general tracers
+    """
+    vs = state.variables
+
+    """
+    add explicit part
+    """
+    tr, dtracer_iso, flux_east, flux_north, flux_top = _add_explicit_part(state, tr, dtracer_iso, iso=iso, skew=skew)
+
     """
     add implicit part
     """
     if iso:
-        new_tr = update(tr, at[2:-2, 2:-2, :, vs.taup1], _calc_implicit_part(state, tr))
-        dtracer_iso = dtracer_iso + (new_tr[:, :, :, vs.taup1] - tr[:, :, :, vs.taup1]) / settings.dt_tracer
-        tr = new_tr
+        implicit_part = _calc_implicit_part(state, tr[2:-2, 2:-2, :, vs.taup1])
+        tr, dtracer_iso = _add_implicit_part(state, tr, dtracer_iso, implicit_part)
 
     return tr, dtracer_iso, flux_east, flux_north, flux_top
 
 
+@veros_kernel(static_args=("iso",))
+def _calc_dissipation(state, P_diss, tr, int_drhodX, flux_east, flux_north, flux_top, iso=True):
+    """
+    dissipation by isopycnal mixing
+    """
+    vs = state.variables
+    settings = state.settings
+
+    """
+    dissipation interpolated on W-grid
+    """
+    diss = diffusion.compute_dissipation(state, int_drhodX, flux_east, flux_north)
+    diss_wgrid = diffusion.dissipation_on_wgrid(state, diss, vs.kbot)
+    P_diss = P_diss + diss_wgrid
+
+    """
+    diagnose dissipation of dynamic enthalpy by explicit and implicit vertical mixing
+    """
+    fxa = (-int_drhodX[2:-2, 2:-2, 1:] + int_drhodX[2:-2, 2:-2, :-1]) / vs.dzw[npx.newaxis, npx.newaxis, :-1]
+
+    if not iso:
+        P_diss = update_add(
+            P_diss,
+            at[2:-2, 2:-2, :-1],
+            -settings.grav / settings.rho_0 * fxa * flux_top[2:-2, 2:-2, :-1] * vs.maskW[2:-2, 2:-2, :-1],
+        )
+
+    else:
+        P_diss = update_add(
+            P_diss,
+            at[2:-2, 2:-2, :-1],
+            -settings.grav
+            / settings.rho_0
+            * fxa
+            * (
+                flux_top[2:-2, 2:-2, :-1] * vs.maskW[2:-2, 2:-2, :-1]
+                + vs.K_33[2:-2, 2:-2, :-1]
+                * (tr[2:-2, 2:-2, 1:, vs.taup1] - tr[2:-2, 2:-2, :-1, vs.taup1])
+                / vs.dzw[npx.newaxis, npx.newaxis, :-1]
+                * vs.maskW[2:-2, 2:-2, :-1]
+            ),
+        )
+
+    return P_diss
+
+
 @veros_kernel(static_args=("istemp", "iso"))
 def isoneutral_diffusion_kernel(state, tr, istemp, iso=True):
     vs = state.variables
@@ -228,57 +294,47 @@ def isoneutral_diffusion_kernel(state, tr, istemp, iso=True):
     else:
         out.update(salt=tr, dsalt_iso=dtracer_iso)
 
-    """
-    dissipation by isopycnal mixing
-    """
     if settings.enable_conserve_energy:
         if istemp:
             int_drhodX = vs.int_drhodT[:, :, :, vs.tau]
         else:
             int_drhodX = vs.int_drhodS[:, :, :, vs.tau]
 
-        """
-        dissipation interpolated on W-grid
-        """
-        diss = diffusion.compute_dissipation(state, int_drhodX, flux_east, flux_north)
-        diss_wgrid = diffusion.dissipation_on_wgrid(state, diss, vs.kbot)
-
         if not iso:
-            vs.P_diss_skew = vs.P_diss_skew + diss_wgrid
+            out["P_diss_skew"] = _calc_dissipation(
+                state, vs.P_diss_skew, tr, int_drhodX, flux_east, flux_north, flux_top, iso=False
+            )
         else:
-            vs.P_diss_iso = vs.P_diss_iso + diss_wgrid
+            out["P_diss_iso"] = _calc_dissipation(
+                state, vs.P_diss_iso, tr, int_drhodX, flux_east, flux_north, flux_top, iso=True
+            )
 
-        """
-        diagnose dissipation of dynamic enthalpy by explicit and implicit vertical mixing
-        """
-        fxa = (-int_drhodX[2:-2, 2:-2, 1:] + int_drhodX[2:-2, 2:-2, :-1]) / vs.dzw[npx.newaxis, npx.newaxis, :-1]
+    return KernelOutput(**out)
 
-        if not iso:
-            vs.P_diss_skew = update_add(
-                vs.P_diss_skew,
-                at[2:-2, 2:-2, :-1],
-                -settings.grav / settings.rho_0 * fxa * flux_top[2:-2, 2:-2, :-1] * vs.maskW[2:-2, 2:-2, :-1],
-            )
 
-            out["P_diss_skew"] = vs.P_diss_skew
+@veros_kernel
+def isoneutral_diffusion_tempsalt_kernel(state):
+    vs = state.variables
+    settings = state.settings
 
-        else:
-            vs.P_diss_iso = update_add(
-                vs.P_diss_iso,
-                at[2:-2, 2:-2, :-1],
-                -settings.grav
-                / settings.rho_0
-                * fxa
-                * (
-                    flux_top[2:-2, 2:-2, :-1] * vs.maskW[2:-2, 2:-2, :-1]
-                    + vs.K_33[2:-2, 2:-2, :-1]
-                    * (tr[2:-2, 2:-2, 1:, vs.taup1] - tr[2:-2, 2:-2, :-1, vs.taup1])
-                    / vs.dzw[npx.newaxis, npx.newaxis, :-1]
-                    * vs.maskW[2:-2, 2:-2, :-1]
-                ),
-            )
+    temp, dtemp_iso, *temp_fluxes = _add_explicit_part(state, vs.temp, vs.dtemp_iso, iso=True, skew=False)
+    salt, dsalt_iso, *salt_fluxes = _add_explicit_part(state, vs.salt, vs.dsalt_iso, iso=True, skew=False)
+
+    # temperature and salinity share the same implicit operator, so solve for both at once
+    implicit_part = _calc_implicit_part(
+        state, npx.stack((temp[2:-2, 2:-2, :, vs.taup1], salt[2:-2, 2:-2, :, vs.taup1]))
+    )
+    temp, dtemp_iso = _add_implicit_part(state, temp, dtemp_iso, implicit_part[0])
+    salt, dsalt_iso = _add_implicit_part(state, salt, dsalt_iso, implicit_part[1])
 
-            out["P_diss_iso"] = vs.P_diss_iso
+    out = dict(temp=temp, dtemp_iso=dtemp_iso, salt=salt, dsalt_iso=dsalt_iso)
+
+    if settings.enable_conserve_energy:
+        P_diss_iso = _calc_dissipation(
+            state, vs.P_diss_iso, temp, vs.int_drhodT[:, :, :, vs.tau], *temp_fluxes, iso=True
+        )
+        P_diss_iso = _calc_dissipation(state, P_diss_iso, salt, vs.int_drhodS[:, :, :, vs.tau], *salt_fluxes, iso=True)
+        out["P_diss_iso"] = P_diss_iso
 
     return KernelOutput(**out)
 
@@ -305,3 +361,15 @@ def isoneutral_skew_diffusion(state, tr, istemp):
     """
     vs = state.variables
     vs.update(isoneutral_diffusion_kernel(state, tr, istemp, iso=False))
+
+
+@veros_routine
+def isoneutral_diffusion_tempsalt(state):
+    """
+    Isopycnal diffusion for temperature and salinity,
+    following functional formulation by Griffies et al
+    Equivalent to calling isoneutral_diffusion for temp and salt,
+    but solves the implicit vertical part for both tracers at once
+    """
+    vs = state.variables
+    vs.update(isoneutral_diffusion_tempsalt_kernel(state))
@@ -6,7 +6,7 @@ from veros.core import numerics, utilities
 from veros.core.operators import update, update_add, at
 
 
-@veros_kernel
+@veros_kernel(donate_variables=("u", "v"))
 def isoneutral_friction(state):
     """
     vertical friction using TEM formalism for eddy driven velocity
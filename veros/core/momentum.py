@@ -6,7 +6,7 @@ from veros.core import friction, external
 from veros.core.operators import update, update_add, at
 
 
-@veros_kernel
+@veros_kernel(donate_variables=("du", "dv"))
 def tend_coriolisf(state):
     """
     time tendency due to Coriolis force
@@ -99,7 +99,7 @@ def tend_coriolisf(state):
     return KernelOutput(du=vs.du, dv=vs.dv, du_cor=vs.du_cor, dv_cor=vs.dv_cor)
 
 
-@veros_kernel
+@veros_kernel(donate_variables=("du", "dv"))
 def tend_tauxyf(state):
     """
     wind stress forcing
@@ -130,7 +130,7 @@ def tend_tauxyf(state):
     return KernelOutput(du=vs.du, dv=vs.dv)
 
 
-@veros_kernel
+@veros_kernel(donate_variables=("du", "dv"))
 def momentum_advection(state):
     """
     Advection of momentum with second order which is energy conserving
@@ -235,7 +235,7 @@ def vertical_velocity(state):
     vs.update(vertical_velocity_kernel(state))
 
 
-@veros_kernel
+@veros_kernel(donate_variables=("w",))
 def vertical_velocity_kernel(state):
     """
     vertical velocity from continuity :
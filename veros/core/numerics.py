@@ -259,8 +259,7 @@ def calc_initial_conditions_kernel(state):
     vs = state.variables
     settings = state.settings
 
-    vs.temp = utilities.enforce_boundaries(vs.temp, settings.enable_cyclic_x)
-    vs.salt = utilities.enforce_boundaries(vs.salt, settings.enable_cyclic_x)
+    vs.temp, vs.salt = utilities.enforce_boundaries_many((vs.temp, vs.salt), settings.enable_cyclic_x)
 
     vs.rho = density.get_rho(state, vs.salt, vs.temp, npx.abs(vs.zt)[:, npx.newaxis]) * vs.maskT[..., npx.newaxis]
     vs.Hd = (
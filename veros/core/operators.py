@@ -1,6 +1,11 @@
+import functools
 import warnings
+import weakref
+from collections import Counter
 from contextlib import contextmanager
 
+import numpy as onp
+
 from veros import runtime_settings, runtime_state, veros_kernel
 
 
@@ -17,12 +22,13 @@ def noop(*args, **kwargs):
 
 
 @contextmanager
-def make_writeable(*arrs):
+def make_writeable(*arrs, copy=True):
     orig_writeable = [arr.flags.writeable for arr in arrs]
     writeable_arrs = []
     try:
         for arr in arrs:
-            arr = arr.copy()
+            if copy:
+                arr = arr.copy()
             arr.flags.writeable = True
             writeable_arrs.append(arr)
 
@@ -39,29 +45,160 @@ def make_writeable(*arrs):
                 pass
 
 
+# arrays that updates may write into in-place (with numpy_inplace_updates), by id:
+# outputs of allocate() until they are stored in the state, and state variables
+# and arrays created by updates within a kernel until the outermost kernel returns
+_OWNED_ARRAYS = weakref.WeakValueDictionary()
+_KERNEL_OWNED_ARRAYS = {}
+_KERNEL_DEPTH = 0
+
+
+def mark_owned(arr):
+    """Allows updates to modify arr in-place (if numpy_inplace_updates is set).
+
+    Only use this for arrays that are not referenced anywhere else, like fresh outputs of ``allocate``.
+    """
+    if runtime_settings.numpy_inplace_updates and type(arr) is onp.ndarray and arr.base is None:
+        _OWNED_ARRAYS[id(arr)] = arr
+
+
+def release_owned(arr):
+    """Makes sure that arr is copied by all future updates (e.g. since it is stored in the state)."""
+    if _OWNED_ARRAYS:
+        _OWNED_ARRAYS.pop(id(arr), None)
+
+
+@contextmanager
+def kernel_ownership(state_arrays=(), other_args=()):
+    """Marks the execution of a kernel, during which updates may modify arrays in-place.
+
+    Arrays created by updates within the kernel are owned by it, and state arrays are unlocked,
+    unless their buffer is referenced more than once (by another variable or kernel argument).
+    """
+    global _KERNEL_DEPTH
+
+    ref_counts = Counter(id(arr) for arr in state_arrays)
+    ref_counts.update(id(arg) for arg in other_args)
+
+    for arr in state_arrays:
+        if ref_counts[id(arr)] == 1 and type(arr) is onp.ndarray and arr.base is None:
+            _KERNEL_OWNED_ARRAYS[id(arr)] = arr
+
+    _KERNEL_DEPTH += 1
+    try:
+        yield
+    finally:
+        _KERNEL_DEPTH -= 1
+        if not _KERNEL_DEPTH:
+            _KERNEL_OWNED_ARRAYS.clear()
+
+
+def _is_owned(arr):
+    if not runtime_settings.numpy_inplace_updates:
+        return False
+
+    key = id(arr)
+    # the registries hold a reference to owned arrays, so their ids cannot be reused
+    return _KERNEL_OWNED_ARRAYS.get(key) is arr or _OWNED_ARRAYS.get(key) is arr
+
+
+def _mark_created(arr):
+    if _KERNEL_DEPTH and runtime_settings.numpy_inplace_updates:
+        _KERNEL_OWNED_ARRAYS[id(arr)] = arr
+
+
 def update_numpy(arr, at, to):
-    with make_writeable(arr) as warr:
+    inplace = _is_owned(arr)
+    with make_writeable(arr, copy=not inplace) as warr:
         warr[at] = to
+    if not inplace:
+        _mark_created(warr)
     return warr
 
 
 def update_add_numpy(arr, at, to):
-    with make_writeable(arr) as warr:
+    inplace = _is_owned(arr)
+    with make_writeable(arr, copy=not inplace) as warr:
         warr[at] += to
+    if not inplace:
+        _mark_created(warr)
     return warr
 
 
 def update_multiply_numpy(arr, at, to):
-    with make_writeable(arr) as warr:
+    inplace = _is_owned(arr)
+    with make_writeable(arr, copy=not inplace) as warr:
         warr[at] *= to
+    if not inplace:
+        _mark_created(warr)
     return warr
 
 
-def solve_tridiagonal_numpy(a, b, c, d, water_mask, edge_mask):
+# per-column system start depths of immutable (cached) water masks, keyed by id(water_mask)
+_SYSTEM_START_CACHE = {}
+_SYSTEM_START_CACHE_SIZE = 32
+
+
+def _get_system_starts(water_mask):
+    import numpy as np
+
+    cache_key = id(water_mask)
+    cached = _SYSTEM_START_CACHE.get(cache_key)
+
+    # the cache holds a reference to the mask, so its id cannot be reused while the entry exists
+    if cached is not None and cached[0] is water_mask:
+        return cached[1]
+
+    nz = water_mask.shape[-1]
+    system_starts = (nz - np.sum(water_mask, axis=-1)).astype("int32")
+
+    if not water_mask.flags.writeable:
+        if len(_SYSTEM_START_CACHE) >= _SYSTEM_START_CACHE_SIZE:
+            _SYSTEM_START_CACHE.clear()
+        _SYSTEM_START_CACHE[cache_key] = (water_mask, system_starts)
+
+    return system_starts
+
+
+def solve_tridiagonal_numpy(a, b, c, d, water_mask, edge_mask, use_ext=None):
+    import numpy as np
+
+    try:
+        from veros.core.special import tdma_cython_
+    except ImportError:
+        if use_ext:
+            raise
+        use_ext = False
+    else:
+        if use_ext is None:
+            use_ext = a.ndim == 3
+
+    if not use_ext:
+        return _solve_tridiagonal_lapack(a, b, c, d, water_mask, edge_mask)
+
+    # assumes that water cells extend from the edge to the bottom of each column (like create_water_masks)
+    dtype = np.result_type(a, b, c, d, np.float32)
+    a, b, c, d = (np.asarray(arr, dtype=dtype) for arr in (a, b, c, d))
+
+    stacked = d.ndim > a.ndim
+    if not stacked:
+        d = d[np.newaxis]
+
+    out = np.empty(d.shape, dtype=dtype)
+    workspace = np.empty((2, a.shape[-1]), dtype=dtype)
+    tdma_cython_.tdma_columns(a, b, c, d, _get_system_starts(water_mask), out, workspace)
+
+    if not stacked:
+        out = out[0]
+
+    return out
+
+
+def _solve_tridiagonal_lapack(a, b, c, d, water_mask, edge_mask):
     import numpy as np
     from scipy.linalg import lapack
 
-    out = np.zeros(a.shape, dtype=a.dtype)
+    out = np.zeros(d.shape, dtype=a.dtype)
 
     if not np.any(water_mask):
         return out
@@ -72,8 +209,80 @@ def solve_tridiagonal_numpy(a, b, c, d, water_mask, edge_mask):
         a[edge_mask] = 0
         c[..., -1] = 0
 
-    sol = lapack.dgtsv(a[water_mask][1:], b[water_mask], c[water_mask][:-1], d[water_mask])[3]
-    out[water_mask] = sol
+    # all right-hand sides are solved in a single call, as columns of a (n, nrhs) matrix
+    stack_shape = d.shape[: d.ndim - a.ndim]
+    rhs = d.reshape((-1,) + a.shape)[:, water_mask].T
+
+    sol = lapack.dgtsv(a[water_mask][1:], b[water_mask], c[water_mask][:-1], rhs)[3]
+    out = out.reshape((-1,) + a.shape)
+    out[:, water_mask] = sol.T
+    return out.reshape(stack_shape + a.shape)
+
+
+def solve_tridiagonal_numba(a, b, c, d, water_mask, edge_mask):
+    import numpy as np
+
+    stacked = d.ndim > a.ndim
+    rhs = np.ascontiguousarray(d.reshape((-1,) + a.shape))
+    out = _solve_tridiagonal_numba_kernel(a, b, c, rhs, water_mask, edge_mask)
+
+    if not stacked:
+        return out[0]
+
+    return out.reshape(d.shape)
+
+
+@veros_kernel(numba_jit=True)
+def _solve_tridiagonal_numba_kernel(a, b, c, d, water_mask, edge_mask):
+    nx, ny, nz = a.shape
+    nrhs = d.shape[0]
+    out = numpy.zeros(d.shape, dtype=a.dtype)
+
+    # one independent system per water column, land cells are treated as identity rows
+    for col in prange(nx * ny):
+        i, j = col // ny, col % ny
+
+        cp = numpy.zeros(nz, dtype=a.dtype)
+        denom = numpy.ones(nz, dtype=a.dtype)
+        dp = numpy.zeros((nrhs, nz), dtype=a.dtype)
+
+        for k in range(nz):
+            if not water_mask[i, j, k]:
+                continue
+
+            if k == 0 or edge_mask[i, j, k]:
+                a_k = 0.0
+            else:
+                a_k = a[i, j, k]
+
+            if k == nz - 1:
+                c_k = 0.0
+            else:
+                c_k = c[i, j, k]
+
+            if k == 0:
+                cp_last = 0.0
+            else:
+                cp_last = cp[k - 1]
+
+            denom[k] = b[i, j, k] - a_k * cp_last
+            cp[k] = c_k / denom[k]
+
+            # the factorization is shared by all right-hand sides
+            for n in range(nrhs):
+                if k == 0:
+                    dp_last = 0.0
+                else:
+                    dp_last = dp[n, k - 1]
+
+                dp[n, k] = (d[n, i, j, k] - a_k * dp_last) / denom[k]
+
+        for n in range(nrhs):
+            x = 0.0
+            for k in range(nz - 1, -1, -1):
+                x = dp[n, k] - cp[k] * x
+                out[n, i, j, k] = x
+
     return out
 
 
@@ -112,6 +321,10 @@ def solve_tridiagonal_jax(a, b, c, d, water_mask, edge_mask, use_ext=None):
         )
 
     if use_ext:
+        if d.ndim > a.ndim:
+            # the custom call only supports a single right-hand side
+            return jnp.stack([tdma(a, b, c, d_n, water_mask, edge_mask) for d_n in d])
+
         return tdma(a, b, c, d, water_mask, edge_mask)
 
     warnings.warn("Could not use custom TDMA implementation, falling back to pure JAX")
@@ -121,6 +334,7 @@ def solve_tridiagonal_jax(a, b, c, d, water_mask, edge_mask, use_ext=None):
     c = water_mask * c
     d = water_mask * d
 
+    # diagonals broadcast against stacked right-hand sides
     def compute_primes(last_primes, x):
         last_cp, last_dp = last_primes
         a, b, c, d = x
@@ -129,17 +343,18 @@ def solve_tridiagonal_jax(a, b, c, d, water_mask, edge_mask, use_ext=None):
         new_primes = (cp, dp)
         return new_primes, new_primes
 
-    diags_transposed = [jnp.moveaxis(arr, 2, 0) for arr in (a, b, c, d)]
-    init = jnp.zeros(a.shape[:-1], dtype=a.dtype)
-    _, primes = jax.lax.scan(compute_primes, (init, init), diags_transposed)
+    diags_transposed = [jnp.moveaxis(arr, -1, 0) for arr in (a, b, c, d)]
+    init_cp = jnp.zeros(a.shape[:-1], dtype=a.dtype)
+    init_dp = jnp.zeros(d.shape[:-1], dtype=a.dtype)
+    _, primes = jax.lax.scan(compute_primes, (init_cp, init_dp), diags_transposed)
 
     def backsubstitution(last_x, x):
         cp, dp = x
         new_x = dp - cp * last_x
         return new_x, new_x
 
-    _, sol = jax.lax.scan(backsubstitution, init, primes, reverse=True)
-    return jnp.moveaxis(sol, 0, 2)
+    _, sol = jax.lax.scan(backsubstitution, init_dp, primes, reverse=True)
+    return jnp.moveaxis(sol, 0, -1)
 
 
 def update_jax(arr, at, to):
@@ -154,10 +369,15 @@ def update_multiply_jax(arr, at, to):
     return arr.at[at].multiply(to)
 
 
-def flush_jax():
+@functools.lru_cache(maxsize=None)
+def _get_flush_dummy():
     import jax
 
-    dummy = jax.device_put(0.0) + 0.0
+    return jax.device_put(0.0)
+
+
+def flush_jax():
+    dummy = _get_flush_dummy() + 0.0
     try:
         dummy.block_until_ready()
     except AttributeError:
@@ -176,6 +396,22 @@ if runtime_settings.backend == "numpy":
     for_loop = fori_numpy
     scan = scan_numpy
     flush = noop
+    prange = range
+
+elif runtime_settings.backend == "numba":
+    import numba
+
+    # array updates and loops over Python callables cannot benefit from numba,
+    # so only the tridiagonal solver and kernels with numba_jit=True are compiled
+    update = update_numpy
+    update_add = update_add_numpy
+    update_multiply = update_multiply_numpy
+    at = Index()
+    solve_tridiagonal = solve_tridiagonal_numba
+    for_loop = fori_numpy
+    scan = scan_numpy
+    flush = noop
+    prange = numba.prange
 
 elif runtime_settings.backend == "jax":
     import jax.lax
@@ -188,6 +424,7 @@ elif runtime_settings.backend == "jax":
     for_loop = jax.lax.fori_loop
     scan = jax.lax.scan
     flush = flush_jax
+    prange = range
 
 else:
     raise ValueError(f"Unrecognized backend {runtime_settings.backend}")
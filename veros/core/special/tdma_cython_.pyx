@@ -120,6 +120,67 @@ cdef void tdma_cython_float(void** out_ptr, void** data_ptr) nogil:
         ii += stride
 
 
+ctypedef fused real:
+    float
+    double
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def tdma_columns(
+    const real[:, :, :] a,
+    const real[:, :, :] b,
+    const real[:, :, :] c,
+    const real[:, :, :, :] d,
+    const int32_t[:, :] system_starts,
+    real[:, :, :, :] out,
+    real[:, ::1] workspace,
+):
+    """Solve one tridiagonal system per (x, y) column for a stack of right-hand sides.
+
+    Each system spans the cells from system_starts[i, j] to the bottom of the column.
+    The first element of a and the last element of c in each system are ignored,
+    cells above the system start are set to zero. The matrix is factorized once per column
+    and applied to every right-hand side d[n] (writing to out[n]).
+    """
+    cdef:
+        Py_ssize_t i, j, k, n, start
+        Py_ssize_t nrhs = d.shape[0]
+        Py_ssize_t nx = a.shape[0]
+        Py_ssize_t ny = a.shape[1]
+        Py_ssize_t nz = a.shape[2]
+        real[::1] cp = workspace[0]
+        real[::1] denom = workspace[1]
+
+    with nogil:
+        for i in range(nx):
+            for j in range(ny):
+                start = system_starts[i, j]
+
+                for n in range(nrhs):
+                    for k in range(min(start, nz)):
+                        out[n, i, j, k] = 0
+
+                if start >= nz:
+                    continue
+
+                cp[start] = c[i, j, start] / b[i, j, start]
+
+                for k in range(start + 1, nz):
+                    denom[k] = 1 / (b[i, j, k] - a[i, j, k] * cp[k - 1])
+                    cp[k] = c[i, j, k] * denom[k]
+
+                for n in range(nrhs):
+                    out[n, i, j, start] = d[n, i, j, start] / b[i, j, start]
+
+                    for k in range(start + 1, nz):
+                        out[n, i, j, k] = (d[n, i, j, k] - a[i, j, k] * out[n, i, j, k - 1]) * denom[k]
+
+                    for k in range(nz - 2, start - 1, -1):
+                        out[n, i, j, k] -= cp[k] * out[n, i, j, k + 1]
+
+
 cpu_custom_call_targets = {}
 
 cdef register_custom_call_target(fn_name, void* fn):
@@ -1,7 +1,7 @@
 from veros.core.operators import numpy as npx
 
 from veros import veros_routine, veros_kernel, KernelOutput
-from veros.distributed import global_sum
+from veros.distributed import GlobalReduction
 from veros.variables import allocate
 from veros.core import advection, diffusion, isoneutral, density, utilities
 from veros.core.operators import update, update_add, at
@@ -109,7 +109,7 @@ def calc_eq_of_state(state, n):
     )
 
 
-@veros_kernel
+@veros_kernel(donate_variables=("temp", "salt", "dtemp", "dsalt"))
 def advect_temp_salt_enthalpy(state):
     """
     integrate temperature and salinity and diagnose sources of dynamic enthalpy
@@ -214,8 +214,11 @@ def advect_temp_salt_enthalpy(state):
             * tke_mask
         ) + npx.sum(0.5 * vs.area_t[2:-2, 2:-2] * vs.dzw[-1] * vs.maskW[2:-2, 2:-2, -1])
 
-        fxa = global_sum(fxa)
-        fxb = global_sum(fxb)
+        reduction = GlobalReduction()
+        reduction.sum("fxa", fxa)
+        reduction.sum("fxb", fxb)
+        res = reduction.resolve()
+        fxa, fxb = res["fxa"], res["fxb"]
 
         vs.P_diss_adv = update(vs.P_diss_adv, at[2:-2, 2:-2, :-1], fxa / fxb * tke_mask)
         vs.P_diss_adv = update(vs.P_diss_adv, at[2:-2, 2:-2, -1], fxa / fxb)
@@ -245,7 +248,7 @@ def advect_temp_salt_enthalpy(state):
     )
 
 
-@veros_kernel
+@veros_kernel(donate_variables=("temp", "salt"))
 def vertmix_tempsalt(state):
     """
     vertical mixing of temperature and salinity
@@ -259,7 +262,6 @@ def vertmix_tempsalt(state):
     a_tri = allocate(state.dimensions, ("xt", "yt", "zt"))[2:-2, 2:-2]
     b_tri = allocate(state.dimensions, ("xt", "yt", "zt"))[2:-2, 2:-2]
     c_tri = allocate(state.dimensions, ("xt", "yt", "zt"))[2:-2, 2:-2]
-    d_tri = allocate(state.dimensions, ("xt", "yt", "zt"))[2:-2, 2:-2]
     delta = allocate(state.dimensions, ("xt", "yt", "zt"))[2:-2, 2:-2]
 
     _, water_mask, edge_mask = utilities.create_water_masks(vs.kbot[2:-2, 2:-2], settings.nz)
@@ -272,17 +274,20 @@ def vertmix_tempsalt(state):
     b_tri = update(b_tri, at[:, :, 1:], 1 + (delta[:, :, 1:] + delta[:, :, :-1]) / vs.dzt[npx.newaxis, npx.newaxis, 1:])
     b_tri_edge = 1 + delta / vs.dzt[npx.newaxis, npx.newaxis, :]
     c_tri = update(c_tri, at[:, :, :-1], -delta[:, :, :-1] / vs.dzt[npx.newaxis, npx.newaxis, :-1])
-    d_tri = vs.temp[2:-2, 2:-2, :, vs.taup1]
-    d_tri = update_add(d_tri, at[:, :, -1], settings.dt_tracer * vs.forc_temp_surface[2:-2, 2:-2] / vs.dzt[-1])
-
-    sol = utilities.solve_implicit(a_tri, b_tri, c_tri, d_tri, water_mask, b_edge=b_tri_edge, edge_mask=edge_mask)
-    vs.temp = update(vs.temp, at[2:-2, 2:-2, :, vs.taup1], npx.where(water_mask, sol, vs.temp[2:-2, 2:-2, :, vs.taup1]))
-
-    d_tri = vs.salt[2:-2, 2:-2, :, vs.taup1]
-    d_tri = update_add(d_tri, at[:, :, -1], settings.dt_tracer * vs.forc_salt_surface[2:-2, 2:-2] / vs.dzt[-1])
+    d_temp = vs.temp[2:-2, 2:-2, :, vs.taup1]
+    d_temp = update_add(d_temp, at[:, :, -1], settings.dt_tracer * vs.forc_temp_surface[2:-2, 2:-2] / vs.dzt[-1])
+    d_salt = vs.salt[2:-2, 2:-2, :, vs.taup1]
+    d_salt = update_add(d_salt, at[:, :, -1], settings.dt_tracer * vs.forc_salt_surface[2:-2, 2:-2] / vs.dzt[-1])
 
+    # temperature and salinity share the same operator, so solve for both at once
+    d_tri = npx.stack((d_temp, d_salt))
     sol = utilities.solve_implicit(a_tri, b_tri, c_tri, d_tri, water_mask, b_edge=b_tri_edge, edge_mask=edge_mask)
-    vs.salt = update(vs.salt, at[2:-2, 2:-2, :, vs.taup1], npx.where(water_mask, sol, vs.salt[2:-2, 2:-2, :, vs.taup1]))
+    vs.temp = update(
+        vs.temp, at[2:-2, 2:-2, :, vs.taup1], npx.where(water_mask, sol[0], vs.temp[2:-2, 2:-2, :, vs.taup1])
+    )
+    vs.salt = update(
+        vs.salt, at[2:-2, 2:-2, :, vs.taup1], npx.where(water_mask, sol[1], vs.salt[2:-2, 2:-2, :, vs.taup1])
+    )
 
     vs.dtemp_vmix = (vs.temp[:, :, :, vs.taup1] - vs.dtemp_vmix) / settings.dt_tracer
     vs.dsalt_vmix = (vs.salt[:, :, :, vs.taup1] - vs.dsalt_vmix) / settings.dt_tracer
@@ -290,12 +295,11 @@ def vertmix_tempsalt(state):
     """
     boundary exchange
     """
-    vs.temp = update(
-        vs.temp, at[..., vs.taup1], utilities.enforce_boundaries(vs.temp[..., vs.taup1], settings.enable_cyclic_x)
-    )
-    vs.salt = update(
-        vs.salt, at[..., vs.taup1], utilities.enforce_boundaries(vs.salt[..., vs.taup1], settings.enable_cyclic_x)
+    temp, salt = utilities.enforce_boundaries_many(
+        (vs.temp[..., vs.taup1], vs.salt[..., vs.taup1]), settings.enable_cyclic_x
     )
+    vs.temp = update(vs.temp, at[..., vs.taup1], temp)
+    vs.salt = update(vs.salt, at[..., vs.taup1], salt)
 
     return KernelOutput(dtemp_vmix=vs.dtemp_vmix, temp=vs.temp, dsalt_vmix=vs.dsalt_vmix, salt=vs.salt)
 
@@ -428,8 +432,7 @@ def thermodynamics(state):
             vs.dsalt_iso = update(vs.dsalt_iso, at[...], 0.0)
 
             vs.update(isoneutral.isoneutral_diffusion_pre(state))
-            vs.update(isoneutral.isoneutral_diffusion(state, tr=vs.temp, istemp=True))
-            vs.update(isoneutral.isoneutral_diffusion(state, tr=vs.salt, istemp=False))
+            vs.update(isoneutral.isoneutral_diffusion_tempsalt(state))
 
             if settings.enable_skew_diffusion:
                 vs.P_diss_skew = update(vs.P_diss_skew, at[...], 0.0)
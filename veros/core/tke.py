@@ -120,7 +120,7 @@ def integrate_tke(state):
     vs.update(tke_out)
 
 
-@veros_kernel
+@veros_kernel(donate_variables=("tke",))
 def integrate_tke_kernel(state):
     """
     integrate Tke equation on W grid with surface flux boundary condition
@@ -21,6 +21,73 @@ def enforce_boundaries(arr, enable_cyclic_x, local=False):
     return arr
 
 
+@veros_kernel(static_args=("enable_cyclic_x", "local"))
+def enforce_boundaries_many(arrs, enable_cyclic_x, local=False):
+    """
+    Like enforce_boundaries, but for several arrays at once.
+    Their overlaps are exchanged in a single message per neighbor. Returns a tuple of arrays.
+    """
+    from veros import runtime_state as rst
+    from veros.routines import CURRENT_CONTEXT
+
+    if rst.proc_num == 1 or not CURRENT_CONTEXT.is_dist_safe or local:
+        return tuple(enforce_boundaries(arr, enable_cyclic_x, local=True) for arr in arrs)
+
+    from veros.distributed import exchange_overlap_many
+
+    return tuple(exchange_overlap_many(arrs, ["xt", "yt"], cyclic=enable_cyclic_x))
+
+
+def start_boundary_exchange(arrs, enable_cyclic_x, local=False):
+    """
+    Starts updating the overlaps of several arrays (like enforce_boundaries_many), without waiting for it.
+    Returns a handle that has to be passed to finish_boundary_exchange.
+    In between, everything that does not depend on the overlaps can be computed (e.g. the interior
+    of a stencil, see split_region), which hides communication in distributed runs.
+    The arrays must not be modified until the exchange is finished.
+    """
+    from veros import runtime_state as rst
+    from veros.routines import CURRENT_CONTEXT
+    from veros.distributed import HaloExchange, start_exchange_overlap
+
+    if rst.proc_num == 1 or not CURRENT_CONTEXT.is_dist_safe or local:
+        return HaloExchange(enforce_boundaries(arr, enable_cyclic_x, local=True) for arr in arrs)
+
+    return start_exchange_overlap(arrs, ["xt", "yt"], cyclic=enable_cyclic_x)
+
+
+def finish_boundary_exchange(exchange):
+    """
+    Completes an exchange started with start_boundary_exchange. Returns a tuple of the updated arrays.
+    """
+    from veros.distributed import finish_exchange_overlap
+
+    return tuple(finish_exchange_overlap(exchange))
+
+
+def shift_slice(s, offset):
+    """
+    Shifts a slice with non-negative bounds by given offset
+    """
+    return slice(s.start + offset, s.stop + offset)
+
+
+def split_region(region, interior):
+    """
+    Returns the strips of a 2D region that are not part of its interior.
+    Both are given as tuples of slices with non-negative bounds, and the interior must lie within the region.
+    The interior and all strips together cover the region exactly once.
+    """
+    (x, y), (x_inner, y_inner) = region, interior
+    strips = (
+        (slice(x.start, x_inner.start), y),
+        (slice(x_inner.stop, x.stop), y),
+        (x_inner, slice(y.start, y_inner.start)),
+        (x_inner, slice(y_inner.stop, y.stop)),
+    )
+    return [(sx, sy) for sx, sy in strips if sx.stop > sx.start and sy.stop > sy.start]
+
+
 @veros_kernel
 def pad_z_edges(array):
     """
@@ -35,8 +102,34 @@ def pad_z_edges(array):
     return newarray
 
 
+# water masks only depend on topography, so they are computed once per distinct ks (NumPy only)
+_WATER_MASK_CACHE = {}
+_WATER_MASK_CACHE_SIZE = 32
+
+
 @veros_kernel(static_args=("nz"))
 def create_water_masks(ks, nz):
+    from veros import runtime_settings
+
+    if runtime_settings.backend == "jax":
+        return _compute_water_masks(ks, nz)
+
+    cache_key = (nz, ks.shape, ks.dtype.str, ks.tobytes())
+    masks = _WATER_MASK_CACHE.get(cache_key)
+
+    if masks is None:
+        masks = _compute_water_masks(ks, nz)
+        for mask in masks:
+            mask.flags.writeable = False
+
+        if len(_WATER_MASK_CACHE) >= _WATER_MASK_CACHE_SIZE:
+            _WATER_MASK_CACHE.clear()
+        _WATER_MASK_CACHE[cache_key] = masks
+
+    return masks
+
+
+def _compute_water_masks(ks, nz):
     ks = ks - 1
     land_mask = ks >= 0
     water_mask = npx.logical_and(
@@ -0,0 +1,185 @@
+"""Non-uniform domain decompositions.
+
+By default, the horizontal domain is split evenly into ``num_proc[0] x num_proc[1]`` tiles, one per process.
+A :class:`Decomposition` can instead use tiles of different sizes, and leave out tiles that only contain
+land. Such a decomposition is computed from the topography of a setup via :meth:`Decomposition.balanced`
+(or ``veros decompose``), stored in a file, and used by pointing the runtime setting ``decomposition_file``
+to it.
+"""
+
+import json
+
+import numpy as onp
+
+# tiles have to be at least as wide as the overlap
+MIN_TILE_SIZE = 2
+
+
+class Decomposition:
+    """Splits the domain into a grid of rectangular tiles, each of which is computed by one process.
+
+    Arguments:
+        x_sizes: Number of grid cells of each column of tiles (west to east).
+        y_sizes: Number of grid cells of each row of tiles (south to north).
+        active: Boolean array of shape ``(len(x_sizes), len(y_sizes))`` marking tiles that get a process
+            (default: all). Inactive tiles must not contain any wet cells, since they are never computed.
+
+    Processes are assigned to active tiles row by row, so without inactive tiles, the process layout is
+    the same as for an even decomposition.
+    """
+
+    def __init__(self, x_sizes, y_sizes, active=None):
+        self.sizes = (tuple(int(size) for size in x_sizes), tuple(int(size) for size in y_sizes))
+        self.num_proc = (len(self.sizes[0]), len(self.sizes[1]))
+
+        if active is None:
+            active = onp.ones(self.num_proc, dtype="bool")
+
+        self.active = onp.array(active, dtype="bool")
+
+        if self.active.shape != self.num_proc:
+            raise ValueError(f"active tiles must have shape {self.num_proc}, got {self.active.shape}")
+
+        if min(*self.sizes[0], *self.sizes[1]) < MIN_TILE_SIZE:
+            raise ValueError(f"all tiles must be at least {MIN_TILE_SIZE} grid cells wide")
+
+        # 1D arrays are collected from the first active tile of every column and row
+        if not self.active.any(axis=1).all() or not self.active.any(axis=0).all():
+            raise ValueError("every row and column of tiles must contain at least one active tile")
+
+        self.tiles = [
+            (ix, iy) for iy in range(self.num_proc[1]) for ix in range(self.num_proc[0]) if self.active[ix, iy]
+        ]
+        self._ranks = {tile: rank for rank, tile in enumerate(self.tiles)}
+        self._starts = tuple(tuple(onp.cumsum((0,) + sizes[:-1]).tolist()) for sizes in self.sizes)
+
+    def __eq__(self, other):
+        if not isinstance(other, Decomposition):
+            return NotImplemented
+
+        return self.sizes == other.sizes and onp.array_equal(self.active, other.active)
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}(x_sizes={self.sizes[0]}, y_sizes={self.sizes[1]}, "
+            f"active tiles={self.num_active}/{self.num_proc[0] * self.num_proc[1]})"
+        )
+
+    @property
+    def shape(self):
+        """Number of grid cells in x and y-direction"""
+        return (sum(self.sizes[0]), sum(self.sizes[1]))
+
+    @property
+    def num_active(self):
+        """Number of active tiles, which is the number of processes needed to run this decomposition"""
+        return len(self.tiles)
+
+    @property
+    def has_inactive_tiles(self):
+        return self.num_active < self.active.size
+
+    def get_bounds(self, axis, index):
+        """Returns start index and size of the tile with given index along given axis (0: x, 1: y)"""
+        return self._starts[axis][index], self.sizes[axis][index]
+
+    def rank_to_tile(self, rank):
+        return self.tiles[rank]
+
+    def tile_to_rank(self, ix, iy):
+        """Returns the rank of the process computing the given tile, or None if the tile is inactive"""
+        return self._ranks.get((ix, iy))
+
+    def tile_slices(self, ix, iy):
+        """Returns the slices of the given tile in a global array without overlap"""
+        (x_start, x_size), (y_start, y_size) = self.get_bounds(0, ix), self.get_bounds(1, iy)
+        return slice(x_start, x_start + x_size), slice(y_start, y_start + y_size)
+
+    def count_wet_cells(self, kbot):
+        """Returns the number of wet cells (kbot > 0) in every tile, given kbot of the whole domain (without overlap)"""
+        kbot = onp.asarray(kbot)
+
+        if kbot.shape != self.shape:
+            raise ValueError(f"kbot must have shape {self.shape}, got {kbot.shape}")
+
+        wet_cells = onp.zeros(self.num_proc, dtype="int")
+        for ix in range(self.num_proc[0]):
+            for iy in range(self.num_proc[1]):
+                wet_cells[ix, iy] = onp.count_nonzero(kbot[self.tile_slices(ix, iy)] > 0)
+
+        return wet_cells
+
+    @classmethod
+    def balanced(cls, kbot, num_proc, drop_land=True):
+        """Creates a decomposition of the domain with given topography into ``num_proc[0] x num_proc[1]`` tiles.
+
+        The boundaries between columns and rows of tiles are chosen so that every column and every row
+        contains about the same number of wet cells. With ``drop_land``, tiles without any wet cells are
+        marked inactive (except if this would leave a row or column without active tiles).
+
+        Arguments:
+            kbot: Index of the deepest wet cell of the whole domain (without overlap); 0 on land.
+            num_proc: Number of tiles in x and y-direction.
+            drop_land: Whether to drop tiles that only contain land.
+        """
+        wet = onp.asarray(kbot) > 0
+        x_sizes = _balance_axis(wet.sum(axis=1), num_proc[0])
+        y_sizes = _balance_axis(wet.sum(axis=0), num_proc[1])
+
+        decomposition = cls(x_sizes, y_sizes)
+
+        if not drop_land:
+            return decomposition
+
+        active = decomposition.count_wet_cells(kbot) > 0
+
+        # rows and columns without any ocean keep one tile, so 1D grid arrays can still be collected
+        for ix in onp.flatnonzero(~active.any(axis=1)):
+            active[ix, 0] = True
+
+        for iy in onp.flatnonzero(~active.any(axis=0)):
+            active[0, iy] = True
+
+        return cls(x_sizes, y_sizes, active)
+
+    def to_file(self, path):
+        with open(path, "w") as f:
+            json.dump(dict(x_sizes=self.sizes[0], y_sizes=self.sizes[1], active=self.active.tolist()), f, indent=2)
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, "r") as f:
+            data = json.load(f)
+
+        return cls(data["x_sizes"], data["y_sizes"], data["active"])
+
+
+def _balance_axis(weights, num_parts):
+    """Splits an axis into num_parts contiguous chunks that have about the same sum of weights"""
+    weights = onp.asarray(weights, dtype="float")
+    n = weights.size
+
+    if n < MIN_TILE_SIZE * num_parts:
+        raise ValueError(f"cannot split {n} grid cells into {num_parts} tiles of at least {MIN_TILE_SIZE} cells")
+
+    if not weights.sum():
+        weights = onp.ones_like(weights)
+
+    cumulative = onp.concatenate(([0.0], onp.cumsum(weights)))
+
+    bounds = [0]
+    for part in range(1, num_parts):
+        start = bounds[-1]
+        # distribute the remaining weight evenly between the remaining parts
+        target = cumulative[start] + (cumulative[n] - cumulative[start]) / (num_parts - part + 1)
+        stop = int(onp.searchsorted(cumulative, target))
+
+        if stop > start + 1 and target - cumulative[stop - 1] < cumulative[stop] - target:
+            stop -= 1
+
+        # leave enough cells for all remaining parts
+        stop = min(max(stop, start + MIN_TILE_SIZE), n - MIN_TILE_SIZE * (num_parts - part))
+        bounds.append(stop)
+
+    bounds.append(n)
+    return onp.diff(bounds).tolist()
@@ -1,7 +1,7 @@
 from veros import logger
 from veros.core.operators import numpy as npx
 from veros.diagnostics.base import VerosDiagnostic
-from veros.distributed import global_max
+from veros.distributed import GlobalReduction
 
 
 class CFLMonitor(VerosDiagnostic):
@@ -27,30 +27,18 @@ class CFLMonitor(VerosDiagnostic):
         vs = state.variables
         settings = state.settings
 
-        cfl = global_max(
-            max(
-                npx.max(
-                    npx.abs(vs.u[2:-2, 2:-2, :, vs.tau])
-                    * vs.maskU[2:-2, 2:-2, :]
-                    / (vs.cost[npx.newaxis, 2:-2, npx.newaxis] * vs.dxt[2:-2, npx.newaxis, npx.newaxis])
-                    * settings.dt_tracer
-                ),
-                npx.max(
-                    npx.abs(vs.v[2:-2, 2:-2, :, vs.tau])
-                    * vs.maskV[2:-2, 2:-2, :]
-                    / vs.dyt[npx.newaxis, 2:-2, npx.newaxis]
-                    * settings.dt_tracer
-                ),
-            )
-        )
-        wcfl = global_max(
-            npx.max(
-                npx.abs(vs.w[2:-2, 2:-2, :, vs.tau])
-                * vs.maskW[2:-2, 2:-2, :]
-                / vs.dzt[npx.newaxis, npx.newaxis, :]
-                * settings.dt_tracer
-            )
-        )
+        reduction = GlobalReduction()
+        reduction.max("cfl", max(*_horizontal_cfl(state, vs.u[..., vs.tau], vs.v[..., vs.tau])))
+        reduction.max("wcfl", _vertical_cfl(state, vs.w[..., vs.tau]))
+
+        check_wgrid = settings.enable_eke or settings.enable_tke or settings.enable_idemix
+        if check_wgrid:
+            reduction.max("cfl_wgrid", max(*_horizontal_cfl(state, vs.u_wgrid, vs.v_wgrid)))
+            reduction.max("wcfl_wgrid", _vertical_cfl(state, vs.w_wgrid))
+
+        # all maxima are computed in a single global reduction
+        res = reduction.resolve()
+        cfl, wcfl = res["cfl"], res["wcfl"]
 
         if npx.isnan(cfl) or npx.isnan(wcfl):
             raise RuntimeError(f"CFL number is NaN at iteration {vs.itt}")
@@ -58,30 +46,36 @@ class CFLMonitor(VerosDiagnostic):
         logger.diagnostic(f" Maximal hor. CFL number = {cfl}")
         logger.diagnostic(f" Maximal ver. CFL number = {wcfl}")
 
-        if settings.enable_eke or settings.enable_tke or settings.enable_idemix:
-            cfl = global_max(
-                max(
-                    npx.max(
-                        npx.abs(vs.u_wgrid[2:-2, 2:-2, :])
-                        * vs.maskU[2:-2, 2:-2, :]
-                        / (vs.cost[npx.newaxis, 2:-2, npx.newaxis] * vs.dxt[2:-2, npx.newaxis, npx.newaxis])
-                        * settings.dt_tracer
-                    ),
-                    npx.max(
-                        npx.abs(vs.v_wgrid[2:-2, 2:-2, :])
-                        * vs.maskV[2:-2, 2:-2, :]
-                        / vs.dyt[npx.newaxis, 2:-2, npx.newaxis]
-                        * settings.dt_tracer
-                    ),
-                )
-            )
-            wcfl = global_max(
-                npx.max(
-                    npx.abs(vs.w_wgrid[2:-2, 2:-2, :])
-                    * vs.maskW[2:-2, 2:-2, :]
-                    / vs.dzt[npx.newaxis, npx.newaxis, :]
-                    * settings.dt_tracer
-                )
-            )
-            logger.diagnostic(f" Maximal hor. CFL number on w grid = {cfl}")
-            logger.diagnostic(f" Maximal ver. CFL number on w grid = {wcfl}")
+        if check_wgrid:
+            logger.diagnostic(f" Maximal hor. CFL number on w grid = {res['cfl_wgrid']}")
+            logger.diagnostic(f" Maximal ver. CFL number on w grid = {res['wcfl_wgrid']}")
+
+
+def _horizontal_cfl(state, u, v):
+    """Local maximum CFL numbers in x and y-direction"""
+    vs = state.variables
+    settings = state.settings
+
+    cfl_x = npx.max(
+        npx.abs(u[2:-2, 2:-2, :])
+        * vs.maskU[2:-2, 2:-2, :]
+        / (vs.cost[npx.newaxis, 2:-2, npx.newaxis] * vs.dxt[2:-2, npx.newaxis, npx.newaxis])
+        * settings.dt_tracer
+    )
+    cfl_y = npx.max(
+        npx.abs(v[2:-2, 2:-2, :])
+        * vs.maskV[2:-2, 2:-2, :]
+        / vs.dyt[npx.newaxis, 2:-2, npx.newaxis]
+        * settings.dt_tracer
+    )
+    return cfl_x, cfl_y
+
+
+def _vertical_cfl(state, w):
+    """Local maximum CFL number in z-direction"""
+    vs = state.variables
+    settings = state.settings
+
+    return npx.max(
+        npx.abs(w[2:-2, 2:-2, :]) * vs.maskW[2:-2, 2:-2, :] / vs.dzt[npx.newaxis, npx.newaxis, :] * settings.dt_tracer
+    )
@@ -4,7 +4,7 @@ from veros import veros_kernel, KernelOutput, runtime_settings
 from veros.core.operators import numpy as npx, update_multiply, at
 from veros.diagnostics.base import VerosDiagnostic
 from veros.variables import Variable
-from veros.distributed import global_sum
+from veros.distributed import GlobalReduction
 
 
 ENERGY_VARIABLES = dict(
@@ -162,7 +162,11 @@ def diagnose_kernel(state):
     # changes of dynamic enthalpy
     vol_t = vs.area_t[2:-2, 2:-2, npx.newaxis] * vs.dzt[npx.newaxis, npx.newaxis, :] * vs.maskT[2:-2, 2:-2, :]
 
-    dP_iso = global_sum(
+    # all global sums are collected and computed in a single reduction
+    reduction = GlobalReduction()
+
+    reduction.sum(
+        "dP_iso",
         npx.sum(
             vol_t
             * settings.grav
@@ -171,10 +175,11 @@ def diagnose_kernel(state):
                 -vs.int_drhodT[2:-2, 2:-2, :, vs.tau] * vs.dtemp_iso[2:-2, 2:-2, :]
                 - vs.int_drhodS[2:-2, 2:-2, :, vs.tau] * vs.dsalt_iso[2:-2, 2:-2, :]
             )
-        )
+        ),
     )
 
-    dP_hmix = global_sum(
+    reduction.sum(
+        "dP_hmix",
         npx.sum(
             vol_t
             * settings.grav
@@ -183,10 +188,11 @@ def diagnose_kernel(state):
                 -vs.int_drhodT[2:-2, 2:-2, :, vs.tau] * vs.dtemp_hmix[2:-2, 2:-2, :]
                 - vs.int_drhodS[2:-2, 2:-2, :, vs.tau] * vs.dsalt_hmix[2:-2, 2:-2, :]
             )
-        )
+        ),
     )
 
-    dP_vmix = global_sum(
+    reduction.sum(
+        "dP_vmix",
         npx.sum(
             vol_t
             * settings.grav
@@ -195,10 +201,11 @@ def diagnose_kernel(state):
                 -vs.int_drhodT[2:-2, 2:-2, :, vs.tau] * vs.dtemp_vmix[2:-2, 2:-2, :]
                 - vs.int_drhodS[2:-2, 2:-2, :, vs.tau] * vs.dsalt_vmix[2:-2, 2:-2, :]
             )
-        )
+        ),
     )
 
-    dP_m = global_sum(
+    reduction.sum(
+        "dP_m",
         npx.sum(
             vol_t
             * settings.grav
@@ -207,15 +214,14 @@ def diagnose_kernel(state):
                 -vs.int_drhodT[2:-2, 2:-2, :, vs.tau] * vs.dtemp[2:-2, 2:-2, :, vs.tau]
                 - vs.int_drhodS[2:-2, 2:-2, :, vs.tau] * vs.dsalt[2:-2, 2:-2, :, vs.tau]
             )
-        )
+        ),
     )
 
-    dP_m_all = dP_m + dP_vmix + dP_hmix + dP_iso
-
     # changes of kinetic energy
     vol_u = vs.area_u[2:-2, 2:-2, npx.newaxis] * vs.dzt[npx.newaxis, npx.newaxis, :]
     vol_v = vs.area_v[2:-2, 2:-2, npx.newaxis] * vs.dzt[npx.newaxis, npx.newaxis, :]
-    k_m = global_sum(
+    reduction.sum(
+        "k_m",
         npx.sum(
             vol_t
             * 0.5
@@ -224,51 +230,54 @@ def diagnose_kernel(state):
                 + 0.5 * (vs.v[2:-2, 2:-2, :, vs.tau] ** 2)
                 + vs.v[2:-2, 1:-3, :, vs.tau] ** 2
             )
-        )
+        ),
     )
-    p_m = global_sum(npx.sum(vol_t * vs.Hd[2:-2, 2:-2, :, vs.tau]))
-    dk_m = global_sum(
+    reduction.sum("p_m", npx.sum(vol_t * vs.Hd[2:-2, 2:-2, :, vs.tau]))
+    reduction.sum(
+        "dk_m",
         npx.sum(
             vs.u[2:-2, 2:-2, :, vs.tau] * vs.du[2:-2, 2:-2, :, vs.tau] * vol_u
             + vs.v[2:-2, 2:-2, :, vs.tau] * vs.dv[2:-2, 2:-2, :, vs.tau] * vol_v
             + vs.u[2:-2, 2:-2, :, vs.tau] * vs.du_mix[2:-2, 2:-2, :] * vol_u
             + vs.v[2:-2, 2:-2, :, vs.tau] * vs.dv_mix[2:-2, 2:-2, :] * vol_v
-        )
+        ),
     )
 
     # K*Nsqr and KE and dyn. enthalpy dissipation
     vol_w = vs.area_t[2:-2, 2:-2, npx.newaxis] * vs.dzw[npx.newaxis, npx.newaxis, :] * vs.maskW[2:-2, 2:-2, :]
     vol_w = update_multiply(vol_w, at[:, :, -1], 0.5)
 
-    def mean_w(var):
-        return global_sum(npx.sum(var[2:-2, 2:-2, :] * vol_w))
+    def mean_w(name, var):
+        reduction.sum(name, npx.sum(var[2:-2, 2:-2, :] * vol_w))
 
-    mdiss_vmix = mean_w(vs.P_diss_v)
-    mdiss_nonlin = mean_w(vs.P_diss_nonlin)
-    mdiss_adv = mean_w(vs.P_diss_adv)
-    mdiss_hmix = mean_w(vs.P_diss_hmix)
-    mdiss_iso = mean_w(vs.P_diss_iso)
-    mdiss_skew = mean_w(vs.P_diss_skew)
-    mdiss_sources = mean_w(vs.P_diss_sources)
+    mean_w("mdiss_vmix", vs.P_diss_v)
+    mean_w("mdiss_nonlin", vs.P_diss_nonlin)
+    mean_w("mdiss_adv", vs.P_diss_adv)
+    mean_w("mdiss_hmix", vs.P_diss_hmix)
+    mean_w("mdiss_iso", vs.P_diss_iso)
+    mean_w("mdiss_skew", vs.P_diss_skew)
+    mean_w("mdiss_sources", vs.P_diss_sources)
 
-    mdiss_h = mean_w(vs.K_diss_h)
-    mdiss_v = mean_w(vs.K_diss_v)
-    mdiss_gm = mean_w(vs.K_diss_gm)
-    mdiss_bot = mean_w(vs.K_diss_bot)
+    mean_w("mdiss_h", vs.K_diss_h)
+    mean_w("mdiss_v", vs.K_diss_v)
+    mean_w("mdiss_gm", vs.K_diss_gm)
+    mean_w("mdiss_bot", vs.K_diss_bot)
 
-    wrhom = global_sum(
+    reduction.sum(
+        "wrhom",
         npx.sum(
             -vs.area_t[2:-2, 2:-2, npx.newaxis]
             * vs.maskW[2:-2, 2:-2, :-1]
             * (vs.p_hydro[2:-2, 2:-2, 1:] - vs.p_hydro[2:-2, 2:-2, :-1])
             * vs.w[2:-2, 2:-2, :-1, vs.tau]
-        )
+        ),
     )
 
     # wind work
     if runtime_settings.pyom_compatibility_mode:
         # surface_tau* has different units in PyOM
-        wind = global_sum(
+        reduction.sum(
+            "wind",
             npx.sum(
                 vs.u[2:-2, 2:-2, -1, vs.tau]
                 * vs.surface_taux[2:-2, 2:-2]
@@ -278,10 +287,11 @@ def diagnose_kernel(state):
                 * vs.surface_tauy[2:-2, 2:-2]
                 * vs.maskV[2:-2, 2:-2, -1]
                 * vs.area_v[2:-2, 2:-2]
-            )
+            ),
         )
     else:
-        wind = global_sum(
+        reduction.sum(
+            "wind",
             npx.sum(
                 vs.u[2:-2, 2:-2, -1, vs.tau]
                 * vs.surface_taux[2:-2, 2:-2]
@@ -293,58 +303,90 @@ def diagnose_kernel(state):
                 / settings.rho_0
                 * vs.maskV[2:-2, 2:-2, -1]
                 * vs.area_v[2:-2, 2:-2]
-            )
+            ),
         )
 
     # meso-scale energy
     if settings.enable_eke:
-        eke_m = mean_w(vs.eke[..., vs.tau])
-        deke_m = global_sum(
-            npx.sum(vol_w * (vs.eke[2:-2, 2:-2, :, vs.taup1] - vs.eke[2:-2, 2:-2, :, vs.tau]) / settings.dt_tracer)
+        mean_w("eke_m", vs.eke[..., vs.tau])
+        reduction.sum(
+            "deke_m",
+            npx.sum(vol_w * (vs.eke[2:-2, 2:-2, :, vs.taup1] - vs.eke[2:-2, 2:-2, :, vs.tau]) / settings.dt_tracer),
         )
-        eke_diss = mean_w(vs.eke_diss_iw)
-        eke_diss_tke = mean_w(vs.eke_diss_tke)
-    else:
-        eke_m = deke_m = eke_diss_tke = 0.0
-        eke_diss = mdiss_gm + mdiss_h + mdiss_skew
-        if not settings.enable_store_cabbeling_heat:
-            eke_diss += -mdiss_hmix - mdiss_iso
+        mean_w("eke_diss", vs.eke_diss_iw)
+        mean_w("eke_diss_tke", vs.eke_diss_tke)
 
     # small-scale energy
     if settings.enable_tke:
         dt_tke = settings.dt_mom
-        tke_m = mean_w(vs.tke[..., vs.tau])
-        dtke_m = mean_w((vs.tke[..., vs.taup1] - vs.tke[..., vs.tau]) / dt_tke)
-        tke_diss = mean_w(vs.tke_diss)
-        tke_forc = global_sum(
+        mean_w("tke_m", vs.tke[..., vs.tau])
+        mean_w("dtke_m", (vs.tke[..., vs.taup1] - vs.tke[..., vs.tau]) / dt_tke)
+        mean_w("tke_diss", vs.tke_diss)
+        reduction.sum(
+            "tke_forc",
             npx.sum(
                 vs.area_t[2:-2, 2:-2]
                 * vs.maskW[2:-2, 2:-2, -1]
                 * (vs.forc_tke_surface[2:-2, 2:-2] + vs.tke_surf_corr[2:-2, 2:-2])
-            )
+            ),
         )
-    else:
-        tke_m = dtke_m = tke_diss = tke_forc = 0.0
 
     # internal wave energy
     if settings.enable_idemix:
-        iw_m = mean_w(vs.E_iw[..., vs.tau])
-        diw_m = global_sum(
-            npx.sum(vol_w * (vs.E_iw[2:-2, 2:-2, :, vs.taup1] - vs.E_iw[2:-2, 2:-2, :, vs.tau]) / vs.dt_tracer)
+        mean_w("iw_m", vs.E_iw[..., vs.tau])
+        reduction.sum(
+            "diw_m",
+            npx.sum(vol_w * (vs.E_iw[2:-2, 2:-2, :, vs.taup1] - vs.E_iw[2:-2, 2:-2, :, vs.tau]) / vs.dt_tracer),
         )
-        iw_diss = mean_w(vs.iw_diss)
+        mean_w("iw_diss", vs.iw_diss)
 
         k = npx.maximum(1, vs.kbot[2:-2, 2:-2]) - 1
         mask = k[:, :, npx.newaxis] == npx.arange(settings.nz)[npx.newaxis, npx.newaxis, :]
-        iwforc = global_sum(
+        reduction.sum(
+            "iwforc",
             npx.sum(
                 vs.area_t[2:-2, 2:-2]
                 * (
                     vs.forc_iw_surface[2:-2, 2:-2] * vs.maskW[2:-2, 2:-2, -1]
                     + npx.sum(mask * vs.forc_iw_bottom[2:-2, 2:-2, npx.newaxis] * vs.maskW[2:-2, 2:-2, :], axis=2)
                 )
-            )
+            ),
         )
+
+    res = reduction.resolve()
+
+    dP_m_all = res["dP_m"] + res["dP_vmix"] + res["dP_hmix"] + res["dP_iso"]
+    k_m, p_m, dk_m, wrhom, wind = (res[key] for key in ("k_m", "p_m", "dk_m", "wrhom", "wind"))
+
+    mdiss_vmix, mdiss_nonlin, mdiss_adv, mdiss_hmix, mdiss_iso, mdiss_skew, mdiss_sources = (
+        res[key]
+        for key in (
+            "mdiss_vmix",
+            "mdiss_nonlin",
+            "mdiss_adv",
+            "mdiss_hmix",
+            "mdiss_iso",
+            "mdiss_skew",
+            "mdiss_sources",
+        )
+    )
+    mdiss_h, mdiss_v, mdiss_gm, mdiss_bot = (res[key] for key in ("mdiss_h", "mdiss_v", "mdiss_gm", "mdiss_bot"))
+
+    if settings.enable_eke:
+        eke_m, deke_m, eke_diss, eke_diss_tke = (res[key] for key in ("eke_m", "deke_m", "eke_diss", "eke_diss_tke"))
+    else:
+        eke_m = deke_m = eke_diss_tke = 0.0
+        eke_diss = mdiss_gm + mdiss_h + mdiss_skew
+        if not settings.enable_store_cabbeling_heat:
+            eke_diss += -mdiss_hmix - mdiss_iso
+
+    if settings.enable_tke:
+        tke_m, dtke_m, tke_diss, tke_forc = (res[key] for key in ("tke_m", "dtke_m", "tke_diss", "tke_forc"))
+    else:
+        tke_m = dtke_m = tke_diss = tke_forc = 0.0
+
+    if settings.enable_idemix:
+        iw_m, diw_m, iw_diss, iwforc = (res[key] for key in ("iw_m", "diw_m", "iw_diss", "iwforc"))
     else:
         iw_m = diw_m = iwforc = 0.0
         iw_diss = eke_diss
@@ -3,7 +3,7 @@ from veros import logger
 from veros.variables import Variable
 from veros.core.operators import numpy as npx
 from veros.diagnostics.base import VerosDiagnostic
-from veros.distributed import global_sum
+from veros.distributed import GlobalReduction
 
 
 class TracerMonitor(VerosDiagnostic):
@@ -37,11 +37,15 @@ class TracerMonitor(VerosDiagnostic):
         tracer_vs = self.variables
 
         cell_volume = vs.area_t[2:-2, 2:-2, npx.newaxis] * vs.dzt[npx.newaxis, npx.newaxis, :] * vs.maskT[2:-2, 2:-2, :]
-        volm = global_sum(npx.sum(cell_volume))
-        tempm = global_sum(npx.sum(cell_volume * vs.temp[2:-2, 2:-2, :, vs.tau]))
-        saltm = global_sum(npx.sum(cell_volume * vs.salt[2:-2, 2:-2, :, vs.tau]))
-        vtemp = global_sum(npx.sum(cell_volume * vs.temp[2:-2, 2:-2, :, vs.tau] ** 2))
-        vsalt = global_sum(npx.sum(cell_volume * vs.salt[2:-2, 2:-2, :, vs.tau] ** 2))
+        reduction = GlobalReduction()
+        reduction.sum("volm", npx.sum(cell_volume))
+        reduction.sum("tempm", npx.sum(cell_volume * vs.temp[2:-2, 2:-2, :, vs.tau]))
+        reduction.sum("saltm", npx.sum(cell_volume * vs.salt[2:-2, 2:-2, :, vs.tau]))
+        reduction.sum("vtemp", npx.sum(cell_volume * vs.temp[2:-2, 2:-2, :, vs.tau] ** 2))
+        reduction.sum("vsalt", npx.sum(cell_volume * vs.salt[2:-2, 2:-2, :, vs.tau] ** 2))
+
+        res = reduction.resolve()
+        volm, tempm, saltm, vtemp, vsalt = (res[key] for key in ("volm", "tempm", "saltm", "vtemp", "vsalt"))
 
         logger.diagnostic(
             f" Mean temperature {tempm / volm:.2e} change to last {(tempm - tracer_vs.tempm1) / volm:.2e}"
@@ -1,6 +1,9 @@
+import os
 import functools
+import operator
 
 from veros import runtime_settings as rs, runtime_state as rst
+from veros.profiler import trace_region
 from veros.routines import CURRENT_CONTEXT
 
 SCATTERED_DIMENSIONS = (("xt", "xu"), ("yt", "yu"))
@@ -28,6 +31,7 @@ def dist_context_only(function=None, *, noop_return_arg=None):
     return decorator
 
 
+@trace_region("mpi")
 def send(buf, dest, comm, tag=None):
     kwargs = {}
     if tag is not None:
@@ -43,6 +47,7 @@ def send(buf, dest, comm, tag=None):
         comm.Send(ascontiguousarray(buf), dest=dest, **kwargs)
 
 
+@trace_region("mpi")
 def recv(buf, source, comm, tag=None):
     kwargs = {}
     if tag is not None:
@@ -61,6 +66,7 @@ def recv(buf, source, comm, tag=None):
     return buf
 
 
+@trace_region("mpi")
 def sendrecv(sendbuf, recvbuf, source, dest, comm, sendtag=None, recvtag=None):
     kwargs = {}
 
@@ -83,6 +89,26 @@ def sendrecv(sendbuf, recvbuf, source, dest, comm, sendtag=None, recvtag=None):
     return recvbuf
 
 
+def isend(buf, dest, comm, tag=0):
+    """Non-blocking send of contiguous buf (NumPy only). Returns a request that has to be completed via waitall."""
+    assert rs.backend in ("numpy", "numba")
+    return comm.Isend(buf, dest=dest, tag=tag)
+
+
+def irecv(buf, source, comm, tag=0):
+    """Non-blocking receive into buf (NumPy only). Returns a request that has to be completed via waitall."""
+    assert rs.backend in ("numpy", "numba")
+    return comm.Irecv(buf, source=source, tag=tag)
+
+
+@trace_region("mpi")
+def waitall(requests):
+    from mpi4py import MPI
+
+    MPI.Request.Waitall(requests)
+
+
+@trace_region("mpi")
 def bcast(buf, comm, root=0):
     if rs.backend == "jax":
         from mpi4jax import bcast
@@ -95,6 +121,7 @@ def bcast(buf, comm, root=0):
     return comm.bcast(buf, root=root)
 
 
+@trace_region("mpi")
 def allreduce(buf, op, comm):
     if rs.backend == "jax":
         from mpi4jax import allreduce
@@ -111,15 +138,78 @@ def allreduce(buf, op, comm):
     return recvbuf
 
 
+@trace_region("mpi")
+def gatherv(sendbuf, recvbuf, counts, comm, root=0):
+    """Collects the contiguous sendbuf of every process into recvbuf on the root process (NumPy only).
+
+    counts is the number of elements sent by each process. recvbuf is ignored on all other processes.
+    """
+    assert rs.backend in ("numpy", "numba")
+
+    if comm.Get_rank() == root:
+        comm.Gatherv(sendbuf, [recvbuf, counts], root=root)
+    else:
+        comm.Gatherv(sendbuf, None, root=root)
+
+    return recvbuf
+
+
+@trace_region("mpi")
+def scatterv(sendbuf, recvbuf, counts, comm, root=0):
+    """Sends consecutive parts of sendbuf on the root process to every process (NumPy only).
+
+    counts is the number of elements received by each process. sendbuf is ignored on all other processes.
+    """
+    assert rs.backend in ("numpy", "numba")
+
+    if comm.Get_rank() == root:
+        comm.Scatterv([sendbuf, counts], recvbuf, root=root)
+    else:
+        comm.Scatterv(None, recvbuf, root=root)
+
+    return recvbuf
+
+
 def ascontiguousarray(arr):
-    assert rs.backend == "numpy"
+    assert rs.backend in ("numpy", "numba")
     import numpy
 
     return numpy.ascontiguousarray(arr)
 
 
+def get_decomposition():
+    """Returns the decomposition given by the runtime setting ``decomposition_file``,
+    or None if the domain is split evenly between processes.
+    """
+    if not rs.decomposition_file:
+        return None
+
+    return _read_decomposition(os.path.abspath(rs.decomposition_file))
+
+
+@functools.lru_cache(maxsize=None)
+def _read_decomposition(path):
+    from veros.decomposition import Decomposition
+
+    return Decomposition.from_file(path)
+
+
 def validate_decomposition(dimensions):
     nx, ny = dimensions["xt"], dimensions["yt"]
+    decomposition = get_decomposition()
+
+    if decomposition is not None:
+        if decomposition.num_proc != tuple(rs.num_proc):
+            raise ValueError(
+                f"decomposition file is for {decomposition.num_proc[0]}x{decomposition.num_proc[1]} tiles, "
+                f"but num_proc is {rs.num_proc[0]}x{rs.num_proc[1]}"
+            )
+
+        if decomposition.shape != (nx, ny):
+            raise ValueError(
+                f"decomposition file is for a grid of {decomposition.shape[0]}x{decomposition.shape[1]} cells, "
+                f"but setup has {nx}x{ny}"
+            )
 
     if rs.mpi_comm is None:
         if rs.num_proc[0] > 1 or rs.num_proc[1] > 1:
@@ -127,29 +217,93 @@ def validate_decomposition(dimensions):
         return
 
     comm_size = rs.mpi_comm.Get_size()
-    proc_num = rs.num_proc[0] * rs.num_proc[1]
+
+    if decomposition is not None:
+        proc_num = decomposition.num_active
+    else:
+        proc_num = rs.num_proc[0] * rs.num_proc[1]
+
     if proc_num != comm_size:
         raise RuntimeError(f"number of processes ({proc_num}) does not match size of communicator ({comm_size})")
 
-    if nx % rs.num_proc[0]:
-        raise ValueError("processes do not divide domain evenly in x-direction")
+    # every chunk has to be at least as wide as the overlap
+    if nx < 2 * rs.num_proc[0]:
+        raise ValueError("too many processes in x-direction (every process needs at least 2 grid cells)")
 
-    if ny % rs.num_proc[1]:
-        raise ValueError("processes do not divide domain evenly in y-direction")
+    if ny < 2 * rs.num_proc[1]:
+        raise ValueError("too many processes in y-direction (every process needs at least 2 grid cells)")
 
 
-def get_chunk_size(nx, ny):
-    return (nx // rs.num_proc[0], ny // rs.num_proc[1])
+def get_chunk_bounds(n, axis, proc_index):
+    """Returns start index and size of the chunk with given index along an axis (0: x, 1: y) with n grid cells.
+
+    If the processes do not divide the axis evenly, the first n % num_proc processes get one more cell
+    (unless a decomposition file is used, which defines all chunk sizes).
+    """
+    decomposition = get_decomposition()
+
+    if decomposition is not None:
+        return decomposition.get_bounds(axis, proc_index)
+
+    chunk_size, remainder = divmod(n, rs.num_proc[axis])
+    start = proc_index * chunk_size + min(proc_index, remainder)
+    return start, chunk_size + int(proc_index < remainder)
+
+
+def get_chunk_size(nx, ny, proc_idx=None):
+    if proc_idx is None:
+        proc_idx = proc_rank_to_index(rst.proc_rank)
+
+    return (get_chunk_bounds(nx, 0, proc_idx[0])[1], get_chunk_bounds(ny, 1, proc_idx[1])[1])
 
 
 def proc_rank_to_index(rank):
+    decomposition = get_decomposition()
+
+    if decomposition is not None:
+        return decomposition.rank_to_tile(rank)
+
     return (rank % rs.num_proc[0], rank // rs.num_proc[0])
 
 
 def proc_index_to_rank(ix, iy):
+    """Returns the rank of the process with given index, or None if no process computes this part of the domain"""
+    decomposition = get_decomposition()
+
+    if decomposition is not None:
+        return decomposition.tile_to_rank(ix, iy)
+
     return ix + iy * rs.num_proc[0]
 
 
+def _has_process(ix, iy):
+    """Whether there is a process with given index (ignoring periodic boundaries)"""
+    if not (0 <= ix < rs.num_proc[0] and 0 <= iy < rs.num_proc[1]):
+        return False
+
+    return proc_index_to_rank(ix, iy) is not None
+
+
+def _is_first_along(proc_idx, dim):
+    """Whether the process with given index is the first one along the other dimension (which holds 1D arrays
+    along dim during gather)
+    """
+    decomposition = get_decomposition()
+    otherdim = 1 - dim
+
+    if decomposition is None:
+        return proc_idx[otherdim] == 0
+
+    for i in range(rs.num_proc[otherdim]):
+        other_idx = list(proc_idx)
+        other_idx[otherdim] = i
+
+        if decomposition.tile_to_rank(*other_idx) is not None:
+            return i == proc_idx[otherdim]
+
+    return False
+
+
 def get_chunk_slices(nx, ny, dim_grid, proc_idx=None, include_overlap=False):
     if not dim_grid:
         return Ellipsis, Ellipsis
@@ -158,13 +312,15 @@ def get_chunk_slices(nx, ny, dim_grid, proc_idx=None, include_overlap=False):
         proc_idx = proc_rank_to_index(rst.proc_rank)
 
     px, py = proc_idx
-    nxl, nyl = get_chunk_size(nx, ny)
+    x_start, nxl = get_chunk_bounds(nx, 0, px)
+    y_start, nyl = get_chunk_bounds(ny, 1, py)
 
     if include_overlap:
-        sxl = 0 if px == 0 else 2
-        sxu = nxl + 4 if (px + 1) == rs.num_proc[0] else nxl + 2
-        syl = 0 if py == 0 else 2
-        syu = nyl + 4 if (py + 1) == rs.num_proc[1] else nyl + 2
+        # the overlap is only included where it is not received from a neighboring process
+        sxl = 2 if _has_process(px - 1, py) else 0
+        sxu = nxl + 2 if _has_process(px + 1, py) else nxl + 4
+        syl = 2 if _has_process(px, py - 1) else 0
+        syu = nyl + 2 if _has_process(px, py + 1) else nyl + 4
     else:
         sxl = syl = 0
         sxu = nxl
@@ -174,10 +330,10 @@ def get_chunk_slices(nx, ny, dim_grid, proc_idx=None, include_overlap=False):
 
     for dim in dim_grid:
         if dim in SCATTERED_DIMENSIONS[0]:
-            global_slice.append(slice(sxl + px * nxl, sxu + px * nxl))
+            global_slice.append(slice(sxl + x_start, sxu + x_start))
             local_slice.append(slice(sxl, sxu))
         elif dim in SCATTERED_DIMENSIONS[1]:
-            global_slice.append(slice(syl + py * nyl, syu + py * nyl))
+            global_slice.append(slice(syl + y_start, syu + y_start))
             local_slice.append(slice(syl, syu))
         else:
             global_slice.append(slice(None))
@@ -225,10 +381,12 @@ def get_process_neighbors(cyclic=False):
     return global_neighbors
 
 
-@dist_context_only(noop_return_arg=0)
-def exchange_overlap(arr, var_grid, cyclic):
-    from veros.core.operators import numpy as npx, update, at
+def _get_exchange_plan(var_grid, cyclic):
+    """Returns a list of (send_proc, recv_proc, send_idx, recv_idx, is_corner) for every exchanged direction,
+    or None if there is nothing to exchange.
 
+    Data sent in one direction is received by the neighbor in the same position of the list.
+    """
     # start west, go clockwise
     send_order = (
         "west",
@@ -260,7 +418,7 @@ def exchange_overlap(arr, var_grid, cyclic):
 
     if d1 not in SCATTERED_DIMENSIONS[0] and d1 not in SCATTERED_DIMENSIONS[1] and d2 not in SCATTERED_DIMENSIONS[1]:
         # neither x nor y dependent, nothing to do
-        return arr
+        return None
 
     proc_neighbors = get_process_neighbors(cyclic)
 
@@ -311,29 +469,241 @@ def exchange_overlap(arr, var_grid, cyclic):
             north=(slice(-2, None), Ellipsis),
         )
 
+    plan = []
     for send_dir, recv_dir in zip(send_order, recv_order):
         send_proc = proc_neighbors[send_dir]
         recv_proc = proc_neighbors[recv_dir]
+        is_corner = recv_dir not in ("west", "east", "south", "north")
+        plan.append((send_proc, recv_proc, overlap_slices_from[send_dir], overlap_slices_to[recv_dir], is_corner))
+
+    return plan
+
+
+@dist_context_only(noop_return_arg=0)
+@trace_region("communication")
+def exchange_overlap(arr, var_grid, cyclic):
+    """Updates the overlap (halo) of given array with the values of neighboring processes.
+
+    With NumPy, all messages are sent and received at once (non-blocking). mpi4jax does not support
+    non-blocking communication, so with JAX the directions are processed one after another.
+    """
+    plan = _get_exchange_plan(var_grid, cyclic)
+
+    if plan is None:
+        return arr
+
+    return _exchange_overlap_packed([arr], plan)[0]
+
+
+@dist_context_only(noop_return_arg=0)
+@trace_region("communication")
+def exchange_overlap_many(arrs, var_grid, cyclic):
+    """Like exchange_overlap, but for several arrays on the same grid.
+
+    The overlaps of all arrays are packed into a single message per neighbor (one per data type),
+    so the number of messages does not depend on the number of arrays. Returns a list of arrays.
+    """
+    arrs = list(arrs)
+    plan = _get_exchange_plan(var_grid, cyclic)
+
+    if plan is None:
+        return arrs
+
+    for group in _group_by_dtype(arrs):
+        exchanged = _exchange_overlap_packed([arrs[i] for i in group], plan)
+        for i, arr in zip(group, exchanged):
+            arrs[i] = arr
+
+    return arrs
+
+
+class HaloExchange:
+    """A halo exchange in progress, as returned by :func:`start_exchange_overlap`."""
+
+    __slots__ = ("arrs", "pending")
+
+    def __init__(self, arrs):
+        self.arrs = list(arrs)
+        # (indices of arrays, exchange plan, posted messages or None)
+        self.pending = []
+
+
+@trace_region("communication")
+def start_exchange_overlap(arrs, var_grid, cyclic):
+    """Starts updating the overlaps of given arrays and returns a handle for :func:`finish_exchange_overlap`.
+
+    Computations that do not depend on the overlaps can be done in the meantime, so communication
+    is overlapped with computation. The arrays must not be modified until the exchange is finished.
+
+    With JAX, the exchange happens in :func:`finish_exchange_overlap`, since mpi4jax does not support
+    non-blocking communication.
+    """
+    exchange = HaloExchange(arrs)
+
+    if rst.proc_num == 1 or not CURRENT_CONTEXT.is_dist_safe:
+        return exchange
+
+    plan = _get_exchange_plan(var_grid, cyclic)
+
+    if plan is None:
+        return exchange
+
+    for group_num, group in enumerate(_group_by_dtype(exchange.arrs)):
+        if rs.backend == "jax":
+            messages = None
+        else:
+            # every group needs its own tags, since all of them are in flight at the same time
+            messages = _post_exchange([exchange.arrs[i] for i in group], plan, tag_offset=group_num * len(plan))
+
+        exchange.pending.append((group, plan, messages))
+
+    return exchange
+
+
+@trace_region("communication")
+def finish_exchange_overlap(exchange):
+    """Waits for a halo exchange started with :func:`start_exchange_overlap` and returns a list of the updated arrays."""
+    arrs = exchange.arrs
+
+    for group, plan, messages in exchange.pending:
+        group_arrs = [arrs[i] for i in group]
+
+        if messages is None:
+            exchanged = _exchange_overlap_blocking(group_arrs, plan)
+        else:
+            exchanged = _complete_exchange(group_arrs, messages)
+
+        for i, arr in zip(group, exchanged):
+            arrs[i] = arr
+
+    exchange.arrs = exchange.pending = None
+    return arrs
+
+
+def _group_by_dtype(arrs):
+    """Indices of given arrays, grouped by data type (arrays in one message must have the same type)"""
+    groups = {}
+    for i, arr in enumerate(arrs):
+        groups.setdefault(arr.dtype, []).append(i)
+
+    return list(groups.values())
+
+
+def _get_slice_shape(shape, idx):
+    """Shape of arr[idx] without slicing, for an index of slices followed by Ellipsis"""
+    sliced_shape = []
+
+    for n, dim_slice in zip(shape, idx):
+        if dim_slice is Ellipsis:
+            break
+
+        sliced_shape.append(len(range(*dim_slice.indices(n))))
+
+    return (*sliced_shape, *shape[len(sliced_shape) :])
+
+
+def _get_buffer_size(arrs, idx):
+    return sum(functools.reduce(operator.mul, _get_slice_shape(arr.shape, idx), 1) for arr in arrs)
+
+
+def _pack(arrs, idx):
+    from veros.core.operators import numpy as npx
+
+    if len(arrs) == 1:
+        return arrs[0][idx].reshape(-1)
+
+    return npx.concatenate([arr[idx].reshape(-1) for arr in arrs])
+
+
+def _unpack(arrs, idx, buf):
+    from veros.core.operators import update, at
+
+    if len(arrs) == 1:
+        return [update(arrs[0], at[idx], buf.reshape(_get_slice_shape(arrs[0].shape, idx)))]
+
+    out = []
+    offset = 0
+    for arr in arrs:
+        shape = _get_slice_shape(arr.shape, idx)
+        size = functools.reduce(operator.mul, shape, 1)
+        out.append(update(arr, at[idx], buf[offset : offset + size].reshape(shape)))
+        offset += size
+
+    return out
+
+
+def _exchange_overlap_packed(arrs, plan):
+    if rs.backend == "jax":
+        return _exchange_overlap_blocking(arrs, plan)
 
+    return _exchange_overlap_nonblocking(arrs, plan)
+
+
+def _exchange_overlap_blocking(arrs, plan):
+    from veros.core.operators import numpy as npx
+
+    for send_proc, recv_proc, send_idx, recv_idx, _ in plan:
         if send_proc is None and recv_proc is None:
             continue
 
-        recv_idx = overlap_slices_to[recv_dir]
-        recv_arr = npx.empty_like(arr[recv_idx])
-
-        send_idx = overlap_slices_from[send_dir]
-        send_arr = arr[send_idx]
+        recv_buf = npx.empty(_get_buffer_size(arrs, recv_idx), dtype=arrs[0].dtype)
+        send_buf = _pack(arrs, send_idx)
 
         if send_proc is None:
-            recv_arr = recv(recv_arr, recv_proc, rs.mpi_comm)
-            arr = update(arr, at[recv_idx], recv_arr)
+            recv_buf = recv(recv_buf, recv_proc, rs.mpi_comm)
+            arrs = _unpack(arrs, recv_idx, recv_buf)
         elif recv_proc is None:
-            send(send_arr, send_proc, rs.mpi_comm)
+            send(send_buf, send_proc, rs.mpi_comm)
         else:
-            recv_arr = sendrecv(send_arr, recv_arr, source=recv_proc, dest=send_proc, comm=rs.mpi_comm)
-            arr = update(arr, at[recv_idx], recv_arr)
+            recv_buf = sendrecv(send_buf, recv_buf, source=recv_proc, dest=send_proc, comm=rs.mpi_comm)
+            arrs = _unpack(arrs, recv_idx, recv_buf)
 
-    return arr
+    return arrs
+
+
+def _exchange_overlap_nonblocking(arrs, plan):
+    return _complete_exchange(arrs, _post_exchange(arrs, plan))
+
+
+def _post_exchange(arrs, plan, tag_offset=0):
+    from veros.core.operators import numpy as npx
+
+    requests = []
+    received = []
+    # send buffers have to stay alive until all requests are completed
+    sent = []
+
+    # post all receives first, so incoming messages do not have to be buffered
+    for tag, (_, recv_proc, _, recv_idx, is_corner) in enumerate(plan, tag_offset):
+        if recv_proc is None:
+            continue
+
+        recv_buf = npx.empty(_get_buffer_size(arrs, recv_idx), dtype=arrs[0].dtype)
+        requests.append(irecv(recv_buf, recv_proc, rs.mpi_comm, tag=tag))
+        received.append((is_corner, recv_idx, recv_buf))
+
+    # the direction is used as tag, since the same process may be a neighbor in several directions
+    for tag, (send_proc, _, send_idx, _, _) in enumerate(plan, tag_offset):
+        if send_proc is None:
+            continue
+
+        send_buf = ascontiguousarray(_pack(arrs, send_idx))
+        requests.append(isend(send_buf, send_proc, rs.mpi_comm, tag=tag))
+        sent.append(send_buf)
+
+    return requests, received, sent
+
+
+def _complete_exchange(arrs, messages):
+    requests, received, _ = messages
+    waitall(requests)
+
+    # edges contain the corners of the sender's overlap, which are outdated since all messages
+    # are sent at once - so corners have to be written last
+    for _, recv_idx, recv_buf in sorted(received, key=lambda msg: msg[0]):
+        arrs = _unpack(arrs, recv_idx, recv_buf)
+
+    return arrs
 
 
 def _memoize(function):
@@ -420,79 +790,239 @@ def global_sum(arr, axis=None):
     return _reduce(arr, MPI.SUM, axis=axis)
 
 
-@dist_context_only(noop_return_arg=2)
-def _gather_1d(nx, ny, arr, dim):
+class GlobalReduction:
+    """Collects several global reductions, and computes them with a single allreduce per operation.
+
+    Values can be scalars or arrays, which are reduced element-wise.
+
+    Example:
+
+        >>> reduction = GlobalReduction()
+        >>> reduction.sum("volume", npx.sum(cell_volume))
+        >>> reduction.max("cfl", npx.max(cfl))
+        >>> res = reduction.resolve()
+        >>> res["volume"], res["cfl"]
+
+    """
+
+    def __init__(self):
+        # name -> (operation, value)
+        self._entries = {}
+
+    def _add(self, op, name, value):
+        if name in self._entries:
+            raise ValueError(f"reduction {name} is already defined")
+
+        self._entries[name] = (op, value)
+
+    def sum(self, name, value):
+        self._add("sum", name, value)
+
+    def max(self, name, value):
+        self._add("max", name, value)
+
+    def min(self, name, value):
+        self._add("min", name, value)
+
+    def all(self, name, value):
+        self._add("and", name, value)
+
+    def any(self, name, value):
+        self._add("or", name, value)
+
+    def resolve(self):
+        """Computes all collected reductions, and returns a dict of their results"""
+        entries, self._entries = self._entries, {}
+
+        if rst.proc_num == 1 or not CURRENT_CONTEXT.is_dist_safe:
+            return {name: value for name, (_, value) in entries.items()}
+
+        from mpi4py import MPI
+        from veros.core.operators import numpy as npx
+
+        mpi_ops = {"sum": MPI.SUM, "max": MPI.MAX, "min": MPI.MIN, "and": MPI.LAND, "or": MPI.LOR}
+
+        values_by_op = {}
+        for name, (op, value) in entries.items():
+            values_by_op.setdefault(op, []).append((name, npx.asarray(value)))
+
+        results = {}
+        for op, values in values_by_op.items():
+            packed = npx.concatenate([value.reshape(-1) for _, value in values])
+            reduced = allreduce(packed, op=mpi_ops[op], comm=rs.mpi_comm)
+
+            offset = 0
+            for name, value in values:
+                if value.ndim == 0:
+                    res = reduced[offset]
+                else:
+                    res = reduced[offset : offset + value.size].reshape(value.shape)
+
+                results[name] = res.astype(value.dtype)
+                offset += value.size
+
+        return {name: results[name] for name in entries}
+
+
+def _get_global_chunk_slices(nx, ny, dim_grid, participates=None):
+    """Returns the global index of the chunk (with overlap) of every process, ordered by rank.
+
+    Processes for which participates(proc_idx) is false get None instead.
+    """
+    chunk_slices = []
+
+    for proc in range(rst.proc_num):
+        proc_idx = proc_rank_to_index(proc)
+
+        if participates is not None and not participates(proc_idx):
+            chunk_slices.append(None)
+            continue
+
+        global_slice, _ = get_chunk_slices(nx, ny, dim_grid, include_overlap=True, proc_idx=proc_idx)
+        chunk_slices.append(global_slice)
+
+    return chunk_slices
+
+
+def _gather_chunks(sendbuf, chunk_slices, out_shape, tag):
+    """Assembles the chunks of all processes into an array of shape out_shape on the main process.
+
+    Parts of the output that are not covered by any chunk are 0. Returns None on all other processes.
+    """
     from veros.core.operators import numpy as npx, update, at
 
-    assert dim in (0, 1)
+    dtype = sendbuf.dtype
+    chunk_shapes = [None if idx is None else _get_slice_shape(out_shape, idx) for idx in chunk_slices]
 
-    otherdim = 1 - dim
-    pi = proc_rank_to_index(rst.proc_rank)
-    if pi[otherdim] != 0:
-        return arr
+    if rs.backend == "jax":
+        # mpi4jax has no collectives for chunks of different size
+        if rst.proc_rank != 0:
+            if chunk_slices[rst.proc_rank] is not None:
+                send(sendbuf, dest=0, tag=tag, comm=rs.mpi_comm)
+            return None
 
-    dim_grid = ["xt" if dim == 0 else "yt"] + [None] * (arr.ndim - 1)
-    gidx, idx = get_chunk_slices(nx, ny, dim_grid, include_overlap=True)
-    sendbuf = arr[idx]
+        out = npx.zeros(out_shape, dtype=dtype)
 
-    if rst.proc_rank == 0:
-        buffer_list = []
-        for proc in range(1, rst.proc_num):
-            pi = proc_rank_to_index(proc)
-            if pi[otherdim] != 0:
+        for proc, (idx, shape) in enumerate(zip(chunk_slices, chunk_shapes)):
+            if idx is None:
                 continue
-            idx_g, idx_l = get_chunk_slices(nx, ny, dim_grid, include_overlap=True, proc_idx=pi)
-            recvbuf = npx.empty_like(arr[idx_l])
-            recvbuf = recv(recvbuf, source=proc, tag=20, comm=rs.mpi_comm)
-            buffer_list.append((idx_g, recvbuf))
 
-        out_shape = ((nx + 4, ny + 4)[dim],) + arr.shape[1:]
-        out = npx.empty(out_shape, dtype=arr.dtype)
-        out = update(out, at[gidx], sendbuf)
+            if proc == 0:
+                chunk = sendbuf
+            else:
+                chunk = recv(npx.empty(shape, dtype=dtype), source=proc, tag=tag, comm=rs.mpi_comm)
 
-        for idx, val in buffer_list:
-            out = update(out, at[idx], val)
+            out = update(out, at[idx], chunk)
 
         return out
 
+    import numpy
+
+    counts = [0 if shape is None else functools.reduce(operator.mul, shape, 1) for shape in chunk_shapes]
+
+    if chunk_slices[rst.proc_rank] is None:
+        sendbuf = numpy.empty(0, dtype=dtype)
     else:
-        send(sendbuf, dest=0, tag=20, comm=rs.mpi_comm)
-        return arr
+        sendbuf = ascontiguousarray(sendbuf)
+
+    if rst.proc_rank != 0:
+        gatherv(sendbuf, None, counts, comm=rs.mpi_comm)
+        return None
+
+    recvbuf = gatherv(sendbuf, numpy.empty(sum(counts), dtype=dtype), counts, comm=rs.mpi_comm)
+
+    out = numpy.zeros(out_shape, dtype=dtype)
+    offset = 0
+
+    for idx, shape, count in zip(chunk_slices, chunk_shapes, counts):
+        if idx is None:
+            continue
+
+        out[idx] = recvbuf[offset : offset + count].reshape(shape)
+        offset += count
+
+    return out
+
+
+def _scatter_chunks(arr, chunk_slices, local_shape, tag):
+    """Sends the chunk arr[chunk_slices[proc]] of the global array on the main process to every process.
+
+    Returns the chunk of this process, which has shape local_shape.
+    """
+    from veros.core.operators import numpy as npx
+
+    if rs.backend == "jax":
+        # mpi4jax has no collectives for chunks of different size
+        if rst.proc_rank != 0:
+            return recv(npx.empty(local_shape, dtype=arr.dtype), source=0, tag=tag, comm=rs.mpi_comm)
+
+        for proc, idx in enumerate(chunk_slices[1:], 1):
+            send(arr[idx], dest=proc, tag=tag, comm=rs.mpi_comm)
+
+        return arr[chunk_slices[0]]
+
+    import numpy
+
+    recvbuf = numpy.empty(local_shape, dtype=arr.dtype)
+
+    if rst.proc_rank != 0:
+        return scatterv(None, recvbuf, None, comm=rs.mpi_comm)
+
+    chunk_shapes = [_get_slice_shape(arr.shape, idx) for idx in chunk_slices]
+    counts = [functools.reduce(operator.mul, shape, 1) for shape in chunk_shapes]
+
+    # pack all chunks into a single send buffer, in order of rank
+    sendbuf = numpy.empty(sum(counts), dtype=arr.dtype)
+    offset = 0
+
+    for idx, shape, count in zip(chunk_slices, chunk_shapes, counts):
+        sendbuf[offset : offset + count].reshape(shape)[...] = arr[idx]
+        offset += count
+
+    return scatterv(sendbuf, recvbuf, counts, comm=rs.mpi_comm)
 
 
 @dist_context_only(noop_return_arg=2)
-def _gather_xy(nx, ny, arr):
-    from veros.core.operators import numpy as npx, update, at
+def _gather_1d(nx, ny, arr, dim):
+    assert dim in (0, 1)
 
-    nxi, nyi = get_chunk_size(nx, ny)
-    assert arr.shape[:2] == (nxi + 4, nyi + 4), arr.shape
+    dim_grid = ["xt" if dim == 0 else "yt"] + [None] * (arr.ndim - 1)
+    _, idx = get_chunk_slices(nx, ny, dim_grid, include_overlap=True)
 
-    dim_grid = ["xt", "yt"] + [None] * (arr.ndim - 2)
-    gidx, idx = get_chunk_slices(nx, ny, dim_grid, include_overlap=True)
-    sendbuf = arr[idx]
+    # only processes along one boundary take part, since all others hold the same data
+    chunk_slices = _get_global_chunk_slices(
+        nx, ny, dim_grid, participates=lambda proc_idx: _is_first_along(proc_idx, dim)
+    )
+    out_shape = ((nx + 4, ny + 4)[dim],) + arr.shape[1:]
+    out = _gather_chunks(arr[idx], chunk_slices, out_shape, tag=20)
 
     if rst.proc_rank == 0:
-        buffer_list = []
-        for proc in range(1, rst.proc_num):
-            idx_g, idx_l = get_chunk_slices(nx, ny, dim_grid, include_overlap=True, proc_idx=proc_rank_to_index(proc))
-            recvbuf = npx.empty_like(arr[idx_l])
-            recvbuf = recv(recvbuf, source=proc, tag=30, comm=rs.mpi_comm)
-            buffer_list.append((idx_g, recvbuf))
+        return out
+
+    return arr
+
+
+@dist_context_only(noop_return_arg=2)
+def _gather_xy(nx, ny, arr):
+    nxi, nyi = get_chunk_size(nx, ny)
+    assert arr.shape[:2] == (nxi + 4, nyi + 4), arr.shape
 
-        out_shape = (nx + 4, ny + 4) + arr.shape[2:]
-        out = npx.empty(out_shape, dtype=arr.dtype)
-        out = update(out, at[gidx], sendbuf)
+    dim_grid = ["xt", "yt"] + [None] * (arr.ndim - 2)
+    _, idx = get_chunk_slices(nx, ny, dim_grid, include_overlap=True)
 
-        for idx, val in buffer_list:
-            out = update(out, at[idx], val)
+    chunk_slices = _get_global_chunk_slices(nx, ny, dim_grid)
+    out_shape = (nx + 4, ny + 4) + arr.shape[2:]
+    # parts of the domain without a process (only land) are filled with zeros
+    out = _gather_chunks(arr[idx], chunk_slices, out_shape, tag=30)
 
+    if rst.proc_rank == 0:
         return out
 
-    send(sendbuf, dest=0, tag=30, comm=rs.mpi_comm)
     return arr
 
 
 @dist_context_only(noop_return_arg=0)
+@trace_region("communication")
 def gather(arr, dimensions, var_grid):
     nx, ny = dimensions["xt"], dimensions["yt"]
 
@@ -539,20 +1069,13 @@ def _scatter_1d(nx, ny, arr, dim):
     dim_grid = ["xt" if dim == 0 else "yt"] + [None] * (arr.ndim - 1)
     _, local_slice = get_chunk_slices(nx, ny, dim_grid, include_overlap=True)
 
-    if rst.proc_rank == 0:
-        recvbuf = arr[local_slice]
-
-        for proc in range(1, rst.proc_num):
-            global_slice, _ = get_chunk_slices(
-                nx, ny, dim_grid, include_overlap=True, proc_idx=proc_rank_to_index(proc)
-            )
-            sendbuf = arr[global_slice]
-            send(sendbuf, dest=proc, tag=40, comm=rs.mpi_comm)
+    chunk_slices = _get_global_chunk_slices(nx, ny, dim_grid)
+    global_shape = ((nx + 4, ny + 4)[dim],) + arr.shape[1:]
+    recvbuf = _scatter_chunks(arr, chunk_slices, _get_slice_shape(global_shape, chunk_slices[rst.proc_rank]), tag=40)
 
+    if rst.proc_rank == 0:
         # arr changes shape in main process
         arr = npx.zeros((out_nx + 4,) + arr.shape[1:], dtype=arr.dtype)
-    else:
-        recvbuf = recv(arr[local_slice], source=0, tag=40, comm=rs.mpi_comm)
 
     arr = update(arr, at[local_slice], recvbuf)
     arr = exchange_overlap(arr, ["xt" if dim == 0 else "yt"], cyclic=False)
@@ -569,21 +1092,13 @@ def _scatter_xy(nx, ny, arr):
     dim_grid = ["xt", "yt"] + [None] * (arr.ndim - 2)
     _, local_slice = get_chunk_slices(nx, ny, dim_grid, include_overlap=True)
 
-    if rst.proc_rank == 0:
-        recvbuf = arr[local_slice]
-
-        for proc in range(1, rst.proc_num):
-            global_slice, _ = get_chunk_slices(
-                nx, ny, dim_grid, include_overlap=True, proc_idx=proc_rank_to_index(proc)
-            )
-            sendbuf = arr[global_slice]
-            send(sendbuf, dest=proc, tag=50, comm=rs.mpi_comm)
+    chunk_slices = _get_global_chunk_slices(nx, ny, dim_grid)
+    global_shape = (nx + 4, ny + 4) + arr.shape[2:]
+    recvbuf = _scatter_chunks(arr, chunk_slices, _get_slice_shape(global_shape, chunk_slices[rst.proc_rank]), tag=50)
 
+    if rst.proc_rank == 0:
         # arr changes shape in main process
         arr = npx.empty((nxi + 4, nyi + 4) + arr.shape[2:], dtype=arr.dtype)
-    else:
-        recvbuf = npx.empty_like(arr[local_slice])
-        recvbuf = recv(recvbuf, source=0, tag=50, comm=rs.mpi_comm)
 
     arr = update(arr, at[local_slice], recvbuf)
     arr = exchange_overlap(arr, ["xt", "yt"], cyclic=False)
@@ -592,6 +1107,7 @@ def _scatter_xy(nx, ny, arr):
 
 
 @dist_context_only(noop_return_arg=0)
+@trace_region("communication")
 def scatter(arr, dimensions, var_grid):
     from veros.core.operators import numpy as npx
 
@@ -628,6 +1144,7 @@ def scatter(arr, dimensions, var_grid):
 
 
 @dist_context_only
+@trace_region("mpi")
 def barrier():
     rs.mpi_comm.barrier()
 
@@ -108,8 +108,11 @@ def initialize_variable(state, key, var, ncfile):
     if rs.hdf5_gzip_compression and runtime_state.proc_num == 1:
         kwargs.update(compression="gzip", compression_opts=1)
 
+    # all processes use the chunk of process (0, 0), so the chunk shape is the same everywhere
     chunksize = [
-        variables.get_shape(state.dimensions, (d,), local=True, include_ghosts=False)[0] if d in state.dimensions else 1
+        variables.get_shape(state.dimensions, (d,), local=True, include_ghosts=False, proc_idx=(0, 0))[0]
+        if d in state.dimensions
+        else 1
         for d in dims
     ]
 
@@ -0,0 +1,155 @@
+"""Machine-readable per-step performance log.
+
+Every time step (or fused batch of time steps) is written as one record that contains the wall time
+of the whole step and its components, the throughput in simulated years per day (SYPD), and the
+memory use of the process. Records are written as JSON lines, or as CSV if the file name ends
+in ``.csv``.
+"""
+
+import os
+import sys
+import csv
+import json
+from time import perf_counter
+
+from veros import logger, time, runtime_settings as rs, runtime_state as rst
+from veros.timer import timer_context
+
+# same components as in the timing summary
+COMPONENTS = (
+    "main",
+    "forcing",
+    "momentum",
+    "pressure",
+    "friction",
+    "thermodynamics",
+    "advection",
+    "eke",
+    "idemix",
+    "tke",
+    "boundary_exchange",
+    "diagnostics",
+    "plugins",
+)
+
+FIELDS = (
+    "iteration",
+    "model_time",
+    "num_steps",
+    "wall_time",
+    "sypd",
+    *(f"{component}_time" for component in COMPONENTS),
+    "rss_bytes",
+    "peak_rss_bytes",
+    "device_bytes_in_use",
+)
+
+
+def get_memory_usage():
+    """Returns current and peak resident set size of this process in bytes (None if not available)."""
+    rss = peak_rss = None
+
+    try:
+        with open("/proc/self/statm") as f:
+            rss = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+
+    try:
+        import resource
+    except ImportError:
+        pass
+    else:
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform != "darwin":
+            # kilobytes on Linux, bytes on macOS
+            peak_rss *= 1024
+
+        if rss is not None:
+            # peak value may lag behind
+            peak_rss = max(peak_rss, rss)
+
+    return rss, peak_rss
+
+
+def get_device_memory_usage():
+    """Returns bytes in use on the current JAX device (None if not available)."""
+    from veros.profiler import _get_device_memory
+
+    if rs.backend != "jax":
+        return None
+
+    device_memory = _get_device_memory()
+
+    if device_memory is None:
+        return None
+
+    return device_memory[0]
+
+
+def get_log_path(path):
+    """Every process writes its own log; the rank is inserted before the file extension."""
+    if rst.proc_num == 1:
+        return path
+
+    root, ext = os.path.splitext(path)
+    return f"{root}.rank{rst.proc_rank}{ext}"
+
+
+class PerformanceLog:
+    """Writes one record per time step to given file.
+
+    Like the timing summary, the first step of a run is not logged, since it includes compilation.
+    """
+
+    def __init__(self, path, timers):
+        self.path = get_log_path(path)
+        self.timers = timers
+        self.use_csv = self.path.endswith(".csv")
+
+        self._file = open(self.path, "w", buffering=1)
+
+        if self.use_csv:
+            self._writer = csv.DictWriter(self._file, FIELDS)
+            self._writer.writeheader()
+
+        self._step_start = None
+        self._start_times = None
+
+        logger.info(f"Writing performance log to {os.path.abspath(self.path)}")
+
+    def begin_step(self):
+        self._start_times = {component: self.timers[component].total_time for component in COMPONENTS}
+        self._step_start = perf_counter()
+
+    def end_step(self, iteration, model_time, num_steps, dt_tracer):
+        wall_time = perf_counter() - self._step_start
+
+        if not timer_context.active:
+            return
+
+        model_years = time.convert_time(num_steps * dt_tracer, "seconds", "years")
+        wall_days = time.convert_time(wall_time, "seconds", "days")
+        rss, peak_rss = get_memory_usage()
+
+        record = dict(
+            iteration=int(iteration),
+            model_time=float(model_time),
+            num_steps=num_steps,
+            wall_time=wall_time,
+            sypd=model_years / max(wall_days, 1e-12),
+            rss_bytes=rss,
+            peak_rss_bytes=peak_rss,
+            device_bytes_in_use=get_device_memory_usage(),
+        )
+
+        for component in COMPONENTS:
+            record[f"{component}_time"] = self.timers[component].total_time - self._start_times[component]
+
+        if self.use_csv:
+            self._writer.writerow(record)
+        else:
+            self._file.write(json.dumps(record) + "\n")
+
+    def close(self):
+        self._file.close()
@@ -0,0 +1,380 @@
+"""Profiling helpers used in profile mode.
+
+Contains a hierarchical profiler that records routines, kernels, and MPI calls as Chrome trace events
+(which can be viewed in https://ui.perfetto.dev or chrome://tracing, with each MPI rank shown as a
+separate process), a memory profiler that records the memory high-water mark of every routine and kernel,
+and a sampler that restricts profiling to every Nth time step.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+import timeit
+from collections import defaultdict
+
+from veros import logger, runtime_settings as rs, runtime_state as rst
+
+
+class TraceProfiler:
+    """Records complete events (begin, duration) in Chrome trace event format.
+
+    Events are stored in memory until :meth:`write` is called.
+    """
+
+    def __init__(self):
+        self.events = []
+        self.iteration = None
+        # wall clock time is used as offset, so timestamps are comparable between processes
+        self._wall_time_offset = time.time() - timeit.default_timer()
+
+    def now(self):
+        """Current timestamp in microseconds"""
+        return (timeit.default_timer() + self._wall_time_offset) * 1e6
+
+    def add_event(self, name, category, start_time, end_time=None):
+        if end_time is None:
+            end_time = self.now()
+
+        event = dict(
+            name=name,
+            cat=category,
+            ph="X",
+            ts=start_time,
+            dur=end_time - start_time,
+            pid=rst.proc_rank,
+            tid=threading.get_ident(),
+        )
+
+        if self.iteration is not None:
+            event.update(args=dict(iteration=self.iteration))
+
+        self.events.append(event)
+
+    def region(self, name, category):
+        return _TraceRegion(self, name, category)
+
+    def write(self, outfile):
+        """Collects events from all processes and writes them to a single file (on the first process only)."""
+        events = self.events
+
+        if rst.proc_num > 1:
+            all_events = rs.mpi_comm.gather(events, root=0)
+
+            if rst.proc_rank != 0:
+                return
+
+            events = [event for proc_events in all_events for event in proc_events]
+
+        if not events:
+            return
+
+        # shift timestamps so the trace starts at 0
+        start_time = min(event["ts"] for event in events)
+        trace_events = [dict(event, ts=event["ts"] - start_time) for event in events]
+
+        for proc in range(rst.proc_num):
+            trace_events.append(dict(name="process_name", ph="M", pid=proc, args=dict(name=f"rank {proc}")))
+            trace_events.append(dict(name="process_sort_index", ph="M", pid=proc, args=dict(sort_index=proc)))
+
+        with open(outfile, "w") as f:
+            json.dump(dict(traceEvents=trace_events, displayTimeUnit="ms"), f)
+
+        logger.info(f"Wrote profile trace with {len(events)} events to {os.path.abspath(outfile)}")
+
+
+class _TraceRegion:
+    __slots__ = ("profiler", "name", "category", "start_time")
+
+    def __init__(self, profiler, name, category):
+        self.profiler = profiler
+        self.name = name
+        self.category = category
+
+    def __enter__(self):
+        self.start_time = self.profiler.now()
+
+    def __exit__(self, *args):
+        self.profiler.add_event(self.name, self.category, self.start_time)
+
+
+class ProfileSampler:
+    """Restricts profiling to every Nth time step, so all other steps run at full (asynchronous) speed.
+
+    Profile timers are only accumulated during sampled steps. The time spent in each routine and kernel
+    during every sampled step is recorded, so we can derive statistics over all samples.
+    """
+
+    def __init__(self, interval):
+        if interval < 1:
+            raise ValueError("Profile sample interval must be at least 1")
+
+        self.interval = interval
+        self.active = True
+        self.samples = []
+        self.step_times = []
+        self._num_steps = 0
+        self._step_start_times = None
+        self._step_start = None
+
+    def begin_step(self, profile_timers):
+        from veros.core.operators import flush
+
+        self.active = self._num_steps % self.interval == 0
+        self._num_steps += 1
+
+        if not self.active:
+            return
+
+        # make sure work from previous steps does not end up in this sample
+        flush()
+        self._step_start_times = {name: timer.total_time for name, timer in profile_timers.items()}
+        self._step_start = timeit.default_timer()
+
+    def end_step(self, profile_timers):
+        from veros.core.operators import flush
+        from veros.timer import timer_context
+
+        if self.active and timer_context.active:
+            flush()
+            self.step_times.append(timeit.default_timer() - self._step_start)
+            self.samples.append(
+                {name: timer.total_time - self._step_start_times.get(name, 0) for name, timer in profile_timers.items()}
+            )
+
+        self._step_start_times = self._step_start = None
+        self.active = True
+
+    def get_statistics(self, confidence=0.95):
+        """Returns mean time per sampled step and half width of its confidence interval for every timer."""
+        from scipy import stats
+
+        num_samples = len(self.samples)
+        if num_samples == 0:
+            return {}
+
+        per_timer = defaultdict(lambda: [0.0] * num_samples)
+        for i, sample in enumerate(self.samples):
+            for name, val in sample.items():
+                per_timer[name][i] = val
+
+        if num_samples > 1:
+            t_factor = stats.t.ppf(0.5 + confidence / 2, num_samples - 1) / num_samples**0.5
+        else:
+            t_factor = float("nan")
+
+        statistics = {}
+        for name, vals in per_timer.items():
+            mean = sum(vals) / num_samples
+
+            if num_samples > 1:
+                std = (sum((val - mean) ** 2 for val in vals) / (num_samples - 1)) ** 0.5
+            else:
+                std = float("nan")
+
+            statistics[name] = (mean, t_factor * std)
+
+        return statistics
+
+
+class MemoryProfiler:
+    """Records the memory high-water mark and net memory change of every routine and kernel.
+
+    Memory is measured via tracemalloc for NumPy (which tracks all array allocations), the device memory
+    statistics for JAX, or the resident set size of the process if JAX does not provide them (e.g. on CPU).
+    The high-water mark is given relative to the memory in use when entering the routine. Only
+    tracemalloc can determine it exactly; the other methods only see new peaks of the whole process,
+    and give a lower bound otherwise.
+    """
+
+    def __init__(self):
+        # name -> [number of calls, max. high-water mark, max. net change]
+        self.records = defaultdict(lambda: [0, 0, 0])
+        self._stack = []
+
+        if rs.backend != "jax":
+            self.method = "tracemalloc"
+        elif _get_device_memory() is not None:
+            self.method = "device"
+        else:
+            self.method = "rss"
+
+        if self.method == "tracemalloc":
+            import tracemalloc
+
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+
+            self._get_memory = tracemalloc.get_traced_memory
+            # Python < 3.9 cannot reset peak
+            self._reset_peak = getattr(tracemalloc, "reset_peak", None)
+        elif self.method == "device":
+            self._get_memory = _get_device_memory
+            self._reset_peak = None
+        else:
+            self._get_memory = _get_process_memory
+            self._reset_peak = None
+
+    def enter(self):
+        current, peak = self._get_memory()
+
+        if self._reset_peak is not None:
+            # propagate peak observed so far to parent, since it is reset
+            if self._stack:
+                self._stack[-1][1] = max(self._stack[-1][1], peak)
+
+            self._reset_peak()
+            peak = current
+
+        # [memory at entry, highest memory seen, process peak at entry]
+        self._stack.append([current, current, peak])
+
+    def exit(self, name):
+        current, peak = self._get_memory()
+        entry, highest, entry_peak = self._stack.pop()
+
+        if self._reset_peak is not None:
+            highest = max(highest, peak)
+            self._reset_peak()
+        elif peak > entry_peak:
+            # a new peak of the whole process must have happened in this routine
+            highest = max(highest, peak)
+        else:
+            highest = max(highest, current)
+
+        if self._stack:
+            self._stack[-1][1] = max(self._stack[-1][1], highest)
+
+        record = self.records[name]
+        record[0] += 1
+        record[1] = max(record[1], highest - entry)
+        record[2] = max(record[2], current - entry)
+
+    def summary(self, num_entries=20):
+        """Returns a table of the routines and kernels with the highest memory high-water marks."""
+
+        def format_bytes(val):
+            return f"{val / 1024**2:.1f} MB"
+
+        records = sorted(self.records.items(), key=lambda item: item[1][1], reverse=True)[:num_entries]
+
+        if not records:
+            return ""
+
+        lines = [
+            "",
+            f"Memory profile (via {self.method}, top {len(records)}):",
+            "[max. high-water mark above entry / max. net change / number of calls]",
+            "---",
+        ]
+        maxwidth = max(len(name) for name, _ in records)
+
+        for name, (num_calls, highest, net_change) in records:
+            lines.append(
+                f"{name:<{maxwidth}} = {format_bytes(highest):>10} / {format_bytes(net_change):>10} / {num_calls}"
+            )
+
+        return "\n".join(lines)
+
+
+def _get_device_memory():
+    """Returns (bytes in use, peak bytes in use) on the current JAX device, or None if not available."""
+    import jax
+
+    try:
+        stats = jax.local_devices()[0].memory_stats()
+    except Exception:
+        return None
+
+    if not stats or "bytes_in_use" not in stats:
+        return None
+
+    return stats["bytes_in_use"], stats.get("peak_bytes_in_use", stats["bytes_in_use"])
+
+
+def _get_process_memory():
+    from veros.perflog import get_memory_usage
+
+    rss, peak_rss = get_memory_usage()
+    return rss or 0, peak_rss or 0
+
+
+_TRACE_PROFILER = None
+_PROFILE_SAMPLER = None
+_MEMORY_PROFILER = None
+
+
+def get_profile_sampler():
+    """Returns the profile sampler, or None if profile mode is disabled."""
+    global _PROFILE_SAMPLER
+
+    if not rs.profile_mode:
+        return None
+
+    if _PROFILE_SAMPLER is None:
+        _PROFILE_SAMPLER = ProfileSampler(rs.profile_sample_interval)
+
+    return _PROFILE_SAMPLER
+
+
+def profiling_active():
+    """Whether routines and kernels should be timed right now (profile mode is on and step is sampled)."""
+    if not rs.profile_mode:
+        return False
+
+    return _PROFILE_SAMPLER is None or _PROFILE_SAMPLER.active
+
+
+def get_memory_profiler():
+    """Returns the active memory profiler, or None if memory profiling is disabled.
+
+    Memory profiling is enabled by setting the runtime settings ``profile_mode`` and ``profile_memory``.
+    """
+    global _MEMORY_PROFILER
+
+    if not (rs.profile_memory and profiling_active()):
+        return None
+
+    if _MEMORY_PROFILER is None:
+        _MEMORY_PROFILER = MemoryProfiler()
+
+    return _MEMORY_PROFILER
+
+
+def get_trace_profiler():
+    """Returns the active trace profiler, or None if tracing is disabled.
+
+    Tracing is enabled by setting the runtime settings ``profile_mode`` and ``profile_trace_file``.
+    Only sampled time steps are traced.
+    """
+    global _TRACE_PROFILER
+
+    if not (rs.profile_trace_file and profiling_active()):
+        return None
+
+    if _TRACE_PROFILER is None:
+        _TRACE_PROFILER = TraceProfiler()
+
+    return _TRACE_PROFILER
+
+
+def trace_region(category, name=None):
+    """Decorator that records every call to the decorated function as trace event."""
+
+    def decorator(function):
+        event_name = name or function.__name__
+
+        @functools.wraps(function)
+        def trace_region_wrapper(*args, **kwargs):
+            profiler = get_trace_profiler()
+
+            if profiler is None:
+                return function(*args, **kwargs)
+
+            with profiler.region(event_name, category):
+                return function(*args, **kwargs)
+
+        return trace_region_wrapper
+
+    return decorator
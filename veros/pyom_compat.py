@@ -6,6 +6,7 @@ import importlib.util
 from veros import logger, runtime_settings, runtime_state, timer
 from veros.state import get_default_state, resize_dimension
 from veros.variables import get_shape
+from veros.distributed import get_chunk_bounds
 
 
 # all variables that are re-named or unique to Veros
@@ -180,10 +181,12 @@ def _override_settings(pyom_obj):
 
     # define processor boundary idx (1-based)
     ipx, ipy = runtime_state.proc_idx
-    m.is_pe = (m.nx // m.n_pes_i) * ipx + 1
-    m.ie_pe = (m.nx // m.n_pes_i) * (ipx + 1)
-    m.js_pe = (m.ny // m.n_pes_j) * ipy + 1
-    m.je_pe = (m.ny // m.n_pes_j) * (ipy + 1)
+    x_start, nxl = get_chunk_bounds(m.nx, 0, ipx)
+    y_start, nyl = get_chunk_bounds(m.ny, 1, ipy)
+    m.is_pe = x_start + 1
+    m.ie_pe = x_start + nxl
+    m.js_pe = y_start + 1
+    m.je_pe = y_start + nyl
 
     # force settings that are not supported by Veros
     idm = pyom_obj.idemix_module
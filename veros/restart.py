@@ -52,7 +52,8 @@ def write_to_h5(dimensions, var_meta, var_data, outfile, groupname, attributes=N
             chunksize = []
             for d in var_dims:
                 if d in dimensions:
-                    chunksize.append(get_shape(dimensions, (d,), local=True, include_ghosts=False)[0])
+                    # all processes use the chunk of process (0, 0), so the chunk shape is the same everywhere
+                    chunksize.append(get_shape(dimensions, (d,), local=True, include_ghosts=False, proc_idx=(0, 0))[0])
                 else:
                     chunksize.append(1)
 
@@ -1,11 +1,14 @@
+import contextlib
+import copy
 import functools
 import inspect
 import threading
-from contextlib import ExitStack, contextmanager
+from collections import Counter
 
-from veros import logger
+from veros import logger, runtime_settings as rs, runtime_state as rst
 
-from veros.state import VerosState
+from veros.profiler import get_memory_profiler, get_trace_profiler, profiling_active
+from veros.state import VerosState, VerosVariables, DistSafeVariableWrapper
 
 
 # stack helpers
@@ -50,50 +53,109 @@ CURRENT_CONTEXT.routine_stack = RoutineStack()
 CURRENT_CONTEXT.mpi4jax_token = None
 
 
-@contextmanager
-def nullcontext():
-    yield
+def _trace_enabled():
+    return rs.loglevel == "trace"
 
 
-@contextmanager
-def enter_routine(name, routine_obj, timer=None, dist_safe=True):
-    from veros import runtime_state as rst
-    from veros.distributed import abort
+class _RoutineContext:
+    """Context manager that keeps track of the routine stack (see enter_routine)."""
+
+    __slots__ = (
+        "name",
+        "routine_obj",
+        "timer",
+        "dist_safe",
+        "reset_dist_safe",
+        "trace",
+        "trace_profiler",
+        "memory_profiler",
+        "start_time",
+    )
+
+    def __init__(self, name, routine_obj, timer=None, dist_safe=True):
+        self.name = name
+        self.routine_obj = routine_obj
+        self.timer = timer
+        self.dist_safe = dist_safe
+        self.reset_dist_safe = False
+        self.trace = _trace_enabled()
+        self.trace_profiler = get_trace_profiler()
+        self.memory_profiler = get_memory_profiler()
+
+    def __enter__(self):
+        stack = CURRENT_CONTEXT.routine_stack
+
+        if self.memory_profiler is not None:
+            self.memory_profiler.enter()
+
+        if self.trace_profiler is not None:
+            self.start_time = self.trace_profiler.now()
+
+        if self.trace:
+            logger.trace("{}> {}", "-" * stack.stack_level, self.name)
+
+        stack.append(self.routine_obj)
+
+        if CURRENT_CONTEXT.is_dist_safe:
+            if not self.dist_safe and rst.proc_num > 1:
+                CURRENT_CONTEXT.is_dist_safe = False
+                self.reset_dist_safe = True
+
+        if self.timer is not None:
+            self.timer.__enter__()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        try:
+            if self.timer is not None:
+                self.timer.__exit__(exc_type, exc_val, exc_tb)
+
+            if exc_type is not None and self.reset_dist_safe:
+                from veros.distributed import abort
+
+                abort()
+
+        finally:
+            if self.reset_dist_safe:
+                CURRENT_CONTEXT.is_dist_safe = True
+
+            stack = CURRENT_CONTEXT.routine_stack
+            r = stack.pop()
+            assert r is self.routine_obj
+
+            if self.trace_profiler is not None:
+                category = "kernel" if isinstance(self.routine_obj, VerosKernel) else "routine"
+                self.trace_profiler.add_event(self.name, category, self.start_time)
 
-    stack = CURRENT_CONTEXT.routine_stack
+            if self.memory_profiler is not None:
+                self.memory_profiler.exit(self.name)
 
-    logger.trace("{}> {}", "-" * stack.stack_level, name)
-    stack.append(routine_obj)
+            if self.trace:
+                exec_time = ""
+                if self.timer is not None:
+                    exec_time = f"({self.timer.last_time:.3f}s)"
 
-    reset_dist_safe = False
-    if CURRENT_CONTEXT.is_dist_safe:
-        if not dist_safe and rst.proc_num > 1:
-            CURRENT_CONTEXT.is_dist_safe = False
-            reset_dist_safe = True
+                logger.trace("<{} {} {}", "-" * stack.stack_level, self.name, exec_time)
 
-    timer_ctx = nullcontext() if timer is None else timer
+        return False
 
-    try:
-        with timer_ctx:
-            yield
 
-    except:  # noqa: E722
-        if reset_dist_safe:
-            abort()
-        raise
+def enter_routine(name, routine_obj, timer=None, dist_safe=True):
+    return _RoutineContext(name, routine_obj, timer=timer, dist_safe=dist_safe)
+
+
+def _get_timer(veros_state, name):
+    """Timers of routines and kernels are only needed for profiles and trace output."""
+    if profiling_active() or _trace_enabled():
+        return veros_state.profile_timers[name]
 
-    finally:
-        if reset_dist_safe:
-            CURRENT_CONTEXT.is_dist_safe = True
+    return None
 
-        r = stack.pop()
-        assert r is routine_obj
 
-        exec_time = ""
-        if timer is not None:
-            exec_time = f"({timer.last_time:.3f}s)"
+@functools.lru_cache(maxsize=None)
+def _get_flush():
+    from veros.core.operators import flush
 
-        logger.trace("<{} {} {}", "-" * stack.stack_level, name, exec_time)
+    return flush
 
 
 # helper functions
@@ -177,23 +239,22 @@ class VerosRoutine:
         self.name = _get_func_name(self.function)
 
     def __call__(self, *args, **kwargs):
-        from veros import runtime_state as rst
-        from veros.state import VerosState, DistSafeVariableWrapper
-        from veros.core.operators import flush
-
         veros_state = args[self.state_argnum]
 
         if not isinstance(veros_state, VerosState):
             raise TypeError(f"Argument {self.state_argnum} to this Veros routine must be a VerosState object")
 
-        timer = veros_state.profile_timers[self.name]
+        timer = _get_timer(veros_state, self.name)
 
-        with ExitStack() as es:
-            vars_initialized = veros_state._variables is not None
+        # unlock variables (like Lockable.unlock, but cheaper)
+        variables = veros_state._variables
+        vars_initialized = variables is not None
 
-            if vars_initialized:
-                es.enter_context(veros_state.variables.unlock())
+        if vars_initialized:
+            lock_state = variables.__locked__
+            variables.__locked__ = False
 
+        try:
             execute = True
             restore_vars = False
 
@@ -219,7 +280,11 @@ class VerosRoutine:
                     veros_state._variables._scatter_variables()
                     veros_state._variables = orig_vars
 
-                flush()
+                _get_flush()()
+
+        finally:
+            if vars_initialized:
+                variables.__locked__ = lock_state
 
         if out is not None:
             logger.warning(
@@ -236,7 +301,7 @@ class VerosRoutine:
 # kernel
 
 
-def veros_kernel(function=None, *, static_args=()):
+def veros_kernel(function=None, *, static_args=(), numba_jit=False, donate_variables=()):
     """Decorator that marks a function as a kernel that can be JIT compiled if supported
     by the backend.
 
@@ -246,6 +311,18 @@ def veros_kernel(function=None, *, static_args=()):
     Parameters:
         static_args (Tuple[str]): Names of kernel arguments that should be static.
 
+        numba_jit (bool): Compile this kernel with ``numba.njit`` when using the numba backend.
+            Loops over :obj:`veros.core.operators.prange` are then executed in parallel. This
+            requires that the kernel only operates on arrays and scalars (not on the Veros state).
+            Has no effect for other backends.
+
+        donate_variables (Tuple[str]): Names of state variables whose buffers may be re-used for the
+            outputs of this kernel (JAX backend only). This reduces peak memory consumption, since old
+            and new versions of these variables do not have to be kept alive at the same time.
+            Donated variables must be part of the returned :obj:`KernelOutput`, and callers must
+            write the output back to the state (``vs.update(kernel(state))``). Variables whose buffer
+            is also referenced by another kernel input are not donated.
+
     Example:
         >>> from veros import veros_kernel, KernelOutput
         >>>
@@ -258,7 +335,7 @@ def veros_kernel(function=None, *, static_args=()):
     """
 
     def inner_decorator(function):
-        kernel = VerosKernel(function, static_args=static_args)
+        kernel = VerosKernel(function, static_args=static_args, numba_jit=numba_jit, donate_variables=donate_variables)
         kernel = functools.wraps(function)(kernel)
         return kernel
 
@@ -271,7 +348,7 @@ def veros_kernel(function=None, *, static_args=()):
 class VerosKernel:
     """Do not instantiate directly!"""
 
-    def __init__(self, function, static_args=()):
+    def __init__(self, function, static_args=(), numba_jit=False, donate_variables=()):
         """Do some parameter introspection."""
 
         # make sure function signature is in the form we need
@@ -302,83 +379,203 @@ class VerosKernel:
 
             self.static_argnums.append(arg_index)
 
+        if isinstance(donate_variables, str):
+            donate_variables = (donate_variables,)
+
         self.function = function
+        self.numba_jit = numba_jit
+        self.donate_variables = tuple(donate_variables)
 
-    def __call__(self, *args, **kwargs):
-        from veros import runtime_settings, runtime_state
-        from veros.core.operators import flush
+        self.num_params = len(func_params)
 
-        inject_tokens = runtime_settings.backend == "jax" and runtime_state.proc_num > 1
+        # backend-specific version of function, created on first call
+        self._compiled_function = None
 
-        # apply JIT
-        if runtime_settings.backend == "jax":
+    def _compile(self):
+        """Apply JIT compilation if supported by the backend."""
+        function = self.function
+
+        if rs.backend == "jax":
             import jax
 
-            CompiledFunction = type(jax.jit(lambda: None))
+            if self._inject_tokens:
+                inner_function = function
+
+                @functools.wraps(inner_function)
+                def token_wrapper(*args):
+                    inputs = args[:-1]
+                    token = args[-1]
+                    CURRENT_CONTEXT.mpi4jax_token = token
+                    out = inner_function(*inputs)
+                    token = CURRENT_CONTEXT.mpi4jax_token
+                    return out, token
+
+                if CURRENT_CONTEXT.mpi4jax_token is None:
+                    CURRENT_CONTEXT.mpi4jax_token = jax.lax.create_token()
+
+                function = token_wrapper
+
+            if self._donate:
+                inner_function = function
+
+                def donation_wrapper(donated_variables, state_argnum, *args):
+                    state = args[state_argnum]
+                    with state.variables.unlock():
+                        state.variables.update(donated_variables)
+                    return inner_function(*args)
 
-            if not isinstance(self.function, CompiledFunction):
-                if inject_tokens:
-                    function = self.function
+                # do not use functools.wraps, since JAX would inspect the signature of the wrapped function
+                donation_wrapper.__name__ = donation_wrapper.__qualname__ = inner_function.__name__
 
-                    @functools.wraps(function)
-                    def token_wrapper(*args):
-                        inputs = args[:-1]
-                        token = args[-1]
-                        CURRENT_CONTEXT.mpi4jax_token = token
-                        out = function(*inputs)
-                        token = CURRENT_CONTEXT.mpi4jax_token
-                        return out, token
+                function = jax.jit(
+                    donation_wrapper,
+                    static_argnums=(1, *(argnum + 2 for argnum in self.static_argnums)),
+                    donate_argnums=0,
+                )
+            else:
+                function = jax.jit(function, static_argnums=self.static_argnums)
 
-                    if CURRENT_CONTEXT.mpi4jax_token is None:
-                        CURRENT_CONTEXT.mpi4jax_token = jax.lax.create_token()
+        elif rs.backend == "numba" and self.numba_jit:
+            import numba
 
-                    self.function = token_wrapper
+            function = numba.njit(function, parallel=True, cache=True)
 
-                self.function = jax.jit(self.function, static_argnums=self.static_argnums)
+        return function
+
+    @property
+    def _inject_tokens(self):
+        return rs.backend == "jax" and rst.proc_num > 1
+
+    @property
+    def _donate(self):
+        return rs.backend == "jax" and bool(self.donate_variables)
+
+    def __call__(self, *args, **kwargs):
+        if self._compiled_function is None:
+            # these cannot change after core modules have been imported
+            self._compiled_function = self._compile()
+            self._call_inject_tokens = self._inject_tokens
+            self._call_donate = self._donate
+
+        inject_tokens = self._call_inject_tokens
+        donate = self._call_donate
 
         # JAX only accepts positional args when using static_argnums
         # so convert everything to positional for consistency
-        bound_args = self.func_sig.bind(*args, **kwargs)
-        bound_args.apply_defaults()
+        if not kwargs and len(args) == self.num_params:
+            # fast path, binding would be a no-op
+            args = list(args)
+        else:
+            bound_args = self.func_sig.bind(*args, **kwargs)
+            bound_args.apply_defaults()
+            args = list(bound_args.arguments.values())
 
         veros_state = None
-        for argval in bound_args.arguments.values():
+        for state_argnum, argval in enumerate(args):
             if isinstance(argval, VerosState):
                 veros_state = argval
                 break
 
         called_with_state = veros_state is not None
 
+        if donate and not called_with_state:
+            raise ValueError(f"Veros kernel {self.name} declares donate_variables, but was called without state")
+
         # when profiling, make sure all inputs are ready before starting the timer
-        if runtime_settings.profile_mode:
-            flush()
+        if profiling_active():
+            _get_flush()()
 
         if called_with_state:
-            timer = veros_state.profile_timers[self.name]
+            timer = _get_timer(veros_state, self.name)
+
+            # unlock variables (like Lockable.unlock, but cheaper)
+            variables = veros_state.variables
+            lock_state = variables.__locked__
+            variables.__locked__ = False
         else:
             timer = None
 
-        with ExitStack() as es:
-            if called_with_state:
-                es.enter_context(veros_state.variables.unlock())
-
-            args = list(bound_args.arguments.values())
-
+        try:
             if inject_tokens:
                 args.append(CURRENT_CONTEXT.mpi4jax_token)
 
-            with enter_routine(self.name, self, timer):
-                out = self.function(*args)
+            if donate:
+                donated_variables = self._split_donated_variables(args, state_argnum)
+                args = [donated_variables, state_argnum, *args]
 
-                if runtime_settings.profile_mode:
-                    flush()
+            with enter_routine(self.name, self, timer), self._ownership(args, veros_state):
+                out = self._compiled_function(*args)
+
+                if profiling_active():
+                    _get_flush()()
 
             if inject_tokens:
                 out, token = out
                 CURRENT_CONTEXT.mpi4jax_token = token
 
+            if donate:
+                missing_outputs = set(donated_variables) - set(getattr(out, "_fields", ()))
+                if missing_outputs:
+                    raise RuntimeError(
+                        f"Veros kernel {self.name} donates variables {sorted(missing_outputs)}, "
+                        "but does not return them"
+                    )
+
+        finally:
+            if called_with_state:
+                variables.__locked__ = lock_state
+
         return out
 
+    def _ownership(self, args, state):
+        """Allows the NumPy backend to update state variables and arrays created in this kernel in-place."""
+        if not rs.numpy_inplace_updates or rs.backend == "jax":
+            return contextlib.nullcontext()
+
+        from veros.core.operators import kernel_ownership
+
+        if state is None or type(state.variables) is not VerosVariables:
+            # e.g. gathered variables in routines that are not dist_safe
+            return kernel_ownership()
+
+        return kernel_ownership(vars(state.variables).values(), [arg for arg in args if arg is not state])
+
+    def _split_donated_variables(self, args, state_argnum):
+        """Removes donated variables from the state argument (in-place in args).
+
+        Returns the removed variables, which are passed to the kernel as a separate, donated argument.
+        """
+        state = args[state_argnum]
+        variables = state.variables
+
+        if type(variables) is not VerosVariables:
+            # e.g. gathered variables in routines that are not dist_safe
+            return {}
+
+        variable_values = vars(variables)
+        donated_variables = {var: variable_values[var] for var in self.donate_variables if var in variable_values}
+
+        # buffers that are referenced more than once cannot be donated
+        other_refs = [id(val) for key, val in variable_values.items() if key not in donated_variables]
+        other_refs.extend(id(arg) for arg in args if arg is not state)
+        other_refs.extend(id(val) for val in donated_variables.values())
+        ref_counts = Counter(other_refs)
+
+        donated_variables = {var: val for var, val in donated_variables.items() if ref_counts[id(val)] == 1}
+
+        if not donated_variables:
+            return donated_variables
+
+        stripped_variables = copy.copy(variables)
+        for var in donated_variables:
+            object.__setattr__(stripped_variables, var, None)
+
+        stripped_state = copy.copy(state)
+        stripped_state._variables = stripped_variables
+        args[state_argnum] = stripped_state
+
+        return donated_variables
+
     def __repr__(self):
         return f"<{self.__class__.__name__} {self.name} at {hex(id(self))}>"
 
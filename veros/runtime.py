@@ -79,7 +79,8 @@ def set_log_all_processes(val):
 
 DEVICES = ("cpu", "gpu", "tpu")
 FLOAT_TYPES = ("float64", "float32")
-LINEAR_SOLVERS = ("scipy", "scipy_jax", "petsc", "best")
+LINEAR_SOLVERS = ("scipy", "scipy_jax", "petsc", "krylov", "best")
+LINEAR_SOLVER_PRECONDITIONERS = ("default", "multigrid")
 
 
 # settings
@@ -92,10 +93,21 @@ AVAILABLE_SETTINGS = {
     "device": RuntimeSetting(parse_choice(DEVICES), "cpu"),
     "float_type": RuntimeSetting(parse_choice(FLOAT_TYPES), "float64"),
     "linear_solver": RuntimeSetting(parse_choice(LINEAR_SOLVERS), "best"),
+    "linear_solver_preconditioner": RuntimeSetting(parse_choice(LINEAR_SOLVER_PRECONDITIONERS), "default"),
+    "linear_solver_history": RuntimeSetting(int, 0),
     "petsc_options": RuntimeSetting(str, ""),
     "monitor_streamfunction_residual": RuntimeSetting(parse_bool, True),
     "num_proc": RuntimeSetting(parse_two_ints, (1, 1), read_from_env=False),
+    "decomposition_file": RuntimeSetting(str, ""),
     "profile_mode": RuntimeSetting(parse_bool, False),
+    "profile_trace_file": RuntimeSetting(str, ""),
+    "profile_sample_interval": RuntimeSetting(int, 1),
+    "profile_memory": RuntimeSetting(parse_bool, False),
+    "performance_log_file": RuntimeSetting(str, ""),
+    "numpy_inplace_updates": RuntimeSetting(parse_bool, False),
+    "jit_timestep": RuntimeSetting(parse_bool, False),
+    "fuse_timesteps": RuntimeSetting(parse_bool, False),
+    "compilation_cache_dir": RuntimeSetting(str, ""),
     "loglevel": RuntimeSetting(set_loglevel, "info"),
     "mpi_comm": RuntimeSetting(check_mpi_comm, _default_mpi_comm(), read_from_env=False),
     "log_all_processes": RuntimeSetting(set_log_all_processes, False),
@@ -1,8 +1,11 @@
 import contextlib
+import functools
 from collections import defaultdict, namedtuple
 from collections.abc import Mapping
 from copy import deepcopy
 
+import numpy as onp
+
 from veros import (
     timer,
     plugins,
@@ -13,8 +16,14 @@ from veros import (
 )
 
 
+@functools.lru_cache(maxsize=None)
+def _get_namedtuple_type(fields):
+    return namedtuple("KernelOutput", fields)
+
+
 def make_namedtuple(**kwargs):
-    return namedtuple("KernelOutput", list(kwargs.keys()))(*kwargs.values())
+    # creating namedtuple types is expensive, so re-use them
+    return _get_namedtuple_type(tuple(kwargs.keys()))(*kwargs.values())
 
 
 KernelOutput = make_namedtuple
@@ -81,7 +90,7 @@ class StrictContainer:
                 raise TypeError(f"Cannot update from {type(other)} type")
 
         for key, val in new_fields.items():
-            if key not in self.__fields__:
+            if key not in self:
                 raise AttributeError(f"unknown attribute {key}")
 
         for key, val in new_fields.items():
@@ -162,6 +171,8 @@ class StaticDictProxy(Mapping):
 
 
 class VerosSettings(Lockable, StrictContainer):
+    _settings_hash = None
+
     def __init__(self, settings_meta):
         self.__metadata__ = settings_meta
         super().__init__(fields=settings_meta.keys())
@@ -177,12 +188,23 @@ class VerosSettings(Lockable, StrictContainer):
 
         meta = self.__metadata__[key]
         val = meta.type(val)
-        return super().__setattr__(key, val)
+        super().__setattr__(key, val)
+        self._settings_hash = None
+
+    def _get_settings_hash(self):
+        """Hash of all setting values (cached until a setting is modified)."""
+        if self._settings_hash is None:
+            with self.unlock():
+                self._settings_hash = hash(tuple(self.items()))
+
+        return self._settings_hash
 
 
 class VerosVariables(Lockable, StrictContainer):
     """ """
 
+    __validation_table__ = None
+
     def __init__(self, var_meta, dimensions):
         self.__metadata__ = var_meta
         self.__dimensions__ = dimensions
@@ -217,34 +239,78 @@ class VerosVariables(Lockable, StrictContainer):
         return orig_getattr(attr)
 
     def __setattr__(self, key, val):
-        if key.startswith("_") or key not in self.__metadata__:
+        if key.startswith("_"):
             return super().__setattr__(key, val)
 
-        var = self.__metadata__[key]
+        array_type, expected_layout = self._get_validation_table()
 
-        # check whether variable is active
-        if not var.active:
-            raise RuntimeError(
-                f"Variable {key} is not active in this configuration. Check your settings and try again."
-            )
+        try:
+            expected_shape, expected_dtype = expected_layout[key]
+        except KeyError:
+            # check whether variable is active
+            if key in self.__metadata__:
+                raise RuntimeError(
+                    f"Variable {key} is not active in this configuration. Check your settings and try again."
+                ) from None
 
-        # validate array type, shape and dtype
-        if var.dtype is not None:
-            expected_dtype = var.dtype
-        else:
-            expected_dtype = rs.float_type
+            return super().__setattr__(key, val)
+
+        if self.__locked__:
+            # raises
+            return super().__setattr__(key, val)
 
-        val = rst.backend_module.asarray(val, dtype=expected_dtype)
+        # validate array type, shape and dtype
+        # (skip conversion for arrays that are already valid, like kernel outputs)
+        if not isinstance(val, array_type) or val.dtype != expected_dtype or getattr(val, "weak_type", False):
+            val = rst.backend_module.asarray(val, dtype=expected_dtype)
 
-        expected_shape = self._get_expected_shape(var.dims)
         if val.shape != expected_shape:
             raise ValueError(f"Got unexpected shape for variable {key} (expected: {expected_shape}, got: {val.shape})")
 
-        return super().__setattr__(key, val)
+        if rs.numpy_inplace_updates:
+            from veros.core.operators import release_owned
+
+            # state variables may only be updated in-place within kernels
+            release_owned(val)
+
+        # all other checks of parent classes have been done at this point
+        object.__setattr__(self, key, val)
+
+    def __contains__(self, val):
+        # same as checking __fields__, but faster
+        return val in self._get_validation_table()[1]
 
     def _get_expected_shape(self, dims):
         return var_mod.get_shape(self.__dimensions__, dims)
 
+    def _get_validation_table(self):
+        """Returns the expected array type, and expected shape and dtype of all active variables.
+
+        Computed on first use and cached, until invalidated by resize_dimension.
+        """
+        table = self.__validation_table__
+
+        if table is None:
+            float_type = onp.dtype(rs.float_type)
+
+            expected_layout = {}
+            for key, var in self.__metadata__.items():
+                if not var.active:
+                    continue
+
+                expected_dtype = onp.dtype(var.dtype) if var.dtype is not None else float_type
+                expected_layout[key] = (self._get_expected_shape(var.dims), expected_dtype)
+
+            table = (rst.backend_module.ndarray, expected_layout)
+
+            from veros.routines import CURRENT_CONTEXT
+
+            # expected shapes of distributed arrays depend on the context
+            if rst.proc_num == 1 or CURRENT_CONTEXT.is_dist_safe:
+                self.__validation_table__ = table
+
+        return table
+
 
 class DistSafeVariableWrapper(VerosVariables):
     def __init__(self, parent_state, local_variables):
@@ -257,6 +323,9 @@ class DistSafeVariableWrapper(VerosVariables):
         self.__parent_state__ = parent_state
         self.__local_variables__ = local_variables
 
+        # expected shapes differ from those of the parent
+        self.__validation_table__ = None
+
     def __getattr__(self, attr):
         orig_getattr = super().__getattribute__
         if attr in orig_getattr("__metadata__") and attr not in orig_getattr("__local_variables__"):
@@ -465,8 +534,7 @@ def veros_state_pytree_flatten(state):
     aux_data = tuple((k, v) for k, v in vars(state).items() if k != "_variables")
 
     # ensure that functions are re-traced when settings change
-    with state.settings.unlock():
-        pseudo_hash = hash(tuple(state.settings.items()))
+    pseudo_hash = state.settings._get_settings_hash()
 
     return ([state.variables], (aux_data, pseudo_hash))
 
@@ -492,9 +560,11 @@ def veros_variables_pytree_flatten(variables):
         "__metadata__",
         "__fields__",
         "__locked__",
+        "__validation_table__",
     )
-    leaves = list(variables.values())
-    aux_data = (tuple(variables.fields()), tuple((attr, getattr(variables, attr)) for attr in aux_attrs))
+    values = vars(variables)
+    leaves = [values[key] for key in variables.__fields__]
+    aux_data = (tuple(variables.__fields__), tuple((attr, getattr(variables, attr)) for attr in aux_attrs))
     return (leaves, aux_data)
 
 
@@ -507,9 +577,10 @@ def veros_variables_pytree_unflatten(aux_data, leaves):
     for key, val in aux_attrs:
         setattr(variables, key, val)
 
-    with variables.unlock():
-        for key, val in zip(keys, leaves):
-            setattr(variables, key, val)
+    # leaves have been validated when they were set, and JAX may pass arbitrary
+    # placeholder objects as leaves (e.g. during ahead-of-time compilation)
+    for key, val in zip(keys, leaves):
+        object.__setattr__(variables, key, val)
 
     return variables
 
@@ -553,6 +624,7 @@ def resize_dimension(state, dimension, new_size):
     """
     state._dimensions[dimension] = new_size
     state.variables.__dimensions__[dimension] = new_size
+    state.variables.__validation_table__ = None
 
     with state.variables.unlock():
         for var in state.variables.fields():
@@ -1,3 +1,4 @@
+import random
 import timeit
 import threading
 
@@ -6,9 +7,23 @@ timer_context.active = True
 
 
 class Timer:
+    """Measures the time spent in a ``with`` block.
+
+    Keeps streaming statistics over all calls (count, min, max, mean). Percentiles are computed from a
+    uniform random sample of at most ``max_samples`` calls, so memory use is bounded for long runs.
+    """
+
+    max_samples = 1000
+
     def __init__(self):
         self.total_time = 0
         self.last_time = 0
+        self.num_calls = 0
+        self.min_time = float("inf")
+        self.max_time = 0
+        self._samples = []
+        # fixed seed for reproducible statistics
+        self._rng = random.Random(42)
 
     def __enter__(self):
         self.start_time = timeit.default_timer()
@@ -18,3 +33,51 @@ class Timer:
 
         if timer_context.active:
             self.total_time += self.last_time
+            self._record(self.last_time)
+
+    def _record(self, elapsed):
+        self.num_calls += 1
+        self.min_time = min(self.min_time, elapsed)
+        self.max_time = max(self.max_time, elapsed)
+
+        # reservoir sampling
+        if len(self._samples) < self.max_samples:
+            self._samples.append(elapsed)
+        else:
+            idx = self._rng.randrange(self.num_calls)
+            if idx < self.max_samples:
+                self._samples[idx] = elapsed
+
+    @property
+    def mean_time(self):
+        if not self.num_calls:
+            return 0
+
+        return self.total_time / self.num_calls
+
+    def percentile(self, q):
+        """Returns the q-th percentile (0 <= q <= 100) of all recorded times (linear interpolation)."""
+        if not self._samples:
+            return 0
+
+        samples = sorted(self._samples)
+        pos = (len(samples) - 1) * q / 100
+        lower = int(pos)
+        upper = min(lower + 1, len(samples) - 1)
+        return samples[lower] + (samples[upper] - samples[lower]) * (pos - lower)
+
+    def statistics(self):
+        """Returns a dict of summary statistics over all recorded calls (in seconds)."""
+        if not self.num_calls:
+            return dict(count=0)
+
+        return dict(
+            count=self.num_calls,
+            total=self.total_time,
+            mean=self.mean_time,
+            min=self.min_time,
+            max=self.max_time,
+            p50=self.percentile(50),
+            p95=self.percentile(95),
+            p99=self.percentile(99),
+        )
@@ -1,4 +1,4 @@
-from veros import runtime_settings
+from veros import runtime_settings, runtime_state
 
 
 class Variable:
@@ -125,23 +125,30 @@ def get_fill_value(dtype):
     return onp.iinfo(dtype).max
 
 
-def get_shape(dimensions, grid, include_ghosts=True, local=True):
+def get_shape(dimensions, grid, include_ghosts=True, local=True, proc_idx=None):
+    """Returns the shape of a variable on given grid.
+
+    If local is True, this is the shape of the chunk of the process with index proc_idx
+    (default: the current process).
+    """
     from veros.routines import CURRENT_CONTEXT
-    from veros.distributed import SCATTERED_DIMENSIONS
+    from veros.distributed import SCATTERED_DIMENSIONS, get_chunk_bounds
 
     if grid is None:
         return ()
 
-    px, py = runtime_settings.num_proc
     grid_shapes = dict(dimensions)
 
     if local and CURRENT_CONTEXT.is_dist_safe:
-        for pxi, dims in zip((px, py), SCATTERED_DIMENSIONS):
+        if proc_idx is None:
+            proc_idx = runtime_state.proc_idx
+
+        for axis, (pi, dims) in enumerate(zip(proc_idx, SCATTERED_DIMENSIONS)):
             for dim in dims:
                 if dim not in grid_shapes:
                     continue
 
-                grid_shapes[dim] = grid_shapes[dim] // pxi
+                grid_shapes[dim] = get_chunk_bounds(grid_shapes[dim], axis, pi)[1]
 
     if include_ghosts:
         for d in GHOST_DIMENSIONS:
@@ -929,7 +936,7 @@ def manifest_metadata(var_meta, settings):
 
 
 def allocate(dimensions, grid, dtype=None, include_ghosts=True, local=True, fill=0):
-    from veros.core.operators import numpy as npx
+    from veros.core.operators import numpy as npx, mark_owned
 
     if dtype is None:
         dtype = runtime_settings.float_type
@@ -937,7 +944,8 @@ def allocate(dimensions, grid, dtype=None, include_ghosts=True, local=True, fill
     shape = get_shape(dimensions, grid, include_ghosts=include_ghosts, local=local)
     out = npx.full(shape, fill, dtype=dtype)
 
-    if runtime_settings.backend == "numpy":
+    if runtime_settings.backend in ("numpy", "numba"):
         out.flags.writeable = False
+        mark_owned(out)
 
     return out
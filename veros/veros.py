@@ -1,9 +1,11 @@
 import abc
 
 # do not import veros.core here!
-from veros import settings, time, signals, distributed, progress, runtime_settings as rs, logger
+from veros import settings, time, signals, distributed, progress, runtime_settings as rs, runtime_state as rst, logger
 from veros.state import get_default_state
+from veros.perflog import PerformanceLog
 from veros.plugins import load_plugin
+from veros.profiler import get_trace_profiler, get_profile_sampler, get_memory_profiler
 from veros.routines import veros_routine, is_veros_routine
 from veros.timer import timer_context
 
@@ -41,6 +43,8 @@ class VerosSetup(metaclass=abc.ABCMeta):
 
         self._plugin_interfaces = tuple(load_plugin(p) for p in self.__veros_plugins__)
         self._setup_done = False
+        self._jitted_step_main = None
+        self._jitted_integrate_steps = None
 
         self.state = get_default_state(plugin_interfaces=self._plugin_interfaces)
 
@@ -235,67 +239,232 @@ class VerosSetup(metaclass=abc.ABCMeta):
 
         self._setup_done = True
 
-    @veros_routine
-    def step(self, state):
-        from veros import diagnostics, restart
-        from veros.core import idemix, eke, tke, momentum, thermodynamics, advection, utilities, isoneutral, numerics
+    def _step_main(self, state):
+        from veros.core import idemix, eke, tke, momentum, thermodynamics, advection, utilities
 
-        self._ensure_setup_done()
+        vs = state.variables
+        settings = state.settings
+
+        with state.timers["forcing"]:
+            self.set_forcing(state)
+
+        if state.settings.enable_idemix:
+            with state.timers["idemix"]:
+                idemix.set_idemix_parameter(state)
+
+        with state.timers["eke"]:
+            eke.set_eke_diffusivities(state)
+
+        with state.timers["tke"]:
+            tke.set_tke_diffusivities(state)
+
+        with state.timers["momentum"]:
+            momentum.momentum(state)
+
+        with state.timers["thermodynamics"]:
+            thermodynamics.thermodynamics(state)
+
+        if settings.enable_eke or settings.enable_tke or settings.enable_idemix:
+            with state.timers["advection"]:
+                advection.calculate_velocity_on_wgrid(state)
+
+        with state.timers["eke"]:
+            if state.settings.enable_eke:
+                eke.integrate_eke(state)
+
+        with state.timers["idemix"]:
+            if state.settings.enable_idemix:
+                idemix.integrate_idemix(state)
+
+        with state.timers["tke"]:
+            if state.settings.enable_tke:
+                tke.integrate_tke(state)
+
+        with state.timers["boundary_exchange"]:
+            exchange_vars = ["u", "v"]
+            if settings.enable_tke:
+                exchange_vars.append("tke")
+            if settings.enable_eke:
+                exchange_vars.append("eke")
+            if settings.enable_idemix:
+                exchange_vars.append("E_iw")
+
+            exchanged = utilities.enforce_boundaries_many(
+                [getattr(vs, var) for var in exchange_vars], settings.enable_cyclic_x
+            )
+            for var, arr in zip(exchange_vars, exchanged):
+                setattr(vs, var, arr)
+
+        with state.timers["momentum"]:
+            momentum.vertical_velocity(state)
+
+    def _step_main_jit(self, state):
+        from veros.core.operators import flush
+
+        if self._jitted_step_main is None:
+            logger.debug("Compiling whole time step")
+            self._jitted_step_main = self._jit_with_state(state, self._step_main)
+
+        new_variables = self._jitted_step_main(state.variables)
+        state.variables.update(new_variables)
+        flush()
+
+    def _step_traceable(self, state):
+        """Everything that happens during a time step except for I/O, diagnostics, and
+        the permutation of time indices."""
+        vs = state.variables
+        settings = state.settings
+
+        self._step_main(state)
+
+        for plugin in self._plugin_interfaces:
+            plugin.run_entrypoint(state)
+
+        vs.itt = vs.itt + 1
+        vs.time = vs.time + settings.dt_tracer
+
+        self.after_timestep(state)
+
+    def _integrate_steps(self, state, num_steps):
+        from veros.core.operators import for_loop
+        from veros.routines import CURRENT_CONTEXT
+
+        def advance(_, carry):
+            variables, CURRENT_CONTEXT.mpi4jax_token = carry
+            state._variables = variables
+
+            with variables.unlock():
+                self._step_traceable(state)
+                vs = state.variables
+                vs.taum1, vs.tau, vs.taup1 = vs.tau, vs.taup1, vs.taum1
+
+            return state.variables, CURRENT_CONTEXT.mpi4jax_token
+
+        # time indices of the last step are permuted after diagnostics are done
+        variables, CURRENT_CONTEXT.mpi4jax_token = for_loop(
+            0, num_steps - 1, advance, (state.variables, CURRENT_CONTEXT.mpi4jax_token)
+        )
+        state._variables = variables
+
+        with variables.unlock():
+            self._step_traceable(state)
+
+    def _jit_with_state(self, state, function):
+        """JIT-compile function(state, *args) into a pure function (variables, *args) -> variables."""
+        import jax
+        from veros.routines import CURRENT_CONTEXT
+
+        if rs.backend != "jax":
+            raise RuntimeError("The jit_timestep and fuse_timesteps runtime settings require the JAX backend")
+
+        if state.settings.enable_streamfunction:
+            from veros.core.external.solvers import get_linear_solver
+
+            # linear solvers are set up eagerly, since they cannot be created during tracing
+            get_linear_solver(state)
+
+        def pure_function(variables, *args):
+            # trace with the original state object (so memoized objects are re-used),
+            # but swap in the traced variables
+            orig_variables = state._variables
+            orig_token = CURRENT_CONTEXT.mpi4jax_token
+            state._variables = variables
+
+            if rst.proc_num > 1:
+                CURRENT_CONTEXT.mpi4jax_token = jax.lax.create_token()
+
+            try:
+                with variables.unlock():
+                    function(state, *args)
+
+                return state.variables
+            finally:
+                state._variables = orig_variables
+                CURRENT_CONTEXT.mpi4jax_token = orig_token
+
+        return jax.jit(pure_function)
+
+    def _steps_until_next_event(self, state, start_time):
+        """Number of steps until (and including) the next step that triggers diagnostics,
+        output, a restart, or the end of the run."""
+        import numpy as onp
 
         vs = state.variables
         settings = state.settings
 
+        event_frequencies = []
+        for diagnostic in state.diagnostics.values():
+            event_frequencies.extend((diagnostic.sampling_frequency, diagnostic.output_frequency))
+
+        if settings.restart_output_filename and not rs.diskless_mode:
+            event_frequencies.append(settings.restart_frequency)
+
+        event_frequencies = [freq for freq in event_frequencies if freq]
+
+        # replicate time stepping arithmetic of the model
+        model_time = onp.asarray(vs.time)
+        num_steps = 0
+        while True:
+            model_time = model_time + settings.dt_tracer
+            num_steps += 1
+
+            if model_time - start_time >= settings.runlen:
+                return num_steps
+
+            if any(model_time % freq < settings.dt_tracer for freq in event_frequencies):
+                return num_steps
+
+    @veros_routine
+    def _step_fused(self, state, num_steps):
+        from veros import diagnostics, restart
+        from veros.core import isoneutral, numerics
+        from veros.core.operators import flush
+
+        vs = state.variables
+
         with state.timers["diagnostics"]:
             restart.write_restart(state)
 
         with state.timers["main"]:
-            with state.timers["forcing"]:
-                self.set_forcing(state)
+            if self._jitted_integrate_steps is None:
+                logger.debug("Compiling fused time steps")
+                self._jitted_integrate_steps = self._jit_with_state(state, self._integrate_steps)
 
-            if state.settings.enable_idemix:
-                with state.timers["idemix"]:
-                    idemix.set_idemix_parameter(state)
+            new_variables = self._jitted_integrate_steps(state.variables, num_steps)
+            state.variables.update(new_variables)
+            flush()
 
-            with state.timers["eke"]:
-                eke.set_eke_diffusivities(state)
+        with state.timers["diagnostics"]:
+            # NaNs persist, so checking the last step is enough to detect divergence
+            if not numerics.sanity_check(state):
+                raise RuntimeError(f"solution diverged before iteration {vs.itt}")
+
+            isoneutral.isoneutral_diag_streamfunction(state)
+            diagnostics.diagnose(state)
+            diagnostics.output(state)
+
+        logger.debug(" Advanced {} time steps in {:.2f}s", num_steps, state.timers["main"].last_time)
 
-            with state.timers["tke"]:
-                tke.set_tke_diffusivities(state)
+        vs.taum1, vs.tau, vs.taup1 = vs.tau, vs.taup1, vs.taum1
 
-            with state.timers["momentum"]:
-                momentum.momentum(state)
+    @veros_routine
+    def step(self, state):
+        from veros import diagnostics, restart
+        from veros.core import isoneutral, numerics
 
-            with state.timers["thermodynamics"]:
-                thermodynamics.thermodynamics(state)
+        self._ensure_setup_done()
 
-            if settings.enable_eke or settings.enable_tke or settings.enable_idemix:
-                with state.timers["advection"]:
-                    advection.calculate_velocity_on_wgrid(state)
+        vs = state.variables
+        settings = state.settings
 
-            with state.timers["eke"]:
-                if state.settings.enable_eke:
-                    eke.integrate_eke(state)
+        with state.timers["diagnostics"]:
+            restart.write_restart(state)
 
-            with state.timers["idemix"]:
-                if state.settings.enable_idemix:
-                    idemix.integrate_idemix(state)
-
-            with state.timers["tke"]:
-                if state.settings.enable_tke:
-                    tke.integrate_tke(state)
-
-            with state.timers["boundary_exchange"]:
-                vs.u = utilities.enforce_boundaries(vs.u, settings.enable_cyclic_x)
-                vs.v = utilities.enforce_boundaries(vs.v, settings.enable_cyclic_x)
-                if settings.enable_tke:
-                    vs.tke = utilities.enforce_boundaries(vs.tke, settings.enable_cyclic_x)
-                if settings.enable_eke:
-                    vs.eke = utilities.enforce_boundaries(vs.eke, settings.enable_cyclic_x)
-                if settings.enable_idemix:
-                    vs.E_iw = utilities.enforce_boundaries(vs.E_iw, settings.enable_cyclic_x)
-
-            with state.timers["momentum"]:
-                momentum.vertical_velocity(state)
+        with state.timers["main"]:
+            if rs.jit_timestep:
+                self._step_main_jit(state)
+            else:
+                self._step_main(state)
 
         with state.timers["plugins"]:
             for plugin in self._plugin_interfaces:
@@ -348,16 +517,42 @@ class VerosSetup(metaclass=abc.ABCMeta):
         timer_context.active = False
 
         pbar = progress.get_progress_bar(self.state, use_tqdm=show_progress_bar)
+        trace_profiler = get_trace_profiler()
+        profile_sampler = get_profile_sampler()
+
+        perf_log = None
+        if rs.performance_log_file:
+            perf_log = PerformanceLog(rs.performance_log_file, self.state.timers)
 
         try:
             with signals.signals_to_exception(), pbar:
                 while vs.time - start_time < settings.runlen:
-                    self.step(self.state)
+                    if trace_profiler is not None:
+                        trace_profiler.iteration = int(vs.itt)
+
+                    if profile_sampler is not None:
+                        profile_sampler.begin_step(self.state.profile_timers)
+
+                    if perf_log is not None:
+                        perf_log.begin_step()
+
+                    if rs.fuse_timesteps:
+                        num_steps = self._steps_until_next_event(self.state, start_time)
+                        self._step_fused(self.state, num_steps)
+                    else:
+                        num_steps = 1
+                        self.step(self.state)
+
+                    if profile_sampler is not None:
+                        profile_sampler.end_step(self.state.profile_timers)
+
+                    if perf_log is not None:
+                        perf_log.end_step(vs.itt, vs.time, num_steps, settings.dt_tracer)
 
                     if not timer_context.active:
                         timer_context.active = True
 
-                    pbar.advance_time(settings.dt_tracer)
+                    pbar.advance_time(num_steps * settings.dt_tracer, num_iterations=num_steps)
 
         except:  # noqa: E722
             logger.critical(f"Stopping integration at iteration {vs.itt}")
@@ -370,6 +565,108 @@ class VerosSetup(metaclass=abc.ABCMeta):
             restart.write_restart(self.state, force=True)
             self._timing_summary()
 
+            if trace_profiler is not None:
+                trace_profiler.write(rs.profile_trace_file)
+
+            if perf_log is not None:
+                perf_log.close()
+
+    @veros_routine
+    def _compile_step(self, state):
+        from veros.core import isoneutral, numerics
+
+        if rs.fuse_timesteps:
+            if self._jitted_integrate_steps is None:
+                self._jitted_integrate_steps = self._jit_with_state(state, self._integrate_steps)
+
+            # the number of steps is a traced argument, so any value yields the same computation
+            self._jitted_integrate_steps.lower(state.variables, 1).compile()
+
+        elif rs.jit_timestep:
+            if self._jitted_step_main is None:
+                self._jitted_step_main = self._jit_with_state(state, self._step_main)
+
+            self._jitted_step_main.lower(state.variables).compile()
+
+        else:
+            # kernels are compiled on first call, so we have to execute one time step
+            self._step_main(state)
+
+        if not rs.fuse_timesteps:
+            # plugins and after_timestep are part of the fused time steps
+            for plugin in self._plugin_interfaces:
+                plugin.run_entrypoint(state)
+
+            self.after_timestep(state)
+
+        numerics.sanity_check(state)
+        isoneutral.isoneutral_diag_streamfunction(state)
+
+        # only sampling can contain kernels, output of diagnostics is not written
+        for diagnostic in state.diagnostics.values():
+            if diagnostic.sampling_frequency:
+                diagnostic.diagnose(state)
+
+    def precompile(self):
+        """Compiles all kernels that are used during time stepping, without advancing the model.
+
+        This includes the main time step, plugins, :meth:`after_timestep`, and the sampling of
+        all active diagnostics (but no diagnostic output is written). Calls :meth:`setup` if it
+        has not been called yet. The model variables and the variables of all diagnostics are
+        restored afterwards, so :meth:`run` can be called afterwards (other side effects of
+        plugins and :meth:`after_timestep` are not reverted). This is most useful in conjunction with the
+        ``compilation_cache_dir`` runtime setting, which allows later runs to re-use the compiled
+        kernels (e.g. when compiling on a login node before submitting a job). Compiled kernels
+        depend on the backend, device, float type, and process layout, so these have to match
+        between the compiling and the consuming run.
+
+        """
+        from veros.core.operators import flush
+
+        if not self._setup_done:
+            self.setup()
+
+        if rs.backend == "numpy":
+            logger.info("NumPy backend does not compile any kernels, nothing to do")
+            return
+
+        if rs.backend == "jax" and not rs.compilation_cache_dir:
+            logger.warning(
+                "Runtime setting compilation_cache_dir is not set, so compiled kernels will not be re-used by other runs"
+            )
+
+        vs = self.state.variables
+
+        # kernels may update arrays in-place or donate their buffers, so we need a copy
+        initial_values = _copy_variables(vs)
+
+        initial_diagnostic_values = {
+            name: _copy_variables(diagnostic.variables)
+            for name, diagnostic in self.state.diagnostics.items()
+            # e.g. snapshot uses the model variables
+            if getattr(diagnostic, "variables", None) is not None and diagnostic.variables is not vs
+        }
+
+        logger.info("Compiling kernels")
+
+        timers_active = timer_context.active
+        timer_context.active = False
+
+        try:
+            with self.state.timers["compile"]:
+                self._compile_step(self.state)
+                flush()
+        finally:
+            timer_context.active = timers_active
+
+            with vs.unlock():
+                vs.update(initial_values)
+
+            for name, values in initial_diagnostic_values.items():
+                self.state.diagnostics[name].variables.update(values)
+
+        logger.success(f"Compilation done in {self.state.timers['compile'].last_time:.2f}s")
+
     def _timing_summary(self):
         timing_summary = []
 
@@ -381,6 +678,7 @@ class VerosSetup(metaclass=abc.ABCMeta):
                 "---",
                 " setup time               = {:.2f}s".format(self.state.timers["setup"].total_time),
                 " main loop time           = {:.2f}s".format(self.state.timers["main"].total_time),
+                "   per step               = {}".format(format_timer_statistics(self.state.timers["main"])),
                 "   forcing                = {:.2f}s".format(self.state.timers["forcing"].total_time),
                 "   momentum               = {:.2f}s".format(self.state.timers["momentum"].total_time),
                 "     pressure             = {:.2f}s".format(self.state.timers["pressure"].total_time),
@@ -420,7 +718,27 @@ class VerosSetup(metaclass=abc.ABCMeta):
         logger.debug("\n".join(timing_summary))
 
         if rs.profile_mode:
-            print_profile_summary(self.state.profile_timers, self.state.timers["main"].total_time)
+            profile_sampler = get_profile_sampler()
+
+            if profile_sampler.interval > 1:
+                print_sampled_profile_summary(profile_sampler)
+            else:
+                print_profile_summary(self.state.profile_timers, self.state.timers["main"].total_time)
+
+            memory_profiler = get_memory_profiler()
+            if memory_profiler is not None:
+                logger.diagnostic(memory_profiler.summary())
+
+
+def format_timer_statistics(timer):
+    stats = timer.statistics()
+
+    if not stats["count"]:
+        return "n/a"
+
+    return "{mean:.2e}s mean, {min:.2e}s min, {p50:.2e}s p50, {p95:.2e}s p95, {p99:.2e}s p99, {max:.2e}s max".format(
+        **stats
+    )
 
 
 def print_profile_summary(profile_timers, main_loop_time):
@@ -437,3 +755,35 @@ def print_profile_summary(profile_timers, main_loop_time):
         profile_timings.append(profile_format_string.format(name, this_time, 100 * this_time / main_loop_time))
 
     logger.diagnostic("\n".join(profile_timings))
+
+
+def print_sampled_profile_summary(profile_sampler, confidence=0.95):
+    num_samples = len(profile_sampler.samples)
+
+    if num_samples == 0:
+        logger.diagnostic("\nNo time steps were sampled, increase run length or decrease profile_sample_interval")
+        return
+
+    statistics = profile_sampler.get_statistics(confidence=confidence)
+    step_time = max(sum(profile_sampler.step_times) / num_samples, 1e-8)  # prevent division by 0
+
+    profile_timings = [
+        "",
+        f"Profile timings (sampled every {profile_sampler.interval} steps, {num_samples} samples):",
+        f"[mean time spent per sampled step ± {100 * confidence:.0f}% confidence interval (% of step)]",
+        "---",
+    ]
+    maxwidth = max(len(k) for k in statistics.keys())
+    profile_format_string = "{{:<{}}} = {{:.2e}}s ± {{:.1e}}s ({{:.2f}}%)".format(maxwidth)
+
+    for name, (mean, ci) in statistics.items():
+        if mean == 0:
+            continue
+
+        profile_timings.append(profile_format_string.format(name, mean, ci, 100 * mean / step_time))
+
+    logger.diagnostic("\n".join(profile_timings))
+
+
+def _copy_variables(variables):
+    return {key: val.copy() if hasattr(val, "copy") else val for key, val in variables.items()}